@@ -0,0 +1,63 @@
+class ActivityRegions:
+    """Decide, por tick, quais entidades da grade do nivel sao atualizadas.
+
+    Em volta da camera (`view`, em coordenadas de mundo):
+    - ativa: `view` + `margin` px -> atualiza todo tick;
+    - reduzida: ate `throttle_margin` px -> a cada `throttle_every` ticks,
+      so para camadas que aceitam isso;
+    - fora disso a entidade dorme (nao e visitada).
+
+    Cada handler recebe `(obj, ticks)`, com `ticks` = ticks desde a ultima
+    atualizacao dele (1 quando ativa). Animacoes usam isso para acordar no
+    mesmo ponto em que estariam se nunca tivessem parado; quem nao pode
+    pular ticks (fisica) simplesmente congela enquanto dorme. Tudo depende so
+    do tick e do caminho da camera, entao o resultado e deterministico.
+    Sem `view` tudo fica ativo (comportamento antigo).
+    """
+
+    def __init__(self, grid, margin=256, throttle_margin=1024, throttle_every=4):
+        self.grid = grid
+        self.margin = margin
+        self.throttle_margin = throttle_margin
+        self.throttle_every = throttle_every
+        self.tick = 0
+        self._last = {}
+        self.stats = {'active': 0, 'throttled': 0, 'asleep': 0}
+
+    def active_rect(self, view):
+        # regiao que atualiza todo tick (None: tudo ativo); serve tambem a quem
+        # fica fora da grade, como a NightBorneCrowd do Level1
+        if view is None:
+            return None
+        return view.inflate(2 * self.margin, 2 * self.margin)
+
+    def step(self, view, handlers):
+        # handlers: [(camada, funcao(obj, ticks), aceita_reduzida)], na ordem de atualizacao
+        self.tick += 1
+        tick = self.tick
+        last = self._last
+        grid = self.grid
+        near = self.active_rect(view)
+        far = None if view is None else view.inflate(2 * self.throttle_margin, 2 * self.throttle_margin)
+        active = throttled = total = 0
+        for layer, update, throttle in handlers:
+            total += grid.count(layer)
+            objs = grid.items(layer) if near is None else grid.query(near, layer)
+            for obj in objs:
+                update(obj, tick - last.get(obj, 0))
+                last[obj] = tick
+            active += len(objs)
+            if not throttle or far is None:
+                continue
+            woken = set(objs)
+            every = self.throttle_every
+            for obj in grid.query(far, layer):
+                if obj in woken:
+                    continue
+                ticks = tick - last.get(obj, 0)
+                if ticks >= every:
+                    update(obj, ticks)
+                    last[obj] = tick
+                throttled += 1
+        self.stats = {'active': active, 'throttled': throttled, 'asleep': total - active - throttled}
+        return self.stats
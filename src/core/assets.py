@@ -0,0 +1,339 @@
+import math, queue, threading, time, weakref
+from collections.abc import Mapping
+from types import MappingProxyType
+import pygame
+try:
+    from . import trace
+    from .atlas import Atlas, frame_keys
+except ImportError:
+    from core import trace  # type: ignore
+    from core.atlas import Atlas, frame_keys  # type: ignore
+
+
+def can_convert():
+    # convert/convert_alpha so funcionam com uma janela aberta e so sao feitos na thread principal
+    return (threading.current_thread() is threading.main_thread()
+            and pygame.display.get_init() and pygame.display.get_surface() is not None)
+
+
+def to_display(surf, alpha=True):
+    # sem can_convert() a surface volta como esta e o BackgroundLoader converte depois
+    if surf is None or not can_convert():
+        return surf
+    return surf.convert_alpha() if alpha else surf.convert()
+
+
+# surface logica -> {escala: surface reduzida}; some junto com a surface original
+_mips = weakref.WeakKeyDictionary()
+
+
+def mip_size(size, scale):
+    # arredonda para cima: sprites vizinhos nunca abrem fresta entre si
+    return max(1, math.ceil(size[0] * scale)), max(1, math.ceil(size[1] * scale))
+
+
+def scale_surface(surf, size):
+    # smoothscale so aceita 24/32 bits; colorkey com filtro borra a borda, entao vai sem
+    if surf.get_bitsize() < 24 or surf.get_colorkey() is not None:
+        out = pygame.transform.scale(surf, size)
+    else:
+        out = pygame.transform.smoothscale(surf, size)
+    if surf.get_colorkey() is not None:
+        out.set_colorkey(surf.get_colorkey())
+    if surf.get_alpha() is not None:
+        rle = pygame.RLEACCEL if surf.get_flags() & pygame.RLEACCELOK else 0
+        out.set_alpha(surf.get_alpha(), rle)
+    return out
+
+
+def mip(surf, scale):
+    """Versao de `surf` reduzida para `scale`, calculada uma vez e reaproveitada.
+
+    O tamanho vem de `mip_size`. Quem carrega imagens pode registrar um nivel
+    feito direto da fonte com `set_mip` (melhor que reduzir o ja reduzido).
+    """
+    levels = _mips.get(surf)
+    if levels is None:
+        levels = _mips[surf] = {}
+    out = levels.get(scale)
+    if out is None:
+        out = levels[scale] = scale_surface(surf, mip_size(surf.get_size(), scale))
+    return out
+
+
+def set_mip(surf, scale, scaled):
+    _mips.setdefault(surf, {})[scale] = scaled
+
+
+def forget_mips(surf):
+    # para surfaces redesenhadas depois de usadas (composicoes reaproveitadas)
+    _mips.pop(surf, None)
+
+
+def _hit_flash(surf):
+    out = surf.copy()
+    tint = pygame.Surface(out.get_size(), pygame.SRCALPHA)
+    tint.fill((255, 60, 60, 120))
+    out.blit(tint, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+    return out
+
+
+def _blink(surf):
+    out = surf.copy()
+    out.set_alpha(80)
+    return out
+
+
+EFFECTS = {'hit': _hit_flash, 'blink': _blink}
+
+
+class VariantBank:
+    """Variantes pre-calculadas dos frames de um clip.
+
+    Para cada frame guarda a versao virada para a esquerda e os efeitos
+    pedidos (`EFFECTS`), acessados por (estado, indice, facing, efeito).
+    Clips em lista usam estado None. As surfaces sao compartilhadas: nao
+    altere o que `get()` devolve.
+
+    Com `atlas` (o do clip, em `registry.atlases`) as variantes novas sao
+    empacotadas nele, entao frames virados e com efeito saem das mesmas
+    paginas que os originais. O alpha de surface (blink) nao vai para a
+    pagina: o frame entra opaco e a subsurface recebe o `set_alpha`.
+    """
+
+    def __init__(self, clip, effects=(), atlas=None):
+        self.effects = tuple(effects)
+        self._frames = {}
+        states = clip.items() if isinstance(clip, Mapping) else ((None, clip),)
+        for state, frames in states:
+            for i, frame in enumerate(frames):
+                for facing in (1, -1):
+                    base = frame if facing == 1 else pygame.transform.flip(frame, True, False)
+                    self._frames[(state, i, facing, None)] = base
+                    for effect in self.effects:
+                        self._frames[(state, i, facing, effect)] = EFFECTS[effect](base)
+        if atlas is not None:
+            self._pack(atlas)
+
+    def _pack(self, atlas):
+        limit = min(atlas.page_size) // 2
+        frames = {}
+        alphas = {}
+        for (state, i, facing, effect), surf in self._frames.items():
+            if (facing == 1 and effect is None) or max(surf.get_size()) > limit:
+                continue
+            key = f'{",".join(self.effects)}/{state}/{i}/{facing}/{effect}'
+            alpha = surf.get_alpha()
+            if alpha is not None and alpha < 255:
+                surf = surf.copy()
+                surf.set_alpha(None)
+                alphas[key] = alpha
+            frames[key] = surf
+        if not frames:
+            return
+        atlas.pack(frames, convert=to_display)
+        for (state, i, facing, effect) in list(self._frames):
+            key = f'{",".join(self.effects)}/{state}/{i}/{facing}/{effect}'
+            if key in frames:
+                view = atlas.get(key)
+                if key in alphas:
+                    view.set_alpha(alphas[key])
+                self._frames[(state, i, facing, effect)] = view
+
+    def get(self, state, index, facing=1, effect=None):
+        return self._frames[(state, index, facing, effect)]
+
+    def __len__(self):
+        return len(self._frames)
+
+
+class AnimationRegistry:
+    """Cache global de clips decodificados.
+
+    A chave identifica o asset (caminho) e os parametros de processamento; o
+    builder so roda na primeira vez. Os frames sao devolvidos em tuplas (e
+    dicts somente leitura), compartilhados por todas as instancias - quem
+    precisar alterar um frame deve copiar antes.
+
+    Com `baked` apontando para um SpriteCache (core.sprite_cache), um clip
+    ausente e procurado primeiro no cache em disco; o builder so roda se ele
+    faltar ou estiver obsoleto.
+
+    Na thread principal os frames de cada clip sao empacotados em um Atlas
+    (`atlases[chave]`) e o clip passa a conter subsurfaces das paginas;
+    `atlas_page_size = None` desliga isso. Com `atlas_cache`
+    (core.atlas_cache) o atlas pronto e gravado em disco e, nas proximas
+    execucoes, `decode` devolve o Atlas lido de la antes do SpriteCache e
+    do builder.
+
+    `variants(chave, efeitos)` devolve o VariantBank do clip (frames virados
+    e com efeitos, empacotados no atlas do clip), criado uma vez e
+    compartilhado como os proprios frames.
+    """
+
+    def __init__(self):
+        self._clips = {}
+        self._lock = threading.Lock()
+        self.baked = None
+        self.atlas_cache = None
+        self.atlas_page_size = (1024, 1024)
+        self.atlases = {}
+        self._variants = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, builder):
+        clip = self._clips.get(key)
+        if clip is not None:
+            self.hits += 1
+            return clip
+        with self._lock:
+            clip = self._clips.get(key)
+            if clip is None:
+                self.misses += 1
+                clip = self._freeze(self._pack(key, self.decode(key, builder)))
+                self._clips[key] = clip
+            else:
+                self.hits += 1
+        return clip
+
+    def decode(self, key, builder):
+        # so produz os frames (caches em disco ou builder), sem guardar no registry
+        clip = None
+        if self.atlas_cache is not None:
+            clip = self.atlas_cache.lookup(key)
+        if clip is None and self.baked is not None:
+            clip = self.baked.lookup(key)
+        if clip is None:
+            clip = builder()
+        return clip
+
+    def put(self, key, clip):
+        with self._lock:
+            if key not in self._clips:
+                self._clips[key] = self._freeze(self._pack(key, clip))
+            return self._clips[key]
+
+    def variants(self, key, effects=()):
+        bank = self._variants.get((key, effects))
+        if bank is None:
+            with trace.span(f'variants {key[0]}'):
+                atlas = self.atlases.get(key) if can_convert() else None
+                bank = VariantBank(self._clips[key], effects, atlas)
+            self._variants[(key, effects)] = bank
+        return bank
+
+    def __contains__(self, key):
+        return key in self._clips
+
+    def clear(self):
+        with self._lock:
+            self._clips.clear()
+            self._variants.clear()
+            # paginas antigas nao podem receber variantes de um clip refeito
+            self.atlases.clear()
+
+    def _pack(self, key, clip):
+        if isinstance(clip, Atlas):
+            # atlas lido do atlas_cache: so falta o formato do display nas paginas
+            clip.pages = [to_display(page) for page in clip.pages]
+            self.atlases[key] = clip
+            return clip.clip()
+        # paginas precisam do formato do display: so empacota na thread principal
+        if self.atlas_page_size is None or threading.current_thread() is not threading.main_thread():
+            return clip
+        atlas = Atlas(self.atlas_page_size)
+        limit = min(self.atlas_page_size) // 2
+        frames = {k: f for k, f in frame_keys(clip) if f is not None and max(f.get_size()) <= limit}
+        if len(frames) < 2:
+            return clip
+        atlas.pack(frames, convert=to_display)
+        self.atlases[key] = atlas
+        if self.atlas_cache is not None:
+            with trace.span(f'atlas save {key[0]}'):
+                self.atlas_cache.save(key, clip, atlas)
+        views = dict((k, atlas.get(k) if k in atlas else f) for k, f in frame_keys(clip))
+        if isinstance(clip, dict):
+            return {state: [views[f'{state}/{i}'] for i in range(len(frs))] for state, frs in clip.items()}
+        return [views[str(i)] for i in range(len(clip))]
+
+    @staticmethod
+    def _freeze(clip):
+        if isinstance(clip, dict):
+            return MappingProxyType({k: tuple(v) for k, v in clip.items()})
+        return tuple(clip)
+
+
+
+class BackgroundLoader:
+    """Decodifica clips do registry em uma thread de trabalho.
+
+    A thread so faz decode (arquivos, Pillow, NumPy, recortes); as surfaces
+    voltam por uma fila e `pump()`, chamado no update da cena, faz o
+    convert_alpha na thread principal e registra o clip. `progress` conta
+    clips realmente prontos.
+    """
+
+    def __init__(self, clips, target=None):
+        self.registry = target or registry
+        self.clips = list(clips)
+        self.total = len(self.clips)
+        self.done = 0
+        self.error = None
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='asset-loader', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        for key, builder in self.clips:
+            if key in self.registry:
+                self._results.put((key, None, None))
+                continue
+            try:
+                with trace.span(f'decode {key[0]}'):
+                    clip = self.registry.decode(key, builder)
+            except Exception as exc:
+                self._results.put((key, None, exc))
+                return
+            self._results.put((key, clip, None))
+
+    def pump(self, budget=0.004):
+        # converte o que ja chegou, limitado a `budget` segundos para nao travar o frame
+        start = time.perf_counter()
+        while self.done < self.total:
+            try:
+                key, clip, exc = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if exc is not None:
+                self.error = exc
+                raise exc
+            if clip is not None:
+                with trace.span(f'convert {key[0]}'):
+                    self.registry.put(key, _convert_clip(clip))
+            self.done += 1
+            if time.perf_counter() - start >= budget:
+                break
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def finished(self):
+        return self.done >= self.total
+
+
+def _convert_clip(clip):
+    if isinstance(clip, Atlas):
+        # paginas do atlas_cache: o registry converte ao registrar
+        return clip
+    if isinstance(clip, dict):
+        return {k: [to_display(f) for f in v] for k, v in clip.items()}
+    return [to_display(f) for f in clip]
+
+
+registry = AnimationRegistry()
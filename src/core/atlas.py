@@ -0,0 +1,148 @@
+import json, os
+from collections.abc import Mapping
+import pygame
+
+
+class Atlas:
+    """Empacota varios frames em poucas surfaces grandes (paginas).
+
+    Empacotamento por prateleiras: frames ordenados por altura e colocados
+    lado a lado; quando a linha enche abre outra prateleira, quando a pagina
+    enche abre outra pagina. Cada frame vira uma subsurface da pagina, entao
+    todos os blits de um personagem saem da mesma textura.
+
+    `save()`/`load()` gravam as paginas em PNG e o indice em JSON para
+    reaproveitar o atlas entre execucoes (core.atlas_cache); `meta` vai junto
+    no indice e `load(accept=...)` decide por ele antes de ler as paginas.
+    """
+
+    def __init__(self, page_size=(1024, 1024), padding=1):
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        self.rects = {}
+        self.meta = None
+        self._views = {}
+
+    def fits(self, surf):
+        w, h = surf.get_size()
+        pw, ph = self.page_size
+        return w + self.padding <= pw and h + self.padding <= ph
+
+    def pack(self, frames, convert=None):
+        # frames: {chave: Surface}; surfaces repetidas (mesmo objeto) ocupam um unico slot
+        unique = {}
+        for key, surf in frames.items():
+            unique.setdefault(id(surf), (surf, []))[1].append(key)
+        order = sorted(unique.values(), key=lambda item: (item[0].get_height(), item[0].get_width()), reverse=True)
+        pw, ph = self.page_size
+        pad = self.padding
+        placements = []
+        page = len(self.pages)
+        x = y = shelf_h = 0
+        used_h = {}
+        for surf, keys in order:
+            w, h = surf.get_size()
+            if x + w + pad > pw:
+                x = 0
+                y += shelf_h
+                shelf_h = 0
+            if y + h + pad > ph:
+                page += 1
+                x = y = shelf_h = 0
+            placements.append((page, pygame.Rect(x, y, w, h), surf, keys))
+            x += w + pad
+            shelf_h = max(shelf_h, h + pad)
+            used_h[page] = max(used_h.get(page, 0), y + h + pad)
+        first_new = len(self.pages)
+        for p in range(first_new, page + 1 if placements else first_new):
+            # a ultima pagina fica so com a altura usada
+            surf = pygame.Surface((pw, used_h.get(p, 1)), pygame.SRCALPHA)
+            self.pages.append(surf)
+        for p, rect, surf, _keys in placements:
+            self.pages[p].blit(surf, rect)
+        if convert is not None:
+            for p in range(first_new, len(self.pages)):
+                self.pages[p] = convert(self.pages[p])
+        for p, rect, _surf, keys in placements:
+            for key in keys:
+                self.rects[key] = (p, rect)
+        self._views.clear()
+        return self
+
+    def get(self, key):
+        view = self._views.get(key)
+        if view is None:
+            page, rect = self.rects[key]
+            view = self.pages[page].subsurface(rect)
+            self._views[key] = view
+        return view
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    def __len__(self):
+        return len(self.rects)
+
+    def clip(self):
+        # frames do clip descrito em `meta` (formato do builder) como subsurfaces das paginas
+        shape, counts = self.meta['shape'], self.meta['counts']
+        if shape == 'list':
+            return [self.get(str(i)) for i in range(counts[''])]
+        return {state: [self.get(f'{state}/{i}') for i in range(n)] for state, n in counts.items()}
+
+    @property
+    def nbytes(self):
+        return sum(p.get_width() * p.get_height() * p.get_bytesize() for p in self.pages)
+
+    def save(self, path):
+        # path sem extensao: grava path_0.png, path_1.png ... e path.json
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        names = []
+        for i, page in enumerate(self.pages):
+            name = f'{os.path.basename(path)}_{i}.png'
+            pygame.image.save(page, os.path.join(os.path.dirname(path), name))
+            names.append(name)
+        index = {
+            'page_size': list(self.page_size),
+            'padding': self.padding,
+            'pages': names,
+            'rects': {key: [p, r.x, r.y, r.w, r.h] for key, (p, r) in self.rects.items()},
+            'meta': self.meta,
+        }
+        # indice por ultimo e com troca atomica: um load nunca ve paginas pela metade
+        tmp = path + '.json.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump(index, fh)
+        os.replace(tmp, path + '.json')
+
+    @classmethod
+    def load(cls, path, convert=None, accept=None):
+        if not os.path.exists(path + '.json'):
+            return None
+        try:
+            with open(path + '.json', encoding='utf-8') as fh:
+                index = json.load(fh)
+            if accept is not None and not accept(index.get('meta')):
+                return None
+            atlas = cls(tuple(index['page_size']), index['padding'])
+            atlas.meta = index.get('meta')
+            for name in index['pages']:
+                page = pygame.image.load(os.path.join(os.path.dirname(path), name))
+                atlas.pages.append(convert(page) if convert else page)
+        except (OSError, ValueError, KeyError, pygame.error):
+            return None
+        for key, (p, x, y, w, h) in index['rects'].items():
+            atlas.rects[key] = (p, pygame.Rect(x, y, w, h))
+        return atlas
+
+
+def frame_keys(clip):
+    # chaves estaveis (e serializaveis) para os frames de um clip
+    if isinstance(clip, Mapping):
+        for state, frames in clip.items():
+            for i, f in enumerate(frames):
+                yield f'{state}/{i}', f
+    else:
+        for i, f in enumerate(clip):
+            yield str(i), f
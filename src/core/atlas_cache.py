@@ -0,0 +1,91 @@
+import hashlib, os, sys
+try:
+    from .. import settings
+    from .assets import registry
+    from .atlas import Atlas, frame_keys
+    from .sprite_cache import fingerprint, key_id, source_fresh
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import settings  # type: ignore
+    from core.assets import registry  # type: ignore
+    from core.atlas import Atlas, frame_keys  # type: ignore
+    from core.sprite_cache import fingerprint, key_id, source_fresh  # type: ignore
+
+# sobe quando o processamento dos frames muda sem mudar a chave do clip
+VERSION = 1
+
+
+def key_sources(key):
+    # caminhos citados na chave do clip (absolutos ou relativos a IMG_DIR) que existem em disco
+    found = []
+    stack = [key]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (tuple, list)):
+            stack.extend(reversed(item))
+        elif isinstance(item, str) and item:
+            path = item if os.path.isabs(item) else os.path.join(settings.IMG_DIR, item)
+            if os.path.exists(path) and path not in found:
+                found.append(path)
+    return found
+
+
+class AtlasCache:
+    """Atlas dos clips gravados entre execucoes (PNG das paginas + indice JSON).
+
+    Cada clip vai para `root/<sha1 da chave>` com a chave (`key_id`) e as
+    fontes (`fingerprint`, como no SpriteCache) no `meta` do atlas. `lookup`
+    so le as paginas se a chave bate e nenhuma fonte mudou; o registry entao
+    pula decode, recorte e empacotamento. So entram clips com todos os frames
+    no atlas e com alguma fonte em disco para validar.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or settings.ATLAS_CACHE
+        self.loaded = 0
+        self.saved = 0
+        self.stale = 0
+
+    def path(self, key):
+        return os.path.join(self.root, hashlib.sha1(key_id(key).encode('utf-8')).hexdigest()[:20])
+
+    def lookup(self, key):
+        # Atlas sem convert (pode rodar na thread do BackgroundLoader) ou None
+        kid = key_id(key)
+
+        def accept(meta):
+            if not meta or meta.get('version') != VERSION or meta.get('key') != kid:
+                return False
+            if not all(source_fresh(src) for src in meta['sources']):
+                self.stale += 1
+                return False
+            return True
+
+        atlas = Atlas.load(self.path(key), accept=accept)
+        if atlas is not None:
+            self.loaded += 1
+        return atlas
+
+    def save(self, key, clip, atlas):
+        sources = key_sources(key)
+        if not sources or any(k not in atlas for k, _f in frame_keys(clip)):
+            return False
+        if isinstance(clip, dict):
+            shape, counts = 'dict', {state: len(frames) for state, frames in clip.items()}
+        else:
+            shape, counts = 'list', {'': len(clip)}
+        atlas.meta = {'version': VERSION, 'key': key_id(key), 'sources': fingerprint(sources),
+                      'shape': shape, 'counts': counts}
+        try:
+            atlas.save(self.path(key))
+        except (OSError, ValueError):
+            # pasta somente leitura (build empacotado): o jogo segue sem cache
+            return False
+        self.saved += 1
+        return True
+
+
+def load(root=None):
+    # liga o cache de atlas ao registry (depois de display.set_mode, como sprite_cache.load)
+    registry.atlas_cache = AtlasCache(root)
+    return registry.atlas_cache
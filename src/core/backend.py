@@ -0,0 +1,293 @@
+"""Backends de desenho: blits em software ou SDL2 Renderer/Texture.
+
+As cenas desenham num "canvas" com a mesma cara de uma Surface para o que
+elas usam: `blit(img, dest, area)`, `blits(seq)`, `fill(cor, rect)` e
+`rect(cor, rect, largura, border_radius)`. `present(dirty)` mostra o frame.
+
+- SurfaceBackend: a janela de `display.set_mode`; os metodos sao os da
+  propria surface (sem custo extra) e `present` aceita retangulos sujos.
+- RendererBackend: `pygame._sdl2.video`. Cada Surface vira uma Texture na
+  primeira vez que e desenhada (subsurfaces usam a textura da surface mae,
+  entao uma pagina de atlas sobe uma vez so). O frame inteiro e redesenhado
+  sempre (`retains_frame = False`).
+- ScaledBackend: blits em software com settings.RENDER_SCALE < 1, numa
+  resolucao interna menor ampliada na saida.
+
+Escolha com settings.RENDER_BACKEND ('surface' ou 'renderer'); o driver do
+Renderer vem de settings.RENDER_DRIVER ('software' roda sem GPU, inclusive
+com SDL_VIDEODRIVER=dummy).
+"""
+import math
+from collections import OrderedDict
+import pygame
+try:
+    from .assets import forget_mips, mip, mip_size
+except ImportError:
+    from core.assets import forget_mips, mip, mip_size  # type: ignore
+
+
+class SurfaceBackend:
+    name = 'surface'
+    software = True
+    retains_frame = True
+
+    def __init__(self, size, title=''):
+        self.size = size
+        self.surface = pygame.display.set_mode(size)
+        pygame.display.set_caption(title)
+        self.blit = self.surface.blit
+        self.blits = self.surface.blits
+        self.fill = self.surface.fill
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        return pygame.draw.rect(self.surface, color, rect, width, border_radius=border_radius)
+
+    def present(self, dirty=None):
+        if dirty is None:
+            pygame.display.flip()
+        elif dirty:
+            pygame.display.update(dirty)
+
+    def offscreen(self, size):
+        return pygame.Surface(size).convert()
+
+    def blit_offscreen(self, surf, dest):
+        self.surface.blit(surf, dest)
+
+    def map_event(self, event):
+        return event
+
+    def forget(self, surf):
+        pass
+
+    def close(self):
+        pass
+
+
+class ScaledCanvas:
+    """Canvas em coordenadas logicas sobre uma surface reduzida por `scale`.
+
+    Posicoes e retangulos sao convertidos aqui e cada surface desenhada vira
+    seu mip (assets.mip), reduzido uma vez so.
+    """
+
+    def __init__(self, surface, scale):
+        self.surface = surface
+        self.scale = scale
+
+    def _rect(self, rect):
+        # bordas com floor/ceil: nada fica descoberto entre retangulos vizinhos
+        s = self.scale
+        x, y, w, h = rect
+        left, top = math.floor(x * s), math.floor(y * s)
+        return pygame.Rect(left, top, math.ceil((x + w) * s) - left, math.ceil((y + h) * s) - top)
+
+    def blit(self, image, dest, area=None, special_flags=0):
+        s = self.scale
+        small = mip(image, s)
+        alpha = image.get_alpha()
+        if alpha != small.get_alpha():
+            small.set_alpha(alpha)
+        x, y = dest[0], dest[1]
+        pos = (math.floor(x * s), math.floor(y * s))
+        if area is None:
+            self.surface.blit(small, pos, None, special_flags)
+            return pygame.Rect(x, y, *image.get_size())
+        area = pygame.Rect(area)
+        self.surface.blit(small, pos, self._rect(area), special_flags)
+        return pygame.Rect(x, y, area.width, area.height)
+
+    def blits(self, seq, doreturn=True):
+        blit = self.blit
+        out = [blit(*item) for item in seq]
+        return out if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        return self.surface.fill(color, None if rect is None else self._rect(pygame.Rect(rect)), special_flags)
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        s = self.scale
+        width = max(1, round(width * s)) if width > 0 else 0
+        pygame.draw.rect(self.surface, color, self._rect(pygame.Rect(rect)), width, border_radius=round(border_radius * s))
+        return pygame.Rect(rect)
+
+
+class ScaledBackend(ScaledCanvas):
+    """Desenho em resolucao interna menor (`scale` < 1), ampliado na saida.
+
+    As cenas continuam em coordenadas logicas (WIDTH x HEIGHT); hitboxes e
+    fisica nao enxergam a escala.
+
+    - present='scaled': janela com pygame.SCALED na resolucao interna; o SDL
+      amplia (e converte a posicao do mouse, que `map_event` devolve para
+      coordenadas logicas).
+    - present='scale': janela em tamanho cheio e um buffer interno ampliado
+      com um unico transform.scale por frame apresentado. Esse scale custa
+      mais que o desenho economizado em x0.75; so compensa perto de x0.5.
+    """
+
+    name = 'scaled'
+    software = True
+    retains_frame = True
+
+    def __init__(self, size, title='', scale=0.5, present='scaled'):
+        self.size = size
+        self.internal = mip_size(size, scale)
+        self.mode = present
+        if present == 'scaled':
+            self.window = None
+            surface = pygame.display.set_mode(self.internal, pygame.SCALED)
+        elif present == 'scale':
+            self.window = pygame.display.set_mode(size)
+            surface = pygame.Surface(self.internal).convert()
+        else:
+            raise ValueError(f'modo de apresentacao desconhecido: {present}')
+        super().__init__(surface, scale)
+        pygame.display.set_caption(title)
+
+    def offscreen(self, size):
+        # composicoes (parallax) ja nascem na resolucao interna
+        return ScaledCanvas(pygame.Surface(mip_size(size, self.scale)).convert(), self.scale)
+
+    def blit_offscreen(self, canvas, dest):
+        self.surface.blit(canvas.surface, (math.floor(dest[0] * self.scale), math.floor(dest[1] * self.scale)))
+
+    def present(self, dirty=None):
+        if dirty is not None and not dirty:
+            return
+        if self.mode == 'scale':
+            pygame.transform.scale(self.surface, self.size, self.window)
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+        elif dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update([self._rect(r) for r in dirty])
+
+    def map_event(self, event):
+        if self.mode == 'scaled' and hasattr(event, 'pos'):
+            event.pos = (int(event.pos[0] / self.scale), int(event.pos[1] / self.scale))
+        return event
+
+    def forget(self, surf):
+        # para surfaces redesenhadas depois de usadas: o mip antigo sai
+        forget_mips(surf)
+
+    def close(self):
+        pass
+
+
+class RendererBackend:
+    name = 'renderer'
+    software = False
+    retains_frame = False
+    TEXTURE_LIMIT = 1024
+    SHAPE_LIMIT = 64
+
+    def __init__(self, size, title='', driver=None, vsync=False):
+        from pygame._sdl2.video import Renderer, Texture, Window, get_drivers
+        self._Texture = Texture
+        self.size = size
+        self.surface = None
+        index = -1
+        if driver:
+            names = [d.name for d in get_drivers()]
+            if driver not in names:
+                raise pygame.error(f'driver de render indisponivel: {driver} (ha: {", ".join(names)})')
+            index = names.index(driver)
+        self.window = Window(title, size)
+        self.renderer = Renderer(self.window, index=index, vsync=vsync)
+        self._textures = OrderedDict()
+        self._shapes = OrderedDict()
+        self.uploads = 0
+
+    def texture(self, surf):
+        # textura da surface raiz + deslocamento da subsurface dentro dela
+        root = surf.get_abs_parent()
+        entry = self._textures.get(id(root))
+        if entry is None or entry[0] is not root:
+            entry = (root, self._Texture.from_surface(self.renderer, root))
+            self._textures[id(root)] = entry
+            self.uploads += 1
+            if len(self._textures) > self.TEXTURE_LIMIT:
+                self._textures.popitem(last=False)
+        else:
+            self._textures.move_to_end(id(root))
+        return entry[1], surf.get_abs_offset()
+
+    def forget(self, surf):
+        # para surfaces alteradas depois de desenhadas
+        self._textures.pop(id(surf.get_abs_parent()), None)
+
+    def blit(self, image, dest, area=None, special_flags=0):
+        tex, (ox, oy) = self.texture(image)
+        w, h = image.get_size()
+        if area is None:
+            src = pygame.Rect(ox, oy, w, h)
+        else:
+            src = pygame.Rect(area).clip((0, 0, w, h)).move(ox, oy)
+        alpha = image.get_alpha()
+        tex.alpha = 255 if alpha is None else alpha
+        dst = pygame.Rect(dest[0], dest[1], src.width, src.height)
+        tex.draw(srcrect=src, dstrect=dst)
+        return dst
+
+    def blits(self, seq, doreturn=True):
+        blit = self.blit
+        out = [blit(*item) for item in seq]
+        return out if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        self.renderer.draw_color = pygame.Color(color)
+        if rect is None:
+            self.renderer.fill_rect((0, 0, *self.size))
+        else:
+            self.renderer.fill_rect(pygame.Rect(rect))
+
+    def rect(self, color, rect, width=0, border_radius=0):
+        rect = pygame.Rect(rect)
+        if border_radius <= 0 and width <= 1:
+            self.renderer.draw_color = pygame.Color(color)
+            if width == 0:
+                self.renderer.fill_rect(rect)
+            else:
+                self.renderer.draw_rect(rect)
+            return rect
+        # cantos arredondados/bordas grossas: desenha uma vez numa surface e reaproveita
+        key = (tuple(pygame.Color(color)), rect.size, width, border_radius)
+        shape = self._shapes.get(key)
+        if shape is None:
+            shape = pygame.Surface(rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(shape, color, shape.get_rect(), width, border_radius=border_radius)
+            self._shapes[key] = shape
+            if len(self._shapes) > self.SHAPE_LIMIT:
+                old = self._shapes.popitem(last=False)[1]
+                self._textures.pop(id(old), None)
+        else:
+            self._shapes.move_to_end(key)
+        return self.blit(shape, rect.topleft)
+
+    def map_event(self, event):
+        return event
+
+    def present(self, dirty=None):
+        self.renderer.present()
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+
+    def close(self):
+        self._textures.clear()
+        self.window.destroy()
+
+
+def create_backend(name, size, title='', driver=None, scale=1.0, present='scaled'):
+    if name == 'renderer':
+        # o Renderer ja amplia/reduz na GPU; a escala interna vale para o backend de surfaces
+        return RendererBackend(size, title, driver)
+    if name != 'surface':
+        raise ValueError(f'backend desconhecido: {name}')
+    if scale != 1.0:
+        return ScaledBackend(size, title, scale, present)
+    return SurfaceBackend(size, title)
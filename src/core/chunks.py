@@ -0,0 +1,120 @@
+import math
+import pygame
+try:
+    from .assets import to_display
+    from .spatial import UniformGrid
+except ImportError:
+    from core.assets import to_display  # type: ignore
+    from core.spatial import UniformGrid  # type: ignore
+
+
+class ChunkedLayer:
+    """Geometria estatica pre-desenhada em blocos (chunks) de `chunk` px.
+
+    Os objetos entram com `add(obj, rect, image)`; `image` pode ser uma
+    Surface ou uma funcao que a devolve (para coisas com estado, como o
+    portao). Cada chunk e desenhado uma vez, na primeira vez que aparece na
+    camera, com os objetos na ordem em que foram adicionados.
+    `invalidate(rect)` descarta os chunks que cruzam `rect` para serem
+    refeitos. Acima de `budget_mb` os chunks mais longe da camera saem.
+
+    Cada chunk guarda so a area com pixels visiveis (get_bounding_rect), entao
+    um chunk quase vazio custa um blit pequeno.
+    """
+
+    def __init__(self, chunk=512, budget_mb=32):
+        self.chunk = chunk
+        self.budget = int(budget_mb * 1024 * 1024)
+        self.bytes = 0
+        self.bakes = 0
+        self.evictions = 0
+        self.drawn = 0
+        self._grid = UniformGrid(chunk)
+        self._images = {}
+        self._chunks = {}
+
+    def add(self, obj, rect, image=None):
+        self._images[obj] = image
+        self._grid.insert(obj, rect)
+        self.invalidate(rect)
+
+    def _image(self, obj):
+        image = self._images[obj]
+        if image is None:
+            return obj.image
+        return image() if callable(image) else image
+
+    def invalidate(self, rect):
+        x0, y0, x1, y1 = self._grid.span(pygame.Rect(rect))
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                self._drop((cx, cy))
+
+    def clear(self):
+        for key in list(self._chunks):
+            self._drop(key)
+
+    def _drop(self, key):
+        baked = self._chunks.pop(key, None)
+        if baked is not None:
+            surf = baked[0]
+            self.bytes -= surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    def _bake(self, key):
+        c = self.chunk
+        area = pygame.Rect(key[0] * c, key[1] * c, c, c)
+        objs = self._grid.query(area)
+        if not objs:
+            return None
+        surf = pygame.Surface((c, c), pygame.SRCALPHA)
+        for obj in objs:
+            surf.blit(self._image(obj), self._grid.rect_of(obj).move(-area.x, -area.y))
+        bounds = surf.get_bounding_rect()
+        if bounds.width == 0 or bounds.height == 0:
+            return None
+        surf = to_display(surf.subsurface(bounds).copy())
+        surf.set_alpha(255, pygame.RLEACCEL)
+        self.bakes += 1
+        self.bytes += surf.get_width() * surf.get_height() * surf.get_bytesize()
+        return surf, pygame.Rect(area.x + bounds.x, area.y + bounds.y, bounds.width, bounds.height)
+
+    def draw(self, screen, offset, view):
+        # view: retangulo da camera em coordenadas de mundo
+        c = self.chunk
+        x0, y0, x1, y1 = self._grid.span(view)
+        drawn = 0
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                key = (cx, cy)
+                if key not in self._chunks:
+                    self._chunks[key] = self._bake(key)
+                baked = self._chunks[key]
+                if baked is not None:
+                    screen.blit(baked[0], baked[1].move(offset))
+                    drawn += 1
+        self.drawn = drawn
+        if self.bytes > self.budget:
+            self._evict(view, (x0, y0, x1, y1))
+
+    def _evict(self, view, visible):
+        # os mais distantes do centro da camera saem primeiro; os visiveis ficam
+        c = self.chunk
+        vx, vy = view.center
+        x0, y0, x1, y1 = visible
+        far = sorted((k for k, s in self._chunks.items() if s is not None and not (x0 <= k[0] <= x1 and y0 <= k[1] <= y1)),
+                     key=lambda k: math.hypot((k[0] + 0.5) * c - vx, (k[1] + 0.5) * c - vy), reverse=True)
+        for key in far:
+            if self.bytes <= self.budget:
+                break
+            self._drop(key)
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            'chunks': sum(1 for s in self._chunks.values() if s is not None),
+            'bytes': self.bytes,
+            'budget': self.budget,
+            'bakes': self.bakes,
+            'evictions': self.evictions,
+            'drawn': self.drawn,
+        }
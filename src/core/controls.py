@@ -0,0 +1,45 @@
+from typing import NamedTuple
+
+import pygame
+
+
+class InputState(NamedTuple):
+    """Botoes que o jogador segura em um tick."""
+    left: bool = False
+    right: bool = False
+    jump: bool = False
+    attack: bool = False
+
+
+IDLE = InputState()
+
+
+class KeyboardControls:
+    """Le o teclado (pygame.key.get_pressed); precisa de janela."""
+
+    def read(self) -> InputState:
+        keys = pygame.key.get_pressed()
+        return InputState(
+            left=bool(keys[pygame.K_a] or keys[pygame.K_LEFT]),
+            right=bool(keys[pygame.K_d] or keys[pygame.K_RIGHT]),
+            jump=bool(keys[pygame.K_SPACE] or keys[pygame.K_w] or keys[pygame.K_UP]),
+            attack=bool(keys[pygame.K_j]),
+        )
+
+
+class ScriptedControls:
+    """Entrada injetada: quem dirige o jogo (bot, teste, replay) chama `set()` antes de cada tick."""
+
+    def __init__(self, state: InputState = IDLE):
+        self.state = state
+
+    def set(self, state: InputState = None, **buttons) -> InputState:
+        # set(InputState(...)) troca tudo; set(jump=True) muda so os botoes citados
+        if state is not None:
+            self.state = state
+        if buttons:
+            self.state = self.state._replace(**buttons)
+        return self.state
+
+    def read(self) -> InputState:
+        return self.state
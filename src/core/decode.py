@@ -0,0 +1,79 @@
+import os, threading, time
+from concurrent.futures import Future, ThreadPoolExecutor
+import pygame
+try:
+    from . import trace
+except ImportError:
+    from core import trace  # type: ignore
+
+
+class DecodeService:
+    """Pool de threads compartilhado para decodificar imagens.
+
+    pygame.image.load (PNG/GIF via SDL_image) e o decode do Pillow liberam a
+    GIL, entao varios arquivos decodificam em paralelo. `load_many` devolve
+    futures na mesma ordem dos caminhos; cada decode fica registrado em
+    `timings` (caminho -> segundos) para `report()`.
+    """
+
+    THREAD_PREFIX = 'decode'
+
+    def __init__(self, workers=None):
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.timings = {}
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.THREAD_PREFIX)
+        return self._pool
+
+    def submit(self, fn, *args, name=None):
+        # dentro de uma thread do pool roda direto: esperar outro future ali pode travar o pool
+        if threading.current_thread().name.startswith(self.THREAD_PREFIX):
+            fut = Future()
+            try:
+                fut.set_result(self._timed(name, fn, *args))
+            except Exception as exc:
+                fut.set_exception(exc)
+            return fut
+        return self._executor().submit(self._timed, name, fn, *args)
+
+    def load(self, path):
+        return self.submit(pygame.image.load, path, name=path)
+
+    def load_many(self, paths):
+        return [self.load(p) for p in paths]
+
+    def _timed(self, name, fn, *args):
+        start = time.perf_counter()
+        try:
+            with trace.span(os.path.basename(name) if name else fn.__name__, cat='decode'):
+                return fn(*args)
+        finally:
+            if name is not None:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.timings[name] = self.timings.get(name, 0.0) + elapsed
+
+    def report(self, top=10):
+        with self._lock:
+            items = sorted(self.timings.items(), key=lambda kv: kv[1], reverse=True)
+        return items[:top] if top else items
+
+    def print_report(self, top=10):
+        total = sum(self.timings.values())
+        print(f'[decode] {len(self.timings)} arquivos, {total*1000:.0f} ms somados ({self.workers} threads)')
+        for name, secs in self.report(top):
+            print(f'[decode] {secs*1000:8.1f} ms  {os.path.basename(name)}')
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+decoder = DecodeService()
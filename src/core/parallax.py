@@ -0,0 +1,122 @@
+import pygame
+try:
+    from .assets import to_display
+except ImportError:
+    from core.assets import to_display  # type: ignore
+
+
+def is_opaque(surf):
+    if not surf.get_flags() & pygame.SRCALPHA:
+        return True
+    return pygame.mask.from_surface(surf, 254).count() == surf.get_width() * surf.get_height()
+
+
+class ParallaxBackground:
+    """Fundo em camadas com rolagem parcial (parallax).
+
+    Cada camada repetida vira uma faixa ja ladrilhada com largura w + tela,
+    entao qualquer deslocamento sai num unico blit com `area`. Camadas sem
+    transparencia passam por `convert()` (blit sem mistura de alpha) e, se a
+    primeira for opaca, so as faixas que ela nao cobre recebem `fill`.
+
+    Enquanto o deslocamento das primeiras camadas nao muda de um frame para o
+    outro, elas sao compostas numa surface unica e o frame desenha so essa
+    composicao mais as camadas que se moveram (`cached` conta quantas
+    camadas sairam da composicao no ultimo draw).
+    """
+
+    FILL = (5, 5, 15)
+    MIN_CACHED = 2
+
+    def __init__(self, layers, size):
+        # layers: [(surface, fator_x, fator_y, repetir)], de tras para frente
+        self.size = size
+        self.layers = []
+        for img, dx, dy, tile in layers:
+            opaque = is_opaque(img)
+            if opaque:
+                img = to_display(img, alpha=False)
+            w, h = img.get_size()
+            dest_y = size[1] - h if h < size[1] * 0.7 else 0
+            strip = self._strip(img, size[0]) if tile else img
+            self.layers.append((strip, w, h, dx, dy, tile, dest_y))
+        first = self.layers[0] if self.layers else None
+        # a primeira camada cobre a largura toda se for opaca e repetida
+        self._base_covers = bool(first) and first[5] and is_opaque(first[0])
+        self.cached = 0
+        self._cache = None
+        self._cache_key = None
+        self._cache_owner = None
+        self._prev = None
+
+    def _offscreen(self, screen):
+        # o canvas decide a resolucao da composicao (ex.: a interna do ScaledBackend)
+        make = getattr(screen, 'offscreen', None)
+        if make is not None:
+            return make(self.size)
+        return to_display(pygame.Surface(self.size), alpha=False)
+
+    @staticmethod
+    def _strip(img, screen_w):
+        # largura w + tela: qualquer janela [x, x + tela) com 0 <= x < w cabe nela
+        w, h = img.get_size()
+        alpha = img.get_flags() & pygame.SRCALPHA
+        strip = pygame.Surface((w + screen_w, h), alpha, img)
+        for x in range(0, strip.get_width(), w):
+            # MAX sobre a faixa zerada copia os pixels (inclusive alpha) sem misturar
+            strip.blit(img, (x, 0), special_flags=pygame.BLEND_RGBA_MAX if alpha else 0)
+        return strip
+
+    def offsets(self, cam_x, cam_y):
+        return [(int(-cam_x * dx), int(-cam_y * dy)) for _strip, _w, _h, dx, dy, _t, _y in self.layers]
+
+    def draw(self, screen, cam_x, cam_y):
+        offsets = self.offsets(cam_x, cam_y)
+        stable = 0
+        if self._prev is not None:
+            while stable < len(offsets) and offsets[stable] == self._prev[stable]:
+                stable += 1
+        self._prev = offsets
+        start = 0
+        # no Renderer as camadas ja sao texturas: recompor em software so atrapalha
+        if stable >= self.MIN_CACHED and getattr(screen, 'software', True):
+            key = tuple(offsets[:stable])
+            if self._cache_owner is not screen:
+                self._cache = self._offscreen(screen)
+                self._cache_owner = screen
+                self._cache_key = None
+            if key != self._cache_key:
+                self._compose(self._cache, offsets, stable)
+                self._cache_key = key
+            getattr(screen, 'blit_offscreen', screen.blit)(self._cache, (0, 0))
+            start = stable
+        else:
+            self._fill(screen, offsets)
+        for i in range(start, len(self.layers)):
+            self._blit_layer(screen, self.layers[i], offsets[i])
+        self.cached = start
+
+    def _compose(self, target, offsets, count):
+        self._fill(target, offsets)
+        for i in range(count):
+            self._blit_layer(target, self.layers[i], offsets[i])
+
+    def _fill(self, target, offsets):
+        sw, sh = self.size
+        if not self._base_covers:
+            target.fill(self.FILL)
+            return
+        _strip, _w, h, _dx, _dy, _tile, dest_y = self.layers[0]
+        top = dest_y + offsets[0][1]
+        if top > 0:
+            target.fill(self.FILL, (0, 0, sw, top))
+        if top + h < sh:
+            target.fill(self.FILL, (0, top + h, sw, sh - top - h))
+
+    def _blit_layer(self, target, layer, offset):
+        strip, w, _h, _dx, _dy, tile, dest_y = layer
+        off_x, off_y = offset
+        if tile:
+            target.blit(strip, (0, dest_y + off_y), (off_x % w, 0, self.size[0], strip.get_height()))
+        else:
+            target.blit(strip, (off_x, dest_y + off_y))
@@ -0,0 +1,112 @@
+"""Gravacao da entrada por tick e reproducao deterministica.
+
+Uma Recording guarda a semente da sessao (core.rng), a entrada de cada tick
+(InputState como bits, em blocos `[bits, repeticoes]`) e o hash do estado no
+fim. Com a mesma semente e a mesma entrada, os ticks fixos do GameScene
+reproduzem a partida; `src/replay.py` refaz tudo sem janela e confere o hash.
+
+- InputRecorder: controles que repassam outros (o teclado) e gravam cada tick.
+- ReplayControls: devolve a entrada gravada, tick a tick.
+"""
+import hashlib, json
+
+try:
+    from .controls import IDLE, InputState
+except ImportError:
+    from core.controls import IDLE, InputState  # type: ignore
+
+VERSION = 1
+_BITS = tuple(1 << i for i in range(len(InputState._fields)))
+
+
+def encode(state):
+    return sum(bit for bit, pressed in zip(_BITS, state) if pressed)
+
+
+def decode(bits):
+    return InputState(*(bool(bits & bit) for bit in _BITS))
+
+
+def scene_state(scene):
+    # o que define a partida: jogador, inimigos, moedas e portal (camera e efeitos ficam de fora)
+    p = scene.player
+    return (
+        (tuple(p.rect), p.health, p.score, p.facing, round(p.vel.x, 6), round(p.vel.y, 6)),
+        tuple((tuple(e.rect), e.alive) for e in scene.level.enemies),
+        tuple(c.collected for c in scene.level.collectibles),
+        scene.level.gate_open,
+    )
+
+
+def state_hash(scene):
+    return hashlib.md5(repr(scene_state(scene)).encode()).hexdigest()
+
+
+class Recording:
+    def __init__(self, seed, tick_rate, runs=None, state=None):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.runs = runs if runs is not None else []
+        self.state = state
+
+    @property
+    def ticks(self):
+        return sum(count for _bits, count in self.runs)
+
+    def append(self, state):
+        bits = encode(state)
+        if self.runs and self.runs[-1][0] == bits:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([bits, 1])
+
+    def inputs(self):
+        for bits, count in self.runs:
+            state = decode(bits)
+            for _ in range(count):
+                yield state
+
+    def save(self, path):
+        data = {'version': VERSION, 'seed': self.seed, 'tick_rate': self.tick_rate,
+                'ticks': self.ticks, 'state': self.state, 'inputs': self.runs}
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(data, fh, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as fh:
+            data = json.load(fh)
+        if data.get('version') != VERSION:
+            raise ValueError(f'gravacao versao {data.get("version")}, esperado {VERSION}')
+        return cls(data['seed'], data['tick_rate'], data['inputs'], data.get('state'))
+
+
+class InputRecorder:
+    """Repassa `source.read()` e grava o resultado (o Player le uma vez por tick)."""
+
+    def __init__(self, source, seed, tick_rate):
+        self.source = source
+        self.recording = Recording(seed, tick_rate)
+
+    def read(self):
+        state = self.source.read()
+        self.recording.append(state)
+        return state
+
+
+class ReplayControls:
+    """Entrega a entrada gravada; depois do ultimo tick fica parado."""
+
+    def __init__(self, recording):
+        self._inputs = recording.inputs()
+        self.remaining = recording.ticks
+
+    @property
+    def exhausted(self):
+        return self.remaining <= 0
+
+    def read(self):
+        if self.remaining <= 0:
+            return IDLE
+        self.remaining -= 1
+        return next(self._inputs)
@@ -0,0 +1,39 @@
+import time
+
+
+class RenderQueue:
+    """Fila de desenho por camadas, enviada com `Surface.blits`.
+
+    `submit(camada, imagem, rect)` guarda o blit em coordenadas de mundo;
+    `flush(tela, offset)` desenha as camadas em ordem crescente de chave
+    (dentro da camada, na ordem de envio) com um unico `blits()` por camada,
+    somando o offset da camera uma vez por item. Depois do flush, `stats`
+    tem {camada: (blits, ms)} do ultimo frame.
+    """
+
+    def __init__(self):
+        self._layers = {}
+        self._order = []
+        self.stats = {}
+
+    def submit(self, layer, image, rect):
+        items = self._layers.get(layer)
+        if items is None:
+            items = self._layers[layer] = []
+            self._order = sorted(self._layers)
+        items.append((image, rect))
+
+    def flush(self, screen, offset=(0, 0)):
+        # Rect.move trunca o offset em float: o mesmo int() aqui mantem os pixels iguais
+        ox, oy = int(offset[0]), int(offset[1])
+        stats = {}
+        for layer in self._order:
+            items = self._layers[layer]
+            if not items:
+                continue
+            start = time.perf_counter()
+            screen.blits([(image, (r[0] + ox, r[1] + oy)) for image, r in items], False)
+            stats[layer] = (len(items), (time.perf_counter() - start) * 1000)
+            items.clear()
+        self.stats = stats
+        return stats
@@ -0,0 +1,26 @@
+"""Aleatoriedade da sessao: uma semente, dois fluxos.
+
+- `sim`: tudo que muda a partida (moeda sorteada, atordoamento do inimigo).
+- `fx`: so efeitos visuais (tremor da camera, onda das decoracoes).
+
+Desenhar mais ou menos frames consome `fx` e nunca desloca `sim`, entao a
+mesma semente com a mesma entrada por tick reproduz a partida (core.recording).
+Os objetos `sim` e `fx` nao mudam: `seed()` so os re-semeia, entao pode-se
+importar `from core import rng` e usar `rng.sim` direto.
+"""
+import random
+
+sim = random.Random()
+fx = random.Random()
+current = None
+
+
+def seed(value=None):
+    # None sorteia uma semente nova; devolve a semente usada (para gravar)
+    global current
+    if value is None:
+        value = random.SystemRandom().randrange(2 ** 32)
+    current = int(value)
+    sim.seed(f'{current}/sim')
+    fx.seed(f'{current}/fx')
+    return current
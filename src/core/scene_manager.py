@@ -1,27 +1,71 @@
 import pygame
-from typing import Optional
+from typing import List, Optional
 
 class Scene:
     def __init__(self, manager: 'SceneManager'):
         self.manager = manager
+        self.needs_full_redraw = True
     def handle_event(self, event: pygame.event.Event):
         pass
     def update(self, dt: float):
         pass
-    def draw(self, screen: pygame.Surface):
+    def draw(self, screen: pygame.Surface) -> Optional[List[pygame.Rect]]:
+        # devolve os retangulos alterados na tela, ou None para apresentar a tela inteira
+        return None
+    def invalidate(self):
+        # a tela foi alterada por fora: o proximo draw precisa repintar tudo
+        self.needs_full_redraw = True
+    def on_exit(self):
         pass
 
 class SceneManager:
-    def __init__(self):
+    """Cena atual + passo fixo da simulacao.
+
+    `advance(dt_real)` acumula o tempo do frame e chama `update(tick)` quantas
+    vezes couber (no maximo `max_frame` segundos por frame, para nao entrar em
+    espiral depois de um engasgo). `alpha` e a fracao de tick que sobrou: as
+    cenas desenham interpolando entre o estado anterior e o atual. Chamar
+    `update(dt)` direto (ferramentas, smoke) deixa `alpha = 1`.
+    """
+    def __init__(self, tick_rate: int = 60, max_frame: float = 0.25):
         self.current: Optional[Scene] = None
+        self.tick = 1.0 / tick_rate
+        self.max_frame = max_frame
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.ticks = 0
+        self._skip_frame = False
     def set(self, scene: Scene):
+        if self.current and self.current is not scene:
+            self.current.on_exit()
+            # a cena nova comeca do zero: o tempo acumulado (e o frame que a construiu) nao vira ticks
+            self.accumulator = 0.0
+            self._skip_frame = True
         self.current = scene
+    def advance(self, frame_dt: float) -> int:
+        if self._skip_frame:
+            frame_dt = 0.0
+            self._skip_frame = False
+        self.accumulator += min(frame_dt, self.max_frame)
+        ticks = 0
+        while self.accumulator >= self.tick:
+            self.accumulator -= self.tick
+            self.update(self.tick)
+            ticks += 1
+        self.alpha = self.accumulator / self.tick
+        self.ticks = ticks
+        return ticks
     def handle_event(self, event: pygame.event.Event):
         if self.current:
             self.current.handle_event(event)
     def update(self, dt: float):
+        self.alpha = 1.0
         if self.current:
             self.current.update(dt)
-    def draw(self, screen: pygame.Surface):
+    def draw(self, screen: pygame.Surface) -> Optional[List[pygame.Rect]]:
+        if self.current:
+            return self.current.draw(screen)
+        return None
+    def invalidate(self):
         if self.current:
-            self.current.draw(screen)
+            self.current.invalidate()
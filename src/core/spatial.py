@@ -0,0 +1,133 @@
+import pygame
+
+
+class UniformGrid:
+    """Indice espacial em grade uniforme (celulas de `cell` px).
+
+    Cada objeto entra com um retangulo em coordenadas de mundo e uma camada
+    ('platforms', 'enemies', ...). `query(rect, camada)` devolve so os
+    objetos que intersectam `rect`, na ordem em que foram inseridos, para
+    manter a ordem de desenho. Objetos que se movem chamam `update()`; ele so
+    troca as celulas quando o retangulo muda de celula.
+
+    `sweep(rect)` e a consulta para resolver colisao: rende os candidatos na
+    mesma ordem, acompanhando `rect` enquanto quem itera o empurra.
+    """
+
+    def __init__(self, cell=256):
+        self.cell = cell
+        self._cells = {}
+        self._items = {}
+        self._counts = {}
+        self._seq = 0
+
+    def span(self, rect):
+        c = self.cell
+        return (rect.left // c, rect.top // c,
+                (rect.right - 1) // c if rect.width > 0 else rect.left // c,
+                (rect.bottom - 1) // c if rect.height > 0 else rect.top // c)
+
+    def _add(self, obj, span):
+        x0, y0, x1, y1 = span
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                self._cells.setdefault((cx, cy), []).append(obj)
+
+    def _discard(self, obj, span):
+        x0, y0, x1, y1 = span
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.remove(obj)
+                    if not bucket:
+                        del self._cells[(cx, cy)]
+
+    def insert(self, obj, rect, layer=None):
+        if obj in self._items:
+            self.remove(obj)
+        rect = pygame.Rect(rect)
+        span = self.span(rect)
+        self._items[obj] = [layer, self._seq, span, rect]
+        self._counts[layer] = self._counts.get(layer, 0) + 1
+        self._seq += 1
+        self._add(obj, span)
+
+    def update(self, obj, rect):
+        item = self._items[obj]
+        span = self.span(rect)
+        if span != item[2]:
+            self._discard(obj, item[2])
+            self._add(obj, span)
+            item[2] = span
+        item[3].update(rect)
+
+    def remove(self, obj):
+        item = self._items.pop(obj, None)
+        if item is not None:
+            self._discard(obj, item[2])
+            self._counts[item[0]] -= 1
+
+    def rect_of(self, obj):
+        return self._items[obj][3]
+
+    def __contains__(self, obj):
+        return obj in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def count(self, layer=None):
+        if layer is None:
+            return len(self._items)
+        return self._counts.get(layer, 0)
+
+    def items(self, layer=None):
+        # todos os objetos da camada, na ordem de insercao
+        found = [(item[1], obj) for obj, item in self._items.items() if layer is None or item[0] == layer]
+        found.sort(key=lambda pair: pair[0])
+        return [obj for _seq, obj in found]
+
+    def query(self, rect, layer=None):
+        x0, y0, x1, y1 = self.span(rect)
+        items = self._items
+        found = {}
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                for obj in self._cells.get((cx, cy), ()):
+                    if obj in found:
+                        continue
+                    item = items[obj]
+                    if (layer is None or item[0] == layer) and item[3].colliderect(rect):
+                        found[obj] = item[1]
+        return sorted(found, key=found.__getitem__)
+
+    def sweep(self, rect, layer=None, margin=0):
+        # `rect` e o retangulo vivo da entidade: se a resolucao da colisao o tirar
+        # da regiao consultada, a regiao e refeita e seguem so os itens com ordem
+        # maior que o ultimo entregue. Quem ficou de fora nunca tocou `rect`, entao
+        # o resultado e o mesmo de percorrer a lista inteira.
+        items = self._items
+        region = rect.inflate(2 * margin, 2 * margin)
+        found = self.query(region, layer)
+        i = 0
+        last = -1
+        while True:
+            if not region.contains(rect):
+                region = rect.inflate(2 * margin, 2 * margin)
+                found = [obj for obj in self.query(region, layer) if items[obj][1] > last]
+                i = 0
+            if i >= len(found):
+                return
+            obj = found[i]
+            i += 1
+            last = items[obj][1]
+            yield obj
+
+
+def near(platforms, rect, margin=16):
+    # UniformGrid: so os candidatos perto de `rect`; lista simples: todos, como antes.
+    # a margem cobre o empurrao tipico de um tick sem refazer a consulta
+    if isinstance(platforms, UniformGrid):
+        return platforms.sweep(rect, margin=margin)
+    return platforms
@@ -0,0 +1,160 @@
+import hashlib, json, mmap, os, struct, sys
+import pygame
+try:
+    from .. import settings
+    from .assets import registry, to_display
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import settings  # type: ignore
+    from core.assets import registry, to_display  # type: ignore
+
+# Arquivo gerado por `python -m src.tools.bake_sprites`:
+#   [MAGIC][tamanho do indice][indice JSON][frames RGBA crus, alinhados em 16 bytes]
+# Cada clip do indice guarda a chave do registry, as fontes (mtime/tamanho/sha1)
+# e (offset, w, h) de cada frame.
+MAGIC = b'BRSPR001'
+HEADER = struct.Struct('<8sI')
+ALIGN = 16
+
+
+def key_id(key):
+    # chaves do registry carregam caminhos absolutos; o cache vale para qualquer pasta do jogo
+    return repr(key).replace(repr(settings.IMG_DIR)[1:-1], '<img>')
+
+
+def _sha1(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def fingerprint(paths):
+    out = []
+    for path in paths:
+        rel = os.path.relpath(path, settings.IMG_DIR)
+        if os.path.isdir(path):
+            names = sorted(os.listdir(path))
+            out.append({'path': rel, 'list': hashlib.sha1('\n'.join(names).encode('utf-8')).hexdigest()})
+            out.extend(fingerprint([os.path.join(path, n) for n in names if os.path.isfile(os.path.join(path, n))]))
+        elif os.path.isfile(path):
+            st = os.stat(path)
+            out.append({'path': rel, 'mtime': st.st_mtime_ns, 'size': st.st_size, 'sha1': _sha1(path)})
+        else:
+            out.append({'path': rel, 'missing': True})
+    return out
+
+
+def source_fresh(src):
+    path = os.path.join(settings.IMG_DIR, src['path'])
+    if 'list' in src:
+        if not os.path.isdir(path):
+            return False
+        names = sorted(os.listdir(path))
+        return hashlib.sha1('\n'.join(names).encode('utf-8')).hexdigest() == src['list']
+    if src.get('missing'):
+        return not os.path.exists(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if st.st_size != src['size']:
+        return False
+    if st.st_mtime_ns == src['mtime']:
+        return True
+    # mtime mudou (checkout, copia): so e obsoleto se o conteudo mudou
+    return _sha1(path) == src['sha1']
+
+
+def write_cache(path, clips):
+    # clips: [(key_id, sources, shape, {state: [(w, h, rgba_bytes), ...]})]
+    index = []
+    blobs = []
+    offset = 0
+    for kid, sources, shape, states in clips:
+        entry = {'key': kid, 'sources': sources, 'shape': shape, 'states': {}}
+        for state, frames in states.items():
+            metas = []
+            for w, h, data in frames:
+                metas.append([offset, w, h])
+                pad = (-len(data)) % ALIGN
+                blobs.append(data)
+                if pad:
+                    blobs.append(b'\0' * pad)
+                offset += len(data) + pad
+            entry['states'][state] = metas
+        index.append(entry)
+    raw_index = json.dumps(index).encode('utf-8')
+    head = HEADER.size + len(raw_index)
+    pad = (-head) % ALIGN
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as fh:
+        fh.write(HEADER.pack(MAGIC, len(raw_index)))
+        fh.write(raw_index)
+        fh.write(b'\0' * pad)
+        for blob in blobs:
+            fh.write(blob)
+    os.replace(tmp, path)
+    return offset
+
+
+class SpriteCache:
+    def __init__(self, path, mm, index, data_start):
+        self.path = path
+        self._mm = mm
+        self._view = memoryview(mm)
+        self._index = {e['key']: e for e in index}
+        self._data_start = data_start
+        self.loaded = 0
+        self.stale = 0
+
+    @classmethod
+    def open(cls, path=None):
+        path = path or settings.SPRITE_CACHE
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as fh:
+                # ACCESS_COPY: paginas privadas e graváveis, exigidas por pygame.image.frombuffer
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_COPY)
+            magic, index_len = HEADER.unpack_from(mm, 0)
+            if magic != MAGIC:
+                mm.close()
+                return None
+            start = HEADER.size
+            index = json.loads(bytes(mm[start:start + index_len]).decode('utf-8'))
+        except (OSError, ValueError, struct.error):
+            return None
+        head = HEADER.size + index_len
+        return cls(path, mm, index, head + (-head) % ALIGN)
+
+    def __contains__(self, key):
+        return key_id(key) in self._index
+
+    def lookup(self, key):
+        entry = self._index.get(key_id(key))
+        if entry is None:
+            return None
+        if not all(source_fresh(src) for src in entry['sources']):
+            self.stale += 1
+            return None
+        states = {}
+        for state, metas in entry['states'].items():
+            frames = []
+            for offset, w, h in metas:
+                start = self._data_start + offset
+                buf = self._view[start:start + w * h * 4]
+                frames.append(to_display(pygame.image.frombuffer(buf, (w, h), 'RGBA')))
+            states[state] = frames
+        self.loaded += 1
+        if entry['shape'] == 'list':
+            return states.get('', [])
+        return states
+
+
+def load(path=None):
+    # chamado depois de display.set_mode: conecta o cache ao registry (ou None se ausente)
+    registry.baked = SpriteCache.open(path)
+    return registry.baked
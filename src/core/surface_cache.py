@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+
+
+def surface_bytes(value):
+    # bytes de pixels (w*h*bytesize); listas/tuplas somam os itens
+    if value is None:
+        return 0
+    if isinstance(value, (list, tuple)):
+        return sum(surface_bytes(v) for v in value)
+    return value.get_width() * value.get_height() * value.get_bytesize()
+
+
+class SurfaceCache:
+    """Cache LRU de surfaces com limite de memoria.
+
+    Cada entrada conta w*h*bytesize. Acima do orcamento as entradas menos
+    usadas saem, exceto as fixadas com `pin()` (um dono por pin; `release(dono)`
+    solta tudo o que ele fixou - as cenas fazem isso ao sair).
+    """
+
+    def __init__(self, budget_mb=64):
+        self.budget = int(budget_mb * 1024 * 1024)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._pins = {}
+        self._lock = threading.RLock()
+
+    def get(self, key, loader=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        if loader is None:
+            return None
+        return self.put(key, loader())
+
+    def put(self, key, value):
+        size = surface_bytes(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            self._evict()
+        return value
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def pin(self, key, owner=None):
+        with self._lock:
+            self._pins.setdefault(key, set()).add(id(owner))
+
+    def unpin(self, key, owner=None):
+        with self._lock:
+            owners = self._pins.get(key)
+            if owners is not None:
+                owners.discard(id(owner))
+                if not owners:
+                    del self._pins[key]
+            self._evict()
+
+    def release(self, owner):
+        with self._lock:
+            for key in [k for k, owners in self._pins.items() if id(owner) in owners]:
+                self.unpin(key, owner)
+
+    def set_budget(self, budget_mb):
+        with self._lock:
+            self.budget = int(budget_mb * 1024 * 1024)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pins.clear()
+            self.bytes = 0
+
+    def _evict(self):
+        if self.bytes <= self.budget:
+            return
+        for key in list(self._entries):
+            if self.bytes <= self.budget:
+                break
+            if key in self._pins:
+                continue
+            _value, size = self._entries.pop(key)
+            self.bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'pinned': len(self._pins),
+                'bytes': self.bytes,
+                'budget': self.budget,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
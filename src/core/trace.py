@@ -0,0 +1,141 @@
+"""Trace de inicializacao no formato Chrome trace_event (abre no Perfetto).
+
+Desligado por padrao. Liga com a variavel BRAINROT_TRACE (=1 ou =caminho)
+ou com `--trace` / `--trace=caminho` na linha de comando; o arquivo e
+gravado na saida do processo (padrao: trace.json).
+
+Desligado, `span()` devolve sempre o mesmo objeto vazio e `traced()`
+devolve a propria funcao, sem wrapper.
+"""
+import atexit, json, os, sys, threading, time
+
+
+def _configured_path():
+    for arg in sys.argv[1:]:
+        if arg == '--trace':
+            return 'trace.json'
+        if arg.startswith('--trace='):
+            return arg.split('=', 1)[1] or 'trace.json'
+    env = os.environ.get('BRAINROT_TRACE', '')
+    if env and env != '0':
+        return 'trace.json' if env == '1' else env
+    return None
+
+
+path = _configured_path()
+enabled = path is not None
+_events = []
+_threads = {}
+_counters = {}
+_lock = threading.Lock()
+_t0 = time.perf_counter_ns()
+_pid = os.getpid()
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'cat', 'args', 'start')
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        thread = threading.current_thread()
+        event = {
+            'name': self.name, 'cat': self.cat, 'ph': 'X',
+            'ts': (self.start - _t0) / 1000.0, 'dur': (end - self.start) / 1000.0,
+            'pid': _pid, 'tid': thread.ident,
+        }
+        if self.args:
+            event['args'] = self.args
+        with _lock:
+            _events.append(event)
+            _threads[thread.ident] = thread.name
+        return False
+
+
+def span(name, cat='load', **args):
+    if not enabled:
+        return _NULL
+    return _Span(name, cat, args)
+
+
+def traced(name=None, cat='load'):
+    # decorator: sem trace ligado a funcao volta intacta
+    def wrap(fn):
+        if not enabled:
+            return fn
+        label = name or fn.__qualname__
+
+        def inner(*a, **kw):
+            with _Span(label, cat, None):
+                return fn(*a, **kw)
+        inner.__name__ = fn.__name__
+        inner.__qualname__ = fn.__qualname__
+        inner.__doc__ = fn.__doc__
+        return inner
+    return wrap
+
+
+def instant(name, cat='mark'):
+    if not enabled:
+        return
+    with _lock:
+        _events.append({
+            'name': name, 'cat': cat, 'ph': 'i', 's': 'g',
+            'ts': (time.perf_counter_ns() - _t0) / 1000.0,
+            'pid': _pid, 'tid': threading.get_ident(),
+        })
+
+
+def counter(name, values, cat='frame'):
+    # serie numerica (ph 'C'): o Perfetto desenha um grafico por chave de `values`;
+    # so grava quando os valores mudam (o grafico fica em degrau ate o proximo evento)
+    if not enabled:
+        return
+    values = dict(values)
+    with _lock:
+        if _counters.get(name) == values:
+            return
+        _counters[name] = values
+        _events.append({
+            'name': name, 'cat': cat, 'ph': 'C',
+            'ts': (time.perf_counter_ns() - _t0) / 1000.0,
+            'pid': _pid, 'tid': threading.get_ident(), 'args': values,
+        })
+
+
+def write(out=None):
+    out = out or path
+    with _lock:
+        events = list(_events)
+        names = dict(_threads)
+    for tid in {e['tid'] for e in events if 'tid' in e}:
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': _pid, 'tid': tid,
+                       'args': {'name': names.get(tid, str(tid))}})
+    with open(out, 'w', encoding='utf-8') as fh:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, fh)
+    return out
+
+
+if enabled:
+    atexit.register(write)
@@ -1,52 +1,81 @@
-import pygame, os, sys, math, random
+import pygame, os, sys, math
 try:
     from .. import settings
+    from ..core.assets import registry
+    from ..core import rng
 except ImportError:
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     import settings  # type: ignore
+    from core.assets import registry  # type: ignore
+    from core import rng  # type: ignore
 
 COIN_FILES = ['coins/Instagram.png', 'coins/TikTok.png', 'coins/Youtube.png']
-_COIN_CACHE: list[pygame.Surface] = []
+COIN_SIZE = (32, 32)
 
-def _load_coins():
-    if _COIN_CACHE:
-        return _COIN_CACHE
+def coin_clip():
+    return ('coins', tuple(COIN_FILES), COIN_SIZE), _build_coins
+
+def _build_coins():
+    coins = []
     for fname in COIN_FILES:
-        img = settings.load_image(fname, (32,32))
+        img = settings.load_image(fname, COIN_SIZE)
         if img:
-            _COIN_CACHE.append(img)
-    if not _COIN_CACHE:
-        surf = pygame.Surface((32,32))
+            coins.append(img)
+    if not coins:
+        surf = pygame.Surface(COIN_SIZE)
         surf.fill((255,215,0))
-        _COIN_CACHE.append(surf)
-    return _COIN_CACHE
+        coins.append(surf)
+    return coins
+
+def _load_coins():
+    return registry.get(*coin_clip())
+
+PULSE_STEPS = 42  # um ciclo do bob (sin(t*0.15)) ~ 41.9 frames; o pulso (sin(t*0.3)) da duas voltas nele
+_PULSE_TABLES = {}
+
+def pulse_table(image):
+    """(surface, bob) para cada passo do ciclo, compartilhado por todas as moedas com a mesma imagem.
+
+    A escala varia so 10%, entao os 42 passos caem em poucos tamanhos
+    distintos; cada tamanho e redimensionado uma unica vez.
+    """
+    entry = _PULSE_TABLES.get(id(image))
+    if entry is None:
+        base_w, base_h = image.get_size()
+        by_size = {}
+        table = []
+        for i in range(PULSE_STEPS):
+            phase = 2 * math.pi * i / PULSE_STEPS
+            scale = 1 + math.sin(phase * 2) * 0.1
+            size = (int(base_w*scale), int(base_h*scale))
+            if size not in by_size:
+                by_size[size] = image if size == (base_w, base_h) else pygame.transform.smoothscale(image, size)
+            table.append((by_size[size], round(math.sin(phase) * 4)))
+        entry = _PULSE_TABLES[id(image)] = (image, tuple(table))
+    return entry[1]
 
 class Collectible(pygame.sprite.Sprite):
     def __init__(self, pos):
         super().__init__()
         choices = _load_coins()
-        self.base_image = random.choice(choices)
-        self.image = self.base_image.copy()
+        self.base_image = rng.sim.choice(choices)
+        self.pulse = pulse_table(self.base_image)
+        self.image = self.base_image
         self.rect = self.image.get_rect(center=pos)
+        self.render_rect = self.rect.copy()
         self.timer = 0
         self.collected = False
 
-    def update(self):
+    def update(self, ticks=1):
         if self.collected:
             return
-        self.timer += 1
-        offset = math.sin(self.timer * 0.15) * 4
-        self.rect.y += offset
-        self.rect.y -= offset 
-        scale = 1 + math.sin(self.timer * 0.3) * 0.1
-        base_w, base_h = self.base_image.get_size()
-        size_w = int(base_w*scale)
-        size_h = int(base_h*scale)
-        self.image = pygame.transform.smoothscale(self.base_image, (size_w,size_h))
-        self.rect = self.image.get_rect(center=self.rect.center)
+        # ticks > 1: acordando do sono (core.activity), cai no mesmo passo do pulso
+        self.timer += ticks
+        # rect fica fixo (colisao); pulso e bob so mexem no que e desenhado
+        self.image, bob = self.pulse[self.timer % PULSE_STEPS]
+        self.render_rect = self.image.get_rect(center=(self.rect.centerx, self.rect.centery + bob))
 
     def try_collect(self, player):
         if not self.collected and self.rect.colliderect(player.rect):
             self.collected = True
             player.score += 10
-            self.image.set_alpha(0)
@@ -1,11 +1,13 @@
-import pygame, random, sys, os
+import pygame, sys, os
 try:
     from .. import settings
     from .mossy_assets import extract_components
+    from ..core import rng
 except ImportError:
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     import settings  # type: ignore
     from mossy_assets import extract_components  # type: ignore
+    from core import rng  # type: ignore
 
 class Decoration(pygame.sprite.Sprite):
     def __init__(self, surface: pygame.Surface, pos, parallax=1.0):
@@ -13,8 +15,9 @@ class Decoration(pygame.sprite.Sprite):
         self.base_image = surface
         self.image = surface.copy()
         self.rect = self.image.get_rect(topleft=pos)
+        self.render_rect = self.rect.copy()
         self.parallax = parallax 
-        self.offset_wave = random.random()*10
+        self.offset_wave = rng.fx.random()*10
         self.wave_amp = 2
         self.wave_speed = 1.2
 
@@ -1,20 +1,39 @@
-import pygame, os, sys, random
+import pygame, os, sys
 try:
     from .. import settings
+    from ..core.assets import registry, to_display
+    from ..core.decode import decoder
+    from ..core import trace
+    from ..core.spatial import near
+    from ..core import rng
 except ImportError:
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     import settings  # type: ignore
+    from core.assets import registry, to_display  # type: ignore
+    from core.decode import decoder  # type: ignore
+    from core import trace  # type: ignore
+    from core.spatial import near  # type: ignore
+    from core import rng  # type: ignore
 
 class Enemy(pygame.sprite.Sprite):
 
     HITBOX_WIDTH_RATIO = 0.55
     HITBOX_HEIGHT_RATIO = 0.72
     FEET_OFFSET = 0
+    CROP_MIN_ALPHA = 10
+    EFFECTS = ('hit',)
+    SPRITES = (
+        ('idle', 'Mushroom-Idle.png'),
+        ('run', 'Mushroom-Run.png'),
+        ('attack', 'Mushroom-Attack.png'),
+        ('hit', 'Mushroom-Hit.png'),
+        ('stun', 'Mushroom-Stun.png'),
+        ('die', 'Mushroom-Die.png'),
+    )
     DEBUG = False
 
     def __init__(self, pos, patrol=(0, 100)):
         super().__init__()
-        self.animations = {}
         self.state = 'idle'
         self.frame_index = 0
         self.frame_timer = 0.0
@@ -33,8 +52,9 @@ class Enemy(pygame.sprite.Sprite):
         self.stun_timer = 0
         self.attack_timer = 0
 
-        self._load_animations()
-        self._normalize_animations()
+        key, builder = self.clip()
+        self.animations = registry.get(key, builder)
+        self.variants = registry.variants(key, self.EFFECTS)
 
         first = self.animations['idle'][0]
         fw, fh = first.get_width(), first.get_height()
@@ -51,43 +71,51 @@ class Enemy(pygame.sprite.Sprite):
         self.vel_y = 0
         self.on_ground = False
 
-    def _slice_sheet(self, path):
-        if not os.path.exists(path):
-            return []
-        sheet = pygame.image.load(path).convert_alpha()
+    @classmethod
+    def clip(cls):
+        base = os.path.join(settings.IMG_DIR, 'Mushroom')
+        key = ('Mushroom', base, cls.SPRITES, cls.CROP_MIN_ALPHA)
+        return key, lambda: cls._normalize_animations(cls._load_animations(base))
+
+    @staticmethod
+    def _slice_sheet(sheet):
+        sheet = to_display(sheet)
         h = sheet.get_height(); w = sheet.get_width()
         if h <= 0 or w <= 0: return []
         frame_w = h 
         cols = max(1, w // frame_w)
         return [sheet.subsurface(pygame.Rect(i*frame_w, 0, frame_w, h)).copy() for i in range(cols)]
 
-    def _create_placeholder(self):
+    @staticmethod
+    def _create_placeholder():
         s = pygame.Surface((48,48), pygame.SRCALPHA)
         s.fill((120,60,10))
         pygame.draw.rect(s,(0,0,0),s.get_rect(),2)
         return s
 
-    def _load_animations(self):
-        base = os.path.join(settings.IMG_DIR, 'Mushroom')
-        sprite_map = {
-            'idle': 'Mushroom-Idle.png',
-            'run': 'Mushroom-Run.png',
-            'attack': 'Mushroom-Attack.png',
-            'hit': 'Mushroom-Hit.png',
-            'stun': 'Mushroom-Stun.png',
-            'die': 'Mushroom-Die.png'
-        }
-        for state, file in sprite_map.items():
-            frames = self._slice_sheet(os.path.join(base, file))
-            self.animations[state] = frames if frames else [self._create_placeholder()]
-
-    def _normalize_animations(self):
+    @classmethod
+    @trace.traced('Enemy._load_animations')
+    def _load_animations(cls, base):
+        animations = {}
+        pending = {}
+        for state, file in cls.SPRITES:
+            path = os.path.join(base, file)
+            if os.path.exists(path):
+                pending[state] = decoder.load(path)
+        for state, file in cls.SPRITES:
+            frames = cls._slice_sheet(pending[state].result()) if state in pending else []
+            animations[state] = frames if frames else [cls._create_placeholder()]
+        return animations
+
+    @classmethod
+    @trace.traced('Enemy._normalize_animations')
+    def _normalize_animations(cls, animations):
         cropped = {}
         max_w = 0; max_h = 0
-        for state, frames in self.animations.items():
+        for state, frames in animations.items():
             new_list = []
             for f in frames:
-                r = f.get_bounding_rect(min_alpha=10)
+                r = f.get_bounding_rect(min_alpha=cls.CROP_MIN_ALPHA)
                 if r.width == 0 or r.height == 0:
                     r = pygame.Rect(0,0,1,1)
                 sub = f.subsurface(r).copy()
@@ -96,7 +124,7 @@ class Enemy(pygame.sprite.Sprite):
                 if sub.get_height() > max_h: max_h = sub.get_height()
             cropped[state] = new_list
         if max_w == 0 or max_h == 0:
-            return
+            return animations
         for state, frames in cropped.items():
             uniform = []
             for f in frames:
@@ -105,7 +133,8 @@ class Enemy(pygame.sprite.Sprite):
                 dest.midbottom = (max_w//2, max_h)
                 canvas.blit(f, dest)
                 uniform.append(canvas)
-            self.animations[state] = uniform
+            animations[state] = uniform
+        return animations
 
     def _set_state(self):
         if not self.alive:
@@ -128,22 +157,18 @@ class Enemy(pygame.sprite.Sprite):
         if self.frame_timer >= self.anim_speed:
             self.frame_timer = 0.0
             self.frame_index = (self.frame_index + 1) % len(frames)
-        frame = frames[self.frame_index]
-        if self.facing == -1:
-            frame = pygame.transform.flip(frame, True, False)
-        self.image = frame.copy()
-        if self.hit_timer > 0 and (self.hit_timer // 2) % 2 == 0:
-            tint = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
-            tint.fill((255,60,60,120))
-            self.image.blit(tint, (0,0), special_flags=pygame.BLEND_RGBA_ADD)
+        effect = 'hit' if self.hit_timer > 0 and (self.hit_timer // 2) % 2 == 0 else None
+        self.image = self.variants.get(self.state, self.frame_index, self.facing, effect)
         self.render_rect = self.image.get_rect(midbottom=(self.rect.midbottom[0], self.rect.bottom + self.FEET_OFFSET))
         if self.DEBUG:
+            # frames do banco sao compartilhados: o contorno vai numa copia
+            self.image = self.image.copy()
             dbg = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
             pygame.draw.rect(dbg, (0,255,0,120), dbg.get_rect(), 1)
             self.image.blit(dbg, (0,0))
 
     def update(self, platforms):
-        dt = 1/60
+        dt = settings.TICK
         if self.alive:
             if self.stun_timer <= 0 and self.hit_timer <= 0 and self.attack_timer <= 0:
                 self.rect.x += self.speed * self.direction
@@ -155,7 +180,7 @@ class Enemy(pygame.sprite.Sprite):
             if self.vel_y > 12: self.vel_y = 12
             self.rect.y += int(self.vel_y)
             self.on_ground = False
-            for p in platforms:
+            for p in near(platforms, self.rect):
                 if self.rect.colliderect(p.rect):
                     if self.vel_y > 0 and self.rect.bottom >= p.rect.top and self.rect.centery < p.rect.centery:
                         self.rect.bottom = p.rect.top
@@ -169,7 +194,7 @@ class Enemy(pygame.sprite.Sprite):
                 self.vel_y += 0.6
                 if self.vel_y > 12: self.vel_y = 12
                 self.rect.y += int(self.vel_y)
-                for p in platforms:
+                for p in near(platforms, self.rect):
                     if self.rect.colliderect(p.rect) and self.vel_y > 0:
                         self.rect.bottom = p.rect.top
                         self.vel_y = 0
@@ -179,6 +204,10 @@ class Enemy(pygame.sprite.Sprite):
         self._set_state()
         self._animate(dt)
 
+    def collision_bounds(self):
+        # area em que hit_player pode acertar o jogador (broadphase do CollisionWorld)
+        return self.rect
+
     def hit_player(self, player):
         if not self.alive: return
         if self.rect.colliderect(player.rect):
@@ -196,7 +225,7 @@ class Enemy(pygame.sprite.Sprite):
         if self.health <= 0:
             self.kill()
         else:
-            if random.random() < 0.35:
+            if rng.sim.random() < 0.35:
                 self.stun_timer = 50
 
     def kill(self):
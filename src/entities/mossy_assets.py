@@ -1,80 +1,128 @@
-import pygame, os, sys
+import pygame, json, os, sys
 try:
     from .. import settings
+    from ..core.assets import to_display
+    from ..core.decode import decoder
+    from ..core import trace
 except ImportError:
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     import settings  # type: ignore
+    from core.assets import to_display  # type: ignore
+    from core.decode import decoder  # type: ignore
+    from core import trace  # type: ignore
+try:
+    import numpy as np
+    _NP_OK = True
+except ImportError:
+    _NP_OK = False
 
-_COMP_CACHE = {}
+MASK_THRESHOLD = 127
+INDEX_SUFFIX = '.components.json'
 
 def _load_image(path):
     try:
-        return pygame.image.load(path).convert_alpha()
+        return to_display(decoder.load(path).result())
     except Exception:
         return None
 
 def extract_components(filename: str, min_w=16, min_h=16, max_components=64):
-    key = (filename, min_w, min_h, max_components)
-    if key in _COMP_CACHE:
-        return _COMP_CACHE[key]
+    key = ('components', filename, min_w, min_h, max_components)
+    return settings.surface_cache.get(key, lambda: _extract_components(filename, min_w, min_h, max_components))
+
+def _extract_components(filename, min_w, min_h, max_components):
     path = os.path.join(settings.IMG_DIR, 'Mossy Tileset', filename)
     if not os.path.exists(path):
-        _COMP_CACHE[key] = []
         return []
     sheet = _load_image(path)
     if sheet is None:
-        _COMP_CACHE[key] = []
         return []
-    mask = pygame.mask.from_surface(sheet)
     comps = []
-    done = 0
-    if hasattr(mask, 'connected_components'):
-        try:
-            for comp in mask.connected_components():
-                rects = comp.get_bounding_rects()
-                if not rects:
-                    continue
-                r = rects[0]
-                if r.width < min_w or r.height < min_h:
-                    continue
-                surf = pygame.Surface((r.width, r.height), pygame.SRCALPHA)
-                surf.blit(sheet, (0,0), r)
-                comps.append(surf)
-                done += 1
-                if done >= max_components:
-                    break
-        except Exception:
-            pass
-    if not comps:
-        w,h = mask.get_size()
-        visited = [[False]*w for _ in range(h)]
-        dirs = ((1,0),(-1,0),(0,1),(0,-1))
-        for y in range(h):
-            for x in range(w):
-                if done >= max_components:
-                    break
-                if visited[y][x] or not mask.get_at((x,y)):
-                    continue
-                stack=[(x,y)]; visited[y][x]=True
-                pixels=[]
-                minx=maxx=x; miny=maxy=y
-                while stack:
-                    cx,cy = stack.pop()
-                    pixels.append((cx,cy))
-                    if cx<minx: minx=cx
-                    if cx>maxx: maxx=cx
-                    if cy<miny: miny=cy
-                    if cy>maxy: maxy=cy
-                    for dx,dy in dirs:
-                        nx,ny = cx+dx, cy+dy
-                        if 0<=nx<w and 0<=ny<h and not visited[ny][nx] and mask.get_at((nx,ny)):
-                            visited[ny][nx]=True
-                            stack.append((nx,ny))
-                rect = pygame.Rect(minx,miny,maxx-minx+1,maxy-miny+1)
-                if rect.width < min_w or rect.height < min_h:
-                    continue
-                surf = pygame.Surface(rect.size, pygame.SRCALPHA)
-                surf.blit(sheet, (0,0), rect)
-                comps.append(surf); done +=1
-    _COMP_CACHE[key] = comps
+    for r in component_rects(path, sheet):
+        if r.width < min_w or r.height < min_h:
+            continue
+        surf = pygame.Surface((r.width, r.height), pygame.SRCALPHA)
+        surf.blit(sheet, (0,0), r)
+        comps.append(surf)
+        if len(comps) >= max_components:
+            break
     return comps
+
+def component_rects(path, sheet):
+    """Retangulos de todos os componentes (8-vizinhanca, alpha > 127) da sheet.
+
+    O resultado fica num indice ao lado da imagem (`<sheet>.components.json`)
+    e so e recalculado quando o mtime/tamanho do arquivo muda.
+    """
+    index_path = path + INDEX_SUFFIX
+    st = os.stat(path)
+    try:
+        with open(index_path, encoding='utf-8') as fh:
+            index = json.load(fh)
+        if index['mtime'] == st.st_mtime_ns and index['size'] == st.st_size and index['threshold'] == MASK_THRESHOLD:
+            return [pygame.Rect(r) for r in index['rects']]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    with trace.span('mossy components', file=os.path.basename(path)):
+        rects = _label(sheet)
+    try:
+        with open(index_path, 'w', encoding='utf-8') as fh:
+            json.dump({'mtime': st.st_mtime_ns, 'size': st.st_size, 'threshold': MASK_THRESHOLD,
+                       'rects': [list(r) for r in rects]}, fh)
+    except OSError:
+        pass
+    return rects
+
+def _label(sheet):
+    if _NP_OK:
+        return _label_runs(pygame.surfarray.array_alpha(sheet).T > MASK_THRESHOLD)
+    mask = pygame.mask.from_surface(sheet, MASK_THRESHOLD)
+    rects = []
+    for comp in mask.connected_components():
+        found = comp.get_bounding_rects()
+        if found:
+            rects.append(found[0].unionall(found[1:]))
+    rects.sort(key=lambda r: (r.y, r.x))
+    return rects
+
+def _label_runs(solid):
+    # rotulagem por runs: cada linha vira intervalos [ini, fim) de pixels solidos;
+    # runs de linhas vizinhas que se tocam (inclusive na diagonal) sao unidos por
+    # propagacao do menor rotulo. O rotulo final e o indice do primeiro run do
+    # componente, entao a ordem sai igual a da varredura linha a linha.
+    h, w = solid.shape
+    if h == 0 or w == 0:
+        return []
+    padded = np.zeros((h, w + 2), dtype=np.int8)
+    padded[:, 1:-1] = solid
+    edges = np.diff(padded, axis=1)
+    row_s, start = np.nonzero(edges == 1)
+    row_e, end = np.nonzero(edges == -1)
+    n = len(start)
+    if n == 0:
+        return []
+    # chaves globais: passo w+2 por linha para runs de linhas diferentes nunca se tocarem
+    stride = w + 2
+    key_s = row_s * stride + start
+    key_e = row_e * stride + end
+    # para cada run, os runs da linha de cima com fim >= ini e inicio <= fim
+    lo = np.searchsorted(key_e + stride, key_s, side='left')
+    hi = np.searchsorted(key_s + stride, key_e + 1, side='left')
+    counts = np.maximum(hi - lo, 0)
+    a = np.repeat(np.arange(n), counts)
+    b = np.repeat(lo, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+    labels = np.arange(n)
+    while len(a):
+        low = np.minimum(labels[a], labels[b])
+        before = labels.copy()
+        np.minimum.at(labels, a, low)
+        np.minimum.at(labels, b, low)
+        labels = labels[labels]
+        if np.array_equal(labels, before):
+            break
+    roots, inverse = np.unique(labels, return_inverse=True)
+    k = len(roots)
+    x0 = np.full(k, w); np.minimum.at(x0, inverse, start)
+    x1 = np.zeros(k, dtype=np.intp); np.maximum.at(x1, inverse, end)
+    y0 = np.full(k, h); np.minimum.at(y0, inverse, row_s)
+    y1 = np.zeros(k, dtype=np.intp); np.maximum.at(y1, inverse, row_s)
+    return [pygame.Rect(int(x0[i]), int(y0[i]), int(x1[i] - x0[i]), int(y1[i] - y0[i] + 1)) for i in range(k)]
@@ -1,14 +1,27 @@
-import os, sys, pygame, random
+import os, sys, pygame
 try:
     from .. import settings
+    from ..core.assets import can_convert, registry
+    from ..core.decode import decoder
+    from ..core import trace
+    from ..core.spatial import near
 except ImportError:
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     import settings  # type: ignore
+    from core.assets import can_convert, registry  # type: ignore
+    from core.decode import decoder  # type: ignore
+    from core import trace  # type: ignore
+    from core.spatial import near  # type: ignore
 try:
     from PIL import Image
     _PIL_OK = True
 except ImportError: 
     _PIL_OK = False
+try:
+    import numpy as np
+    _NP_OK = True
+except ImportError:
+    _NP_OK = False
 
 class NightBorneEnemy(pygame.sprite.Sprite):
     HITBOX_W_RATIO = 0.50
@@ -18,11 +31,20 @@ class NightBorneEnemy(pygame.sprite.Sprite):
     ATTACK_COOLDOWN = 50
     ATTACK_RANGE_X = 38 
     DAMAGE = 1
+    BG_TOLERANCE = 18
+    CROP_MIN_ALPHA = 10
+    EFFECTS = ()
+    GIFS = (
+        ('idle', 'NightBorne_idle.gif'),
+        ('run', 'NightBorne_run.gif'),
+        ('attack', 'NightBorne_attack.gif'),
+        ('hurt', 'NightBorne_hurt.gif'),
+        ('die', 'NightBorne_death..gif'),
+    )
     DEBUG = False
 
     def __init__(self, pos, patrol=(-40, 40)):
         super().__init__()
-        self.animations = {}
         self.state = 'idle'
         self.frame_index = 0
         self.frame_timer = 0.0
@@ -45,42 +67,53 @@ class NightBorneEnemy(pygame.sprite.Sprite):
         self.vel_y = 0
         self.on_ground = False
 
-        self._load_gifs()
-        self._normalize()
+        key, builder = self.clip()
+        self.animations = registry.get(key, builder)
+        self.variants = registry.variants(key, self.EFFECTS)
 
         first = self.animations['idle'][0]
-        fw, fh = first.get_width(), first.get_height()
-        hb_w = max(8, int(fw * self.HITBOX_W_RATIO))
-        hb_h = max(8, int(fh * self.HITBOX_H_RATIO))
-        self.rect = pygame.Rect(0,0,hb_w,hb_h)
-        self.rect.midbottom = (pos[0] + fw//2, pos[1] + fh)
+        self.rect = self.hitbox(first, pos)
         self.start_x = self.rect.centerx
         self.image = first
         self.render_rect = self.image.get_rect(midbottom=self.rect.midbottom)
 
+    @classmethod
+    def hitbox(cls, first, pos):
+        # hitbox menor que o frame, com os pes no fundo do frame desenhado em `pos`
+        fw, fh = first.get_width(), first.get_height()
+        rect = pygame.Rect(0, 0, max(8, int(fw * cls.HITBOX_W_RATIO)), max(8, int(fh * cls.HITBOX_H_RATIO)))
+        rect.midbottom = (pos[0] + fw//2, pos[1] + fh)
+        return rect
+
     # -------------- Carregamento GIFs -------------- #
-    def _load_gifs(self):
+    @classmethod
+    def clip(cls):
         base = os.path.join(settings.IMG_DIR, 'NightBorne')
-        mapping = {
-            'idle': 'NightBorne_idle.gif',
-            'run': 'NightBorne_run.gif',
-            'attack': 'NightBorne_attack.gif',
-            'hurt': 'NightBorne_hurt.gif',
-            'die': 'NightBorne_death..gif'
-        }
-        for state, fname in mapping.items():
+        key = ('NightBorne', base, cls.GIFS, cls.BG_TOLERANCE, cls.CROP_MIN_ALPHA)
+        return key, lambda: cls._normalize(cls._load_gifs(base))
+
+    @classmethod
+    @trace.traced('NightBorneEnemy._load_gifs')
+    def _load_gifs(cls, base):
+        animations = {}
+        pending = []
+        for state, fname in cls.GIFS:
             path = os.path.join(base, fname)
-            frames = self._extract_frames(path)
+            pending.append((state, decoder.submit(cls._extract_frames, path, name=path)))
+        for state, fut in pending:
+            frames = fut.result()
             if not frames:
                 surf = pygame.Surface((48,48), pygame.SRCALPHA)
                 surf.fill((200,0,200))
                 pygame.draw.rect(surf,(0,0,0),surf.get_rect(),2)
                 frames = [surf]
-            self.animations[state] = frames
-        if 'hurt' not in self.animations:
-            self.animations['hurt'] = self.animations.get('idle', [])
+            animations[state] = frames
+        if 'hurt' not in animations:
+            animations['hurt'] = animations.get('idle', [])
+        return animations
 
-    def _extract_frames(self, path):
+    @classmethod
+    def _extract_frames(cls, path):
         if not os.path.exists(path):
             return []
         frames = []
@@ -91,33 +124,67 @@ class NightBorneEnemy(pygame.sprite.Sprite):
                 while True:
                     im.seek(index)
                     frame = im.convert('RGBA')
-                    mode = frame.mode
-                    size = frame.size
-                    data = frame.tobytes()
-                    surf = pygame.image.fromstring(data, size, mode)
-                    frames.append(self._remove_background(surf))
+                    if _NP_OK:
+                        frames.append(cls._frame_to_surface(frame))
+                    else:
+                        mode = frame.mode
+                        size = frame.size
+                        data = frame.tobytes()
+                        surf = pygame.image.fromstring(data, size, mode)
+                        frames.append(cls._remove_background(surf))
                     index += 1
             except EOFError:
                 pass
             except Exception:
                 try:
-                    surf = pygame.image.load(path).convert_alpha()
-                    frames = [self._remove_background(surf)]
+                    frames = [cls._remove_background(cls._load_rgba(path))]
                 except Exception:
                     frames = []
         else:
             try:
-                surf = pygame.image.load(path).convert_alpha()
-                frames = [self._remove_background(surf)]
+                frames = [cls._remove_background(cls._load_rgba(path))]
             except Exception:
                 frames = []
         return frames
 
-    def _remove_background(self, surf):
+    @staticmethod
+    def _load_rgba(path):
+        img = pygame.image.load(path)
+        if can_convert():
+            return img.convert_alpha()
+        # fora da thread principal (ou sem janela) nao ha convert_alpha: copia para uma surface 32 bits com alpha
+        surf = pygame.Surface(img.get_size(), pygame.SRCALPHA)
+        surf.blit(img, (0, 0))
+        return surf
+
+    @classmethod
+    def _frame_to_surface(cls, frame):
+        # um unico array RGBA: o fundo e apagado nele e a Surface compartilha o buffer (sem copia)
+        arr = np.array(frame, dtype=np.uint8)
+        cls._key_out(arr[..., :3], arr[..., 3])
+        return pygame.image.frombuffer(arr, frame.size, 'RGBA')
+
+    @classmethod
+    def _key_out(cls, rgb, alpha):
+        # mesma regra do loop por pixel: |canal - canto sup. esq.| <= tolerancia nos 3 canais
+        if alpha[0, 0] == 0:
+            return
+        tl = rgb[0, 0].astype(np.int16)
+        mask = (np.abs(rgb.astype(np.int16) - tl) <= cls.BG_TOLERANCE).all(axis=-1)
+        alpha[mask] = 0
+
+    @classmethod
+    def _remove_background(cls, surf):
+        if _NP_OK:
+            rgb = pygame.surfarray.pixels3d(surf)
+            alpha = pygame.surfarray.pixels_alpha(surf)
+            cls._key_out(rgb, alpha)
+            del rgb, alpha
+            return surf
         tl = surf.get_at((0,0))
         if tl.a == 0:
             return surf
-        tol = 18
+        tol = cls.BG_TOLERANCE
         w,h = surf.get_size()
         surf.lock()
         for y in range(h):
@@ -129,13 +196,15 @@ class NightBorneEnemy(pygame.sprite.Sprite):
         return surf
 
     # -------------- Normalização -------------- #
-    def _normalize(self):
+    @classmethod
+    @trace.traced('NightBorneEnemy._normalize')
+    def _normalize(cls, animations):
         max_w = 0; max_h = 0
         cropped = {}
-        for st, frs in self.animations.items():
+        for st, frs in animations.items():
             new = []
             for f in frs:
-                r = f.get_bounding_rect(min_alpha=10)
+                r = f.get_bounding_rect(min_alpha=cls.CROP_MIN_ALPHA)
                 if r.w == 0 or r.h == 0:
                     r = pygame.Rect(0,0,1,1)
                 sub = f.subsurface(r).copy()
@@ -144,7 +213,7 @@ class NightBorneEnemy(pygame.sprite.Sprite):
                 if sub.get_height() > max_h: max_h = sub.get_height()
             cropped[st] = new
         if max_w == 0 or max_h == 0:
-            return
+            return animations
         for st, frs in cropped.items():
             uniform = []
             for f in frs:
@@ -153,7 +222,8 @@ class NightBorneEnemy(pygame.sprite.Sprite):
                 dest.midbottom = (max_w//2, max_h)
                 canvas.blit(f, dest)
                 uniform.append(canvas)
-            self.animations[st] = uniform
+            animations[st] = uniform
+        return animations
 
     # -------------- Lógica -------------- #
     def _set_state(self):
@@ -186,18 +256,17 @@ class NightBorneEnemy(pygame.sprite.Sprite):
             else:
                 self.frame_timer = 0
                 self.frame_index = (self.frame_index + 1) % len(frames)
-        frame = frames[self.frame_index]
-        if self.facing == -1:
-            frame = pygame.transform.flip(frame, True, False)
-        self.image = frame.copy()
+        self.image = self.variants.get(self.state, self.frame_index, self.facing)
         self.render_rect = self.image.get_rect(midbottom=self.rect.midbottom)
         if self.DEBUG:
+            # frames do banco sao compartilhados: o contorno vai numa copia
+            self.image = self.image.copy()
             dbg = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
             pygame.draw.rect(dbg,(0,255,0,120), dbg.get_rect(),1)
             self.image.blit(dbg,(0,0))
 
     def update(self, platforms):
-        dt = 1/60
+        dt = settings.TICK
         if self.alive:
             self.rect.x += self.speed * self.direction
             left_lim = self.start_x + self.patrol[0]
@@ -214,7 +283,7 @@ class NightBorneEnemy(pygame.sprite.Sprite):
             if self.vel_y > self.MAX_FALL: self.vel_y = self.MAX_FALL
             self.rect.y += int(self.vel_y)
             self.on_ground = False
-            for p in platforms:
+            for p in near(platforms, self.rect):
                 if self.rect.colliderect(p.rect):
                     if self.vel_y > 0 and self.rect.bottom >= p.rect.top and self.rect.centery < p.rect.centery:
                         self.rect.bottom = p.rect.top
@@ -227,7 +296,7 @@ class NightBorneEnemy(pygame.sprite.Sprite):
                 self.vel_y += self.GRAVITY
                 if self.vel_y > self.MAX_FALL: self.vel_y = self.MAX_FALL
                 self.rect.y += int(self.vel_y)
-                for p in platforms:
+                for p in near(platforms, self.rect):
                     if self.rect.colliderect(p.rect) and self.vel_y > 0:
                         self.rect.bottom = p.rect.top
                         self.vel_y = 0
@@ -238,14 +307,30 @@ class NightBorneEnemy(pygame.sprite.Sprite):
         self._animate(dt)
 
     # ---------- Interações ---------- #
+    @classmethod
+    def in_reach(cls, rect, target):
+        # o golpe de um inimigo com hitbox `rect` alcanca `target`: centro a menos de
+        # ATTACK_RANGE_X e 10 px de folga vertical (NightBorneCrowd usa a mesma regra)
+        return (abs(target.centerx - rect.centerx) < cls.ATTACK_RANGE_X
+                and target.bottom > rect.top - 10 and target.top < rect.bottom + 10)
+
+    @classmethod
+    def reach_bounds(cls, rect):
+        # caixa que contem tudo que in_reach pode acertar, mais a hitbox (broadphase do CollisionWorld)
+        reach = pygame.Rect(rect.centerx - cls.ATTACK_RANGE_X, rect.top - 10,
+                            2 * cls.ATTACK_RANGE_X, rect.height + 20)
+        return reach.union(rect)
+
+    def collision_bounds(self):
+        return self.reach_bounds(self.rect)
+
     def hit_player(self, player):
         if not self.alive: return
-        if abs(player.rect.centerx - self.rect.centerx) < self.ATTACK_RANGE_X and self.attack_timer <= 0:
-            if player.rect.bottom > self.rect.top - 10 and player.rect.top < self.rect.bottom + 10:
-                self.attack_timer = self.ATTACK_COOLDOWN
-                self.frame_index = 0
-                kb_dir = 1 if player.rect.centerx > self.rect.centerx else -1
-                player.take_damage(self.DAMAGE, pygame.Vector2(kb_dir*6, -6))
+        if self.attack_timer <= 0 and self.in_reach(self.rect, player.rect):
+            self.attack_timer = self.ATTACK_COOLDOWN
+            self.frame_index = 0
+            kb_dir = 1 if player.rect.centerx > self.rect.centerx else -1
+            player.take_damage(self.DAMAGE, pygame.Vector2(kb_dir*6, -6))
 
     def take_damage(self, amount):
         if not self.alive or self.hurt_timer > 0:
@@ -0,0 +1,299 @@
+import os, sys, pygame
+try:
+    from .. import settings
+    from ..core.assets import registry
+    from ..core.spatial import UniformGrid
+    from .nightborne import NightBorneEnemy
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+    import settings  # type: ignore
+    from core.assets import registry  # type: ignore
+    from core.spatial import UniformGrid  # type: ignore
+    from entities.nightborne import NightBorneEnemy  # type: ignore
+try:
+    import numpy as np
+    _NP_OK = True
+except ImportError:
+    _NP_OK = False
+
+
+def _round(values):
+    # Rect arredonda floats com meio para longe do zero (2.5 -> 3, -2.5 -> -3)
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5)).astype(np.int64)
+
+
+class NightBorneCrowd:
+    """Muitos NightBorne num unico objeto, com o estado em arrays NumPy.
+
+    `step(platforms, active)` faz o mesmo que NightBorneEnemy.update para todos
+    os indices de `active` de uma vez (patrulha, gravidade, pouso na primeira
+    plataforma da lista, timers e avanco dos frames), com os mesmos
+    arredondamentos do Rect. As imagens continuam vindo do VariantBank do
+    NightBorne.
+
+    `crowd[i]` devolve um CrowdMember: mesma interface que o resto do jogo usa
+    de um inimigo (rect, image, render_rect, alive, hit_player, take_damage,
+    collision_bounds). O rect de um membro e um Rect de verdade; alteracoes
+    nele (ex.: recuo do golpe) voltam para os arrays no proximo acesso.
+    `visible(view)` corta a camera de forma vetorizada.
+
+    Os membros nao tem `update`: com `Level1(crowd=True)` (ou BRAINROT_CROWD=1)
+    o nivel chama `step` uma vez por tick, so com os membros dentro da regiao
+    ativa da camera (`visible`), e entrega os membros em `level.enemies`, que
+    o GameScene passa ao CollisionWorld e ao RenderQueue.
+    """
+
+    STATES = ('idle', 'run', 'attack', 'hurt', 'die')
+    IDLE, RUN, ATTACK, HURT, DIE = range(5)
+    available = _NP_OK
+
+    def __init__(self, spawns):
+        # spawns: [(pos, patrol)] como nos argumentos de NightBorneEnemy
+        if not _NP_OK:
+            raise RuntimeError('NightBorneCrowd precisa do numpy')
+        cls = NightBorneEnemy
+        key, builder = cls.clip()
+        self.animations = registry.get(key, builder)
+        self.variants = registry.variants(key, cls.EFFECTS)
+        self.nframes = np.array([len(self.animations.get(s, ())) for s in self.STATES], dtype=np.int64)
+        first = self.animations['idle'][0]
+        self.frame_size = first.get_size()
+        rects = [cls.hitbox(first, pos) for pos, _patrol in spawns]
+        n = len(rects)
+        self.w = rects[0].width if rects else 0
+        self.h = rects[0].height if rects else 0
+        self.x = np.array([r.x for r in rects], dtype=np.int64)
+        self.y = np.array([r.y for r in rects], dtype=np.int64)
+        self.start_x = self.x + self.w // 2
+        self.patrol_lo = np.array([p[0] for _pos, p in spawns], dtype=np.int64)
+        self.patrol_hi = np.array([p[1] for _pos, p in spawns], dtype=np.int64)
+        self.speed = 1.6
+        self.anim_speed = 0.12
+        self.direction = np.ones(n, dtype=np.int64)
+        self.facing = np.ones(n, dtype=np.int64)
+        self.vel_y = np.zeros(n, dtype=np.float64)
+        self.on_ground = np.zeros(n, dtype=bool)
+        self.alive = np.ones(n, dtype=bool)
+        self.health = np.full(n, 4, dtype=np.int64)
+        self.attack_timer = np.zeros(n, dtype=np.int64)
+        self.hurt_timer = np.zeros(n, dtype=np.int64)
+        self.frame_timer = np.zeros(n, dtype=np.float64)
+        self.frame_index = np.zeros(n, dtype=np.int64)
+        self.state = np.zeros(n, dtype=np.int64)
+        self.death_frozen = np.zeros(n, dtype=bool)
+        self._members = {}
+        self._touched = set()
+        self._platforms = None
+        self._platform_arrays = None
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, i):
+        member = self._members.get(i)
+        if member is None:
+            member = self._members[i] = CrowdMember(self, i)
+        return member
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    # -------------- Simulacao -------------- #
+    def _sync(self):
+        # rects entregues aos membros podem ter sido alterados por fora
+        if not self._touched:
+            return
+        for member in self._touched:
+            r = member._rect
+            self.x[member.index] = r.x
+            self.y[member.index] = r.y
+            member._rect = None
+        self._touched.clear()
+
+    def _platform_table(self, platforms):
+        # lista simples ou UniformGrid (Level1.solids a partir de BROADPHASE_MIN plataformas);
+        # a tabela e montada uma vez por objeto: as plataformas solidas nao se movem
+        if platforms is not self._platforms:
+            items = platforms.items() if isinstance(platforms, UniformGrid) else platforms
+            rects = [p.rect for p in items]
+            self._platforms = platforms
+            self._platform_arrays = tuple(np.array(v, dtype=np.int64) for v in (
+                [r.left for r in rects], [r.top for r in rects], [r.right for r in rects],
+                [r.bottom for r in rects], [r.centery for r in rects]))
+        return self._platform_arrays
+
+    def step(self, platforms, active=None):
+        # active: indices (ou mascara) de quem anda neste tick, como as regioes de
+        # atividade fazem com os objetos; os outros congelam (a fisica nao pula ticks)
+        self._sync()
+        cls = NightBorneEnemy
+        if active is None:
+            act = np.ones(len(self), dtype=bool)
+        elif getattr(active, 'dtype', None) == bool:
+            act = active
+        else:
+            act = np.zeros(len(self), dtype=bool)
+            act[active] = True
+        alive = self.alive & act
+        half_w = self.w // 2
+        # patrulha
+        x = np.where(alive, _round(self.x + self.speed * self.direction), self.x)
+        cx = x + half_w
+        lo = self.start_x + self.patrol_lo
+        hi = self.start_x + self.patrol_hi
+        below = alive & (cx < lo)
+        above = alive & ~below & (cx > hi)
+        x = np.where(below, lo - half_w, x)
+        x = np.where(above, hi - half_w, x)
+        self.direction[below] = 1
+        self.facing[below] = 1
+        self.direction[above] = -1
+        self.facing[above] = -1
+        self.x = x
+        # gravidade: vivos sempre, mortos ate tocar o chao
+        falling = act & (self.alive | ~self.on_ground)
+        self.vel_y = np.where(falling, np.minimum(self.vel_y + cls.GRAVITY, cls.MAX_FALL),
+                              np.where(act, 0.0, self.vel_y))
+        self.y = np.where(falling, self.y + np.trunc(self.vel_y).astype(np.int64), self.y)
+        self.on_ground &= ~alive
+        self._land(platforms, falling)
+        # timers
+        self.attack_timer = np.where(alive & (self.attack_timer > 0), self.attack_timer - 1, self.attack_timer)
+        self.hurt_timer = np.where(alive & (self.hurt_timer > 0), self.hurt_timer - 1, self.hurt_timer)
+        self._set_state(act)
+        self._animate(settings.TICK, act)
+
+    def _land(self, platforms, rows):
+        pl, pt, pr, pb, pcy = self._platform_table(platforms)
+        idx = np.flatnonzero(rows & (self.vel_y > 0))
+        if not len(idx) or not len(pl):
+            return
+        x, y = self.x[idx, None], self.y[idx, None]
+        right, bottom = x + self.w, y + self.h
+        # so as plataformas que cruzam a caixa de quem esta caindo (a ordem da lista se mantem)
+        cols = np.flatnonzero((pl < right.max()) & (x.min() < pr) & (pt < bottom.max()) & (y.min() < pb))
+        if not len(cols):
+            return
+        pl, pt, pr, pb, pcy = pl[cols], pt[cols], pr[cols], pb[cols], pcy[cols]
+        hit = (x < pr) & (pl < right) & (y < pb) & (pt < bottom)
+        # vivos so pousam vindo de cima; mortos pousam em qualquer contato
+        from_above = (bottom >= pt) & ((y + self.h // 2) < pcy)
+        hit &= from_above | ~self.alive[idx, None]
+        landed = hit.any(axis=1)
+        idx = idx[landed]
+        first = hit[landed].argmax(axis=1)
+        self.y[idx] = pt[first] - self.h
+        self.vel_y[idx] = 0.0
+        self.on_ground[idx] = True
+
+    def _set_state(self, act):
+        moving = abs(self.speed) * np.abs(self.direction) > 0.05
+        state = np.select(
+            [~self.alive, self.hurt_timer > 0, self.attack_timer > 0, moving],
+            [self.DIE, self.HURT, self.ATTACK, self.RUN], self.IDLE)
+        self.state = np.where(act, state, self.state)
+        n = self.nframes[self.state]
+        self.frame_index = np.where(act & (n > 0) & (self.frame_index >= n), 0, self.frame_index)
+
+    def _animate(self, dt, act):
+        n = self.nframes[self.state]
+        has = act & (n > 0)
+        self.frame_timer = np.where(has, self.frame_timer + dt, self.frame_timer)
+        tick = has & (self.frame_timer >= self.anim_speed)
+        dying = tick & (self.state == self.DIE)
+        cycling = tick & ~dying
+        step = dying & ~self.death_frozen
+        idx = np.where(step & (self.frame_index < n - 1), self.frame_index + 1, self.frame_index)
+        self.death_frozen |= step & (idx == n - 1)
+        idx = np.where(cycling, (idx + 1) % np.maximum(n, 1), idx)
+        self.frame_index = idx
+        self.frame_timer = np.where(tick, 0.0, self.frame_timer)
+
+    # -------------- Desenho -------------- #
+    def image(self, i):
+        return self.variants.get(self.STATES[self.state[i]], int(self.frame_index[i]), int(self.facing[i]))
+
+    def visible(self, view):
+        # indices cujo frame desenhado cruza `view` (mundo), na ordem dos spawns
+        self._sync()
+        fw, fh = self.frame_size
+        left = self.x + self.w // 2 - fw // 2
+        top = self.y + self.h - fh
+        keep = (left < view.right) & (view.left < left + fw) & (top < view.bottom) & (view.top < top + fh)
+        return np.flatnonzero(keep)
+
+    # -------------- Interacoes (por membro) -------------- #
+    def positions(self):
+        # copia de (x, y) de todos, para interpolar o desenho entre ticks
+        self._sync()
+        return self.x.copy(), self.y.copy()
+
+    def rect_of(self, i):
+        # Rect avulso com a posicao atual (nao volta para os arrays)
+        self._sync()
+        return pygame.Rect(int(self.x[i]), int(self.y[i]), self.w, self.h)
+
+    def hit_player(self, i, player):
+        if not self.alive[i] or self.attack_timer[i] > 0:
+            return
+        rect = self.rect_of(i)
+        if NightBorneEnemy.in_reach(rect, player.rect):
+            self.attack_timer[i] = NightBorneEnemy.ATTACK_COOLDOWN
+            self.frame_index[i] = 0
+            kb_dir = 1 if player.rect.centerx > rect.centerx else -1
+            player.take_damage(NightBorneEnemy.DAMAGE, pygame.Vector2(kb_dir*6, -6))
+
+    def take_damage(self, i, amount):
+        if not self.alive[i] or self.hurt_timer[i] > 0:
+            return
+        self.health[i] -= amount
+        self.hurt_timer[i] = 18
+        self.frame_index[i] = 0
+        if self.health[i] <= 0:
+            self.alive[i] = False
+            self.state[i] = self.DIE
+            self.death_frozen[i] = False
+
+
+class CrowdMember:
+    """Um inimigo da multidao visto como objeto (para colisao, HUD, desenho)."""
+
+    __slots__ = ('crowd', 'index', '_rect')
+
+    def __init__(self, crowd, index):
+        self.crowd = crowd
+        self.index = index
+        self._rect = None
+
+    @property
+    def rect(self):
+        if self._rect is None:
+            c = self.crowd
+            self._rect = pygame.Rect(int(c.x[self.index]), int(c.y[self.index]), c.w, c.h)
+            c._touched.add(self)
+        return self._rect
+
+    @property
+    def alive(self):
+        return bool(self.crowd.alive[self.index])
+
+    @property
+    def image(self):
+        return self.crowd.image(self.index)
+
+    def _current(self):
+        # rect atual sem marcar o membro como alterado (so leitura)
+        return self._rect if self._rect is not None else self.crowd.rect_of(self.index)
+
+    @property
+    def render_rect(self):
+        return self.image.get_rect(midbottom=self._current().midbottom)
+
+    def collision_bounds(self):
+        return NightBorneEnemy.reach_bounds(self._current())
+
+    def hit_player(self, player):
+        self.crowd.hit_player(self.index, player)
+
+    def take_damage(self, amount):
+        self.crowd.take_damage(self.index, amount)
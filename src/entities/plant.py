@@ -1,20 +1,27 @@
 import pygame, os, random, sys
 try:
     from .. import settings
+    from ..core.assets import registry, to_display
+    from ..core.decode import decoder
+    from ..core import trace
 except ImportError:
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     import settings  # type: ignore
+    from core.assets import registry, to_display  # type: ignore
+    from core.decode import decoder  # type: ignore
+    from core import trace  # type: ignore
 
 class Plant(pygame.sprite.Sprite):
-    def __init__(self, kind='BlueFlower1', pos=(0,0), fps=20):
+    TARGET_H = 48
+
+    def __init__(self, kind='BlueFlower1', pos=(0,0), fps=40):
         super().__init__()
         self.kind = kind
-        self.frames = []
         self.frame_index = 0
         self.timer = 0.0
         self.fps = fps
         self.loop = True
-        self._load_frames()
+        self.frames = registry.get(*self.clip(kind))
         if not self.frames:
             self.image = pygame.Surface((16,16), pygame.SRCALPHA)
             self.image.fill((0,200,0,120))
@@ -22,36 +29,47 @@ class Plant(pygame.sprite.Sprite):
             self.image = self.frames[0]
         self.rect = self.image.get_rect(topleft=pos)
 
-    def _load_frames(self):
-        root = os.path.join(settings.IMG_DIR, 'Plant Animations', self.kind)
+    @classmethod
+    def clip(cls, kind):
+        root = os.path.join(settings.IMG_DIR, 'Plant Animations', kind)
+        return ('Plant', root, cls.TARGET_H), lambda: cls._load_frames(root)
+
+    @classmethod
+    @trace.traced('Plant._load_frames')
+    def _load_frames(cls, root):
+        frames = []
         if not os.path.isdir(root):
-            return
+            return frames
         files = [f for f in os.listdir(root) if f.lower().endswith('.png')]
         files.sort()
-        for f in files:
+        for fut in decoder.load_many([os.path.join(root, f) for f in files]):
             try:
-                img = pygame.image.load(os.path.join(root,f)).convert_alpha()
-                self.frames.append(img)
+                img = to_display(fut.result())
+                frames.append(img)
             except Exception:
                 continue
-        if self.frames:
-            fw, fh = self.frames[0].get_size()
+        if frames:
+            fw, fh = frames[0].get_size()
             scale = 1.0
-            target_h = 48
+            target_h = cls.TARGET_H
             if fh > target_h:
                 scale = target_h / fh
             if scale != 1.0:
                 new_frames = []
-                for fr in self.frames:
+                for fr in frames:
                     sz = (int(fr.get_width()*scale), int(fr.get_height()*scale))
                     new_frames.append(pygame.transform.smoothscale(fr, sz))
-                self.frames = new_frames
+                frames = new_frames
+        return frames
 
     def update(self, dt):
         if not self.frames:
             return
         self.timer += dt
         frame_time = 1.0 / self.fps
+        if self.loop and self.timer >= frame_time * len(self.frames):
+            # acordando de um sono longo: voltas inteiras do loop nao mudam o frame
+            self.timer %= frame_time * len(self.frames)
         while self.timer >= frame_time:
             self.timer -= frame_time
             self.frame_index += 1
@@ -1,36 +1,36 @@
 import pygame, os, sys
 try:
     from .. import settings
+    from ..core.assets import registry, to_display
+    from ..core.decode import decoder
 except ImportError:
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     import settings  # type: ignore
+    from core.assets import registry, to_display  # type: ignore
+    from core.decode import decoder  # type: ignore
 
-_FLOOR_IMG = None
-_FLOAT_IMG = None
+TILE_FILES = ('floor.png', 'plataformfloating.png')
 
-def _load_image(name: str):
-    path = os.path.join(settings.IMG_DIR, 'Mossy Tileset', name)
-    if os.path.exists(path):
+def _load_tiles(root):
+    paths = [os.path.join(root, name) for name in TILE_FILES]
+    pending = [decoder.load(p) if os.path.exists(p) else None for p in paths]
+    tiles = []
+    for fut in pending:
         try:
-            img = pygame.image.load(path)
-            if pygame.display.get_init() and pygame.display.get_surface():
-                img = img.convert_alpha()
-            return img
+            tiles.append(to_display(fut.result()) if fut else None)
         except Exception:
-            return None
-    return None
+            tiles.append(None)
+    return tiles
+
+def tiles_clip():
+    root = os.path.join(settings.IMG_DIR, 'Mossy Tileset')
+    return ('Mossy Tileset', root, TILE_FILES), lambda: _load_tiles(root)
 
 def get_floor():
-    global _FLOOR_IMG
-    if _FLOOR_IMG is None:
-        _FLOOR_IMG = _load_image('floor.png')
-    return _FLOOR_IMG
+    return registry.get(*tiles_clip())[0]
 
 def get_floating():
-    global _FLOAT_IMG
-    if _FLOAT_IMG is None:
-        _FLOAT_IMG = _load_image('plataformfloating.png')
-    return _FLOAT_IMG
+    return registry.get(*tiles_clip())[1]
 
 def adapt_image_to_block(src: pygame.Surface | None, width: int, height: int, tile: bool = True):
     surf = pygame.Surface((width, height), pygame.SRCALPHA)
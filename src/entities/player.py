@@ -2,17 +2,38 @@ import os
 import pygame
 try:
     from .. import settings
+    from ..core.assets import registry, to_display
+    from ..core.decode import decoder
+    from ..core import trace
+    from ..core.spatial import near
+    from ..core.controls import KeyboardControls
 except ImportError:
     import sys
     sys.path.append(os.path.dirname(os.path.dirname(__file__)))
     import settings  # type: ignore
+    from core.assets import registry, to_display  # type: ignore
+    from core.decode import decoder  # type: ignore
+    from core import trace  # type: ignore
+    from core.spatial import near  # type: ignore
+    from core.controls import KeyboardControls  # type: ignore
 
 
 class Player(pygame.sprite.Sprite):
 
-    def __init__(self, pos):
+    CROP_MIN_ALPHA = 1
+    EFFECTS = ('blink',)
+    SHEETS = (
+        ('idle',   ('Idling.png', 'Idle.png')),
+        ('run',    ('Running .png', 'Running.png')),
+        ('walk',   ('Running .png', 'Running.png')),
+        ('jump',   ('Jumping.png', 'Jump.png')),
+        ('attack', ('Basic Attack .png', 'Basic Attack.png', 'Attack.png')),
+    )
+
+    def __init__(self, pos, controls=None):
         super().__init__()
-        self.animations = {}
+        # de onde vem a entrada: teclado por padrao, ScriptedControls no modo sem janela
+        self.controls = controls if controls is not None else KeyboardControls()
         self.state = 'idle'
         self.frame_index = 0
         self.frame_timer = 0.0
@@ -21,13 +42,14 @@ class Player(pygame.sprite.Sprite):
         self.attack_timer = 0.0
         self.attack_hit_set = set() 
 
-        self._load_animations()
+        key, builder = self.clip()
+        self.animations = registry.get(key, builder)
+        self.variants = registry.variants(key, self.EFFECTS)
         first_frame = self.animations[self.state][0]
         hb_w = int(first_frame.get_width() * 0.6)
         hb_h = int(first_frame.get_height() * 0.9)
         self.rect = pygame.Rect(pos[0], pos[1], hb_w, hb_h)
-        self.image = pygame.Surface(first_frame.get_size(), pygame.SRCALPHA)
-        self._blit_frame(first_frame)
+        self.image = self.variants.get(self.state, 0)
         self.render_rect = self.image.get_rect()
         self.render_rect.midbottom = self.rect.midbottom
 
@@ -38,8 +60,16 @@ class Player(pygame.sprite.Sprite):
         self.invuln_timer = 0
         self.score = 0
 
-    def _load_animations(self):
+    @classmethod
+    def clip(cls):
         base = os.path.join(settings.IMG_DIR, 'TungTungTung Sahur', 'Sprites')
+        key = ('Player', base, cls.SHEETS, cls.CROP_MIN_ALPHA)
+        return key, lambda: cls._load_animations(base)
+
+    @classmethod
+    @trace.traced('Player._load_animations')
+    def _load_animations(cls, base):
+        animations = {}
 
         def slice_sheet(path: str):
             if not os.path.exists(path):
@@ -47,7 +77,7 @@ class Player(pygame.sprite.Sprite):
                 surf.fill((255, 0, 255))
                 pygame.draw.rect(surf, (0, 0, 0), surf.get_rect(), 2)
                 return [surf]
-            sheet = pygame.image.load(path).convert_alpha()
+            sheet = to_display(pending[path].result())
             h = sheet.get_height()
             w = sheet.get_width()
             if h <= 0 or w <= 0:
@@ -67,7 +97,7 @@ class Player(pygame.sprite.Sprite):
             max_h = 0
             cropped = []
             for f in frames:
-                r = f.get_bounding_rect(min_alpha=1)
+                r = f.get_bounding_rect(min_alpha=cls.CROP_MIN_ALPHA)
                 if r.width == 0 or r.height == 0:
                     r = pygame.Rect(0, 0, 1, 1)
                 sub = f.subsurface(r).copy()
@@ -83,15 +113,17 @@ class Player(pygame.sprite.Sprite):
                 uniform.append(canvas)
             return uniform
 
-        sheet_map_candidates = {
-            'idle':   ['Idling.png', 'Idle.png'],
-            'run':    ['Running .png', 'Running.png'],
-            'walk':   ['Running .png', 'Running.png'],
-            'jump':   ['Jumping.png', 'Jump.png'],
-            'attack': ['Basic Attack .png', 'Basic Attack.png', 'Attack.png'],
-        }
+        # todos os sheets existentes decodificam juntos no pool antes do fatiamento
+        pending = {}
+        for _anim_key, name_list in cls.SHEETS:
+            for filename in name_list:
+                path = os.path.join(base, filename)
+                if os.path.exists(path):
+                    if path not in pending:
+                        pending[path] = decoder.load(path)
+                    break
 
-        for anim_key, name_list in sheet_map_candidates.items():
+        for anim_key, name_list in cls.SHEETS:
             frames = []
             picked_name = None
             for filename in name_list:
@@ -104,19 +136,20 @@ class Player(pygame.sprite.Sprite):
                 frames = [settings.load_image('player_placeholder.png', (48, 48))]
             else:
                 frames = crop_frames_preserve_baseline(frames)
-            self.animations[anim_key] = frames
+            animations[anim_key] = frames
             if settings.DEBUG:
                 print(f"[Player] Anim '{anim_key}' carregada ({len(frames)} frames) - arquivo: {picked_name}")
 
-        if 'run' not in self.animations and 'walk' in self.animations:
-            self.animations['run'] = self.animations['walk']
-        if 'idle' not in self.animations:
-            for k, v in self.animations.items():
+        if 'run' not in animations and 'walk' in animations:
+            animations['run'] = animations['walk']
+        if 'idle' not in animations:
+            for k, v in animations.items():
                 if v:
-                    self.animations['idle'] = [v[0]]
+                    animations['idle'] = [v[0]]
                     break
         if settings.DEBUG:
-            print('[Player] Resumo animações:', {k: len(v) for k, v in self.animations.items()})
+            print('[Player] Resumo animações:', {k: len(v) for k, v in animations.items()})
+        return animations
 
     def _set_state(self):
         if self.attack_timer > 0:
@@ -138,31 +171,24 @@ class Player(pygame.sprite.Sprite):
         if self.frame_timer >= self.anim_speed:
             self.frame_timer = 0.0
             self.frame_index = (self.frame_index + 1) % len(frames)
-        frame = frames[self.frame_index]
-        if self.facing == -1:
-            frame = pygame.transform.flip(frame, True, False)
-        self.image = pygame.Surface(frame.get_size(), pygame.SRCALPHA)
-        self._blit_frame(frame)
+        effect = 'blink' if self.invuln_timer % 10 < 5 and self.invuln_timer > 0 else None
+        self.image = self.variants.get(self.state, self.frame_index, self.facing, effect)
         self.render_rect = self.image.get_rect()
         self.render_rect.midbottom = self.rect.midbottom
-        if self.invuln_timer % 10 < 5 and self.invuln_timer > 0:
-            self.image.set_alpha(80)
-        else:
-            self.image.set_alpha(255)
 
     def handle_input(self):
-        keys = pygame.key.get_pressed()
+        pressed = self.controls.read()
         self.vel.x = 0
-        if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+        if pressed.left:
             self.vel.x = -settings.PLAYER_SPEED
             self.facing = -1
-        if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+        if pressed.right:
             self.vel.x = settings.PLAYER_SPEED
             self.facing = 1
-        if (keys[pygame.K_SPACE] or keys[pygame.K_w] or keys[pygame.K_UP]) and self.on_ground:
+        if pressed.jump and self.on_ground:
             self.vel.y = settings.JUMP_FORCE
             self.on_ground = False
-        if keys[pygame.K_j] and self.attack_timer <= 0:
+        if pressed.attack and self.attack_timer <= 0:
             self.attack_timer = 0.4
             self.frame_index = 0
             self.attack_hit_set.clear()
@@ -217,7 +243,7 @@ class Player(pygame.sprite.Sprite):
             return pygame.Rect(self.rect.left - reach, top, reach, height)
 
     def collide(self, platforms, dir):
-        for p in platforms:
+        for p in near(platforms, self.rect):
             if self.rect.colliderect(p.rect):
                 if dir == 'x':
                     if self.vel.x > 0:
@@ -232,11 +258,3 @@ class Player(pygame.sprite.Sprite):
                     elif self.vel.y < 0:
                         self.rect.top = p.rect.bottom
                         self.vel.y = 0
-
-    def _blit_frame(self, frame):
-        if not self.image:
-            self.image = pygame.Surface(frame.get_size(), pygame.SRCALPHA)
-        self.image.fill((0, 0, 0, 0))
-        dest = frame.get_rect()
-        dest.midbottom = self.image.get_rect().midbottom
-        self.image.blit(frame, dest)
@@ -1,31 +1,66 @@
 import pygame, os, sys
 try:
     from ..entities.platform import Platform
-    from ..entities.platform import FloatingPlatform
+    from ..entities.platform import FloatingPlatform, tiles_clip
     from ..entities.enemy import Enemy
     from ..entities.nightborne import NightBorneEnemy
-    from ..entities.collectible import Collectible
+    from ..entities.nightborne_crowd import NightBorneCrowd
+    from ..entities.collectible import Collectible, coin_clip
     from ..entities.plant import Plant
+    from ..core import trace
+    from ..core.spatial import UniformGrid
+    from ..core.activity import ActivityRegions
+    from .. import settings
 except ImportError:
     base = os.path.join(os.path.dirname(__file__), '..')
     if base not in sys.path:
         sys.path.append(base)
     from entities.platform import Platform  # type: ignore
-    from entities.platform import FloatingPlatform  # type: ignore
+    from entities.platform import FloatingPlatform, tiles_clip  # type: ignore
     from entities.enemy import Enemy  # type: ignore
     from entities.nightborne import NightBorneEnemy  # type: ignore
-    from entities.collectible import Collectible  # type: ignore
+    from entities.nightborne_crowd import NightBorneCrowd  # type: ignore
+    from entities.collectible import Collectible, coin_clip  # type: ignore
     from entities.plant import Plant  # type: ignore
+    from core import trace  # type: ignore
+    from core.spatial import UniformGrid  # type: ignore
+    from core.activity import ActivityRegions  # type: ignore
+    import settings  # type: ignore
 
 class Level1:
-    def __init__(self):
+    PLANT_KINDS = ('BlueFlower1', 'BlueFlower2')
+    GRID_CELL = 256
+    SOLID_CELL = 128
+    # abaixo disso a lista inteira e mais barata que a consulta (src/tools/bench_collision)
+    BROADPHASE_MIN = 128
+    # regioes de atividade em volta da camera (px): fora de ACTIVE_MARGIN os inimigos
+    # congelam; animacoes seguem a cada THROTTLE_EVERY ticks ate THROTTLE_MARGIN
+    ACTIVE_MARGIN = 256
+    THROTTLE_MARGIN = 1024
+    THROTTLE_EVERY = 4
+
+    def __init__(self, crowd=None):
+        # crowd: NightBorne num NightBorneCrowd (None segue settings.NIGHTBORNE_CROWD; sem numpy fica desligado)
+        self.use_crowd = (settings.NIGHTBORNE_CROWD if crowd is None else crowd) and NightBorneCrowd.available
+        self.crowd = None
         self.platforms = []
+        self.enemy_spawns = []
         self.enemies = []
         self.collectibles = []
         self.plants = []
         self.decorations = []
         self._build()
+        self._spawn_enemies()
+        self._index_solids()
+        self._index()
+        self.activity = ActivityRegions(self.grid, self.ACTIVE_MARGIN, self.THROTTLE_MARGIN, self.THROTTLE_EVERY)
+
+    @classmethod
+    def clips(cls):
+        # clips do registry que _build usa; o LoadingScene decodifica todos antes
+        return [tiles_clip(), NightBorneEnemy.clip(), coin_clip()] + [Plant.clip(kind) for kind in cls.PLANT_KINDS]
 
+    @trace.traced('Level1._build')
     def _build(self):
         self.platforms.append(Platform((0,500,1400,64), variant=0))
         self.platforms.append(FloatingPlatform((220,420,200,50)))
@@ -38,10 +73,10 @@ class Level1:
         self.gate_open = False
         GROUND_Y = 500
         ENEMY_H = 120
-        self.enemies.append(NightBorneEnemy((150, GROUND_Y-ENEMY_H), (-40, 60)))
-        self.enemies.append(NightBorneEnemy((1100, GROUND_Y-ENEMY_H), (-50, 60)))
-        self.enemies.append(NightBorneEnemy((420, 320-ENEMY_H), (-45, 65)))
-        self.enemies.append(NightBorneEnemy((860, 170-ENEMY_H), (-55, 70)))
+        self.enemy_spawns.append(((150, GROUND_Y-ENEMY_H), (-40, 60)))
+        self.enemy_spawns.append(((1100, GROUND_Y-ENEMY_H), (-50, 60)))
+        self.enemy_spawns.append(((420, 320-ENEMY_H), (-45, 65)))
+        self.enemy_spawns.append(((860, 170-ENEMY_H), (-55, 70)))
 
         self.collectibles.append(Collectible((260, 420-32))) 
         self.collectibles.append(Collectible((690, 270-32)))
@@ -56,20 +91,73 @@ class Level1:
         self.plants.append(Plant('BlueFlower2', (880, 170-40)))
         self.plants.append(Plant('BlueFlower2', (1010, 80-40)))
 
-    def update(self):
-        alive = 0
-        for e in self.enemies:
-            e.update(self.platforms)
-            if e.alive:
-                alive += 1
-        if alive == 0 and not self.gate_open:
-            self.gate_open = True
-        for c in self.collectibles:
-            c.update()
+    def _spawn_enemies(self):
+        # spawns (pos, patrulha) do _build; no modo multidao `enemies` sao os CrowdMember
+        if self.use_crowd and self.enemy_spawns:
+            self.crowd = NightBorneCrowd(self.enemy_spawns)
+            self.enemies.extend(self.crowd)
+        else:
+            self.enemies.extend(NightBorneEnemy(pos, patrol) for pos, patrol in self.enemy_spawns)
+
+    def _index_solids(self):
+        # broadphase estatica das plataformas: a fisica so testa as que estao perto
+        if len(self.platforms) < self.BROADPHASE_MIN:
+            self.solids = self.platforms
+            return
+        self.solids = UniformGrid(self.SOLID_CELL)
+        for p in self.platforms:
+            self.solids.insert(p, p.rect)
+
+    def _index(self):
+        # grade com a area desenhada de cada objeto, usada pelo GameScene para cortar o que esta fora da camera
+        self.grid = UniformGrid(self.GRID_CELL)
+        for p in self.platforms:
+            self.grid.insert(p, p.rect, 'platforms')
+        for d in self.decorations:
+            # render_rect oscila alguns px em y (wave_amp)
+            self.grid.insert(d, d.rect.inflate(0, 2 * d.wave_amp + 2), 'decorations')
         for p in self.plants:
-            p.update(1/60)
-        for d in getattr(self, 'decorations', []):
-            d.update(1/60)
+            w = max((f.get_width() for f in p.frames), default=p.rect.width)
+            h = max((f.get_height() for f in p.frames), default=p.rect.height)
+            self.grid.insert(p, pygame.Rect(p.rect.topleft, (max(w, p.rect.width), max(h, p.rect.height))), 'plants')
+        if self.crowd is None:
+            # a multidao corta a camera nos proprios arrays (NightBorneCrowd.visible)
+            for e in self.enemies:
+                self.grid.insert(e, e.render_rect, 'enemies')
+        for c in self.collectibles:
+            # pulso ate +10% e bob de 4 px
+            self.grid.insert(c, c.rect.inflate(c.rect.width // 5 + 2, c.rect.height // 5 + 10), 'collectibles')
+
+    def update(self, view=None):
+        # view: camera em coordenadas de mundo; None atualiza tudo todo tick
+        if self.crowd is not None:
+            # mesma regra dos objetos: so anda quem esta na regiao ativa, sem reduzida
+            near = self.activity.active_rect(view)
+            self.crowd.step(self.solids, None if near is None else self.crowd.visible(near))
+        self.activity.step(view, (
+            ('enemies', self._step_enemy, False),
+            ('collectibles', self._step_collectible, True),
+            ('plants', self._step_plant, True),
+            ('decorations', self._step_decoration, False),
+        ))
+        alive = self.crowd.alive.any() if self.crowd is not None else any(e.alive for e in self.enemies)
+        if not self.gate_open and not alive:
+            self.gate_open = True
+
+    def _step_enemy(self, e, ticks):
+        # fisica nao pula ticks: quem dormiu so retoma de onde parou
+        e.update(self.solids)
+        self.grid.update(e, e.render_rect)
+
+    def _step_collectible(self, c, ticks):
+        c.update(ticks)
+
+    def _step_plant(self, p, ticks):
+        p.update(ticks * settings.TICK)
+
+    def _step_decoration(self, d, ticks):
+        # onda vem do relogio, nao de estado acumulado
+        d.update(ticks * settings.TICK)
 
     def reset(self):
-        self.__init__()
+        self.__init__(self.use_crowd)
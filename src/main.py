@@ -1,30 +1,56 @@
-import pygame, sys, math, random, os
+import pygame, sys, math, os
 try:
-    from . import settings
+    from .core import trace
+    with trace.span('import settings'):
+        from . import settings
     from .core.scene_manager import Scene, SceneManager
+    from .core import sprite_cache, atlas_cache
+    from .core.assets import BackgroundLoader, registry, to_display
+    from .core.parallax import ParallaxBackground
+    from .core.chunks import ChunkedLayer
+    from .core.render import RenderQueue
+    from .core.collision import CollisionWorld
+    from .core import rng
+    from .core.recording import InputRecorder, state_hash
+    from .core.controls import KeyboardControls
+    from .core.backend import create_backend
     from .entities.player import Player
     from .levels.level1 import Level1
     from .ui.hud import HUD
 except ImportError:
     sys.path.append(os.path.dirname(__file__))
-    import settings  # type: ignore
+    from core import trace  # type: ignore
+    with trace.span('import settings'):
+        import settings  # type: ignore
     from core.scene_manager import Scene, SceneManager  # type: ignore
+    from core import sprite_cache, atlas_cache  # type: ignore
+    from core.assets import BackgroundLoader, registry, to_display  # type: ignore
+    from core.parallax import ParallaxBackground  # type: ignore
+    from core.chunks import ChunkedLayer  # type: ignore
+    from core.render import RenderQueue  # type: ignore
+    from core.collision import CollisionWorld  # type: ignore
+    from core import rng  # type: ignore
+    from core.recording import InputRecorder, state_hash  # type: ignore
+    from core.controls import KeyboardControls  # type: ignore
+    from core.backend import create_backend  # type: ignore
     from entities.player import Player  # type: ignore
     from levels.level1 import Level1  # type: ignore
     from ui.hud import HUD  # type: ignore
 
 class MenuScene(Scene):
+    @trace.traced('MenuScene.__init__')
     def __init__(self, manager):
         super().__init__(manager)
         kaph_path = os.path.join(settings.FONT_DIR, 'Kaph_Font_1_20', 'TrueType (.ttf)', 'Kaph-Regular.ttf')
-        if os.path.exists(kaph_path):
-            self.font_title = pygame.font.Font(kaph_path, 72)
-            self.font_btn = pygame.font.Font(kaph_path, 32)
-            self.font_small = pygame.font.Font(kaph_path, 20)
-        else:
-            self.font_title = settings.load_font('pixel.ttf', 64)
-            self.font_btn = settings.load_font('pixel.ttf', 28)
-            self.font_small = settings.load_font('pixel.ttf', 20)
+        with trace.span('MenuScene fonts'):
+            if os.path.exists(kaph_path):
+                self.font_title = pygame.font.Font(kaph_path, 72)
+                self.font_btn = pygame.font.Font(kaph_path, 32)
+                self.font_small = pygame.font.Font(kaph_path, 20)
+            else:
+                self.font_title = settings.load_font('pixel.ttf', 64)
+                self.font_btn = settings.load_font('pixel.ttf', 28)
+                self.font_small = settings.load_font('pixel.ttf', 20)
         self.timer = 0
         self.buttons = [
             {'text': 'JOGAR', 'action': 'play'},
@@ -43,26 +69,29 @@ class MenuScene(Scene):
             'ESC : voltar / menu'
         ]
         bg_candidates = [
-            os.path.join(settings.IMG_DIR, 'menu_background.png'),
-            os.path.join(settings.IMG_DIR, 'game_background_4', 'game_background_4.png'),
+            'menu_background.png',
+            os.path.join('game_background_4', 'game_background_4.png'),
         ]
         self.bg_image = None
-        for p in bg_candidates:
-            if os.path.exists(p):
-                try:
-                    img = pygame.image.load(p).convert()
-                    if img.get_size() != (settings.WIDTH, settings.HEIGHT):
-                        img = pygame.transform.smoothscale(img, (settings.WIDTH, settings.HEIGHT))
-                    self.bg_image = img
-                    break
-                except Exception:
-                    pass
+        with trace.span('MenuScene background'):
+            for name in bg_candidates:
+                if os.path.exists(os.path.join(settings.IMG_DIR, name)):
+                    try:
+                        # fixada no cache enquanto o menu estiver ativo (solta em on_exit)
+                        self.bg_image = settings.load_image(name, (settings.WIDTH, settings.HEIGHT), opaque=True, pin=self)
+                        break
+                    except Exception:
+                        pass
         if self.bg_image is None:
             grad = pygame.Surface((settings.WIDTH, settings.HEIGHT))
             for y in range(settings.HEIGHT):
                 c = int(25 + 90 * (y/settings.HEIGHT))
                 pygame.draw.line(grad, (c//3, c//4, c), (0,y), (settings.WIDTH, y))
             self.bg_image = grad
+        self._buttons = None
+        self._layers = {}
+        self._drawn_mode = None
+        self._drawn_colours = []
 
     def handle_event(self, event):
         if self.mode == 'menu':
@@ -84,8 +113,12 @@ class MenuScene(Scene):
             if event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, pygame.K_RETURN):
                 self.mode = 'menu'
 
+    def on_exit(self):
+        settings.surface_cache.release(self)
+
     def _activate(self, action):
         if action == 'play':
+            trace.instant('JOGAR')
             self.manager.set(LoadingScene(self.manager))
         elif action == 'controls':
             self.mode = 'controls'
@@ -93,93 +126,170 @@ class MenuScene(Scene):
             pygame.event.post(pygame.event.Event(pygame.QUIT))
 
     def _button_layout(self):
-        start_y = settings.HEIGHT//2 - 10
-        out = []
-        for i, btn in enumerate(self.buttons):
-            surf = self.font_btn.render(btn['text'], True, (255,255,255))
-            rect = surf.get_rect(center=(settings.WIDTH//2, start_y + i*60))
-            out.append({'surf': surf, 'rect': rect, 'action': btn['action'], 'text': btn['text']})
-        return out
+        # textos dos botoes sao renderizados uma vez so
+        if self._buttons is None:
+            start_y = settings.HEIGHT//2 - 10
+            self._buttons = []
+            for i, btn in enumerate(self.buttons):
+                surf = self.font_btn.render(btn['text'], True, (255,255,255))
+                rect = surf.get_rect(center=(settings.WIDTH//2, start_y + i*60))
+                self._buttons.append({'surf': surf, 'rect': rect, 'action': btn['action'], 'text': btn['text']})
+        return self._buttons
 
-    def update(self, dt):
-        self.timer += dt
+    def _button_colour(self, idx):
+        return (80,20,120) if idx == self.selected and int(self.timer*6)%2==0 else (40,15,60)
 
-    def draw(self, screen):
+    def _layer(self, mode):
+        # tudo que nao pisca: fundo, escurecimento, titulo e textos do modo
+        layer = self._layers.get(mode)
+        if layer is not None:
+            return layer
+        layer = to_display(pygame.Surface((settings.WIDTH, settings.HEIGHT)), alpha=False)
         if self.bg_image:
-            screen.blit(self.bg_image, (0,0))
+            layer.blit(self.bg_image, (0,0))
         else:
-            screen.fill((10,10,25))
+            layer.fill((10,10,25))
         dark = pygame.Surface((settings.WIDTH, settings.HEIGHT), pygame.SRCALPHA)
         dark.fill((5,0,15,140))
-        screen.blit(dark, (0,0))
+        layer.blit(dark, (0,0))
         title = self.font_title.render('BRAINROT', True, (255,0,200))
         trect = title.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 - 140))
-        screen.blit(title, trect)
-        if self.mode == 'menu':
-            for idx, b in enumerate(self._button_layout()):
-                bg_col = (80,20,120) if idx == self.selected and int(self.timer*6)%2==0 else (40,15,60)
-                pygame.draw.rect(screen, bg_col, b['rect'].inflate(40,20), border_radius=12)
-                pygame.draw.rect(screen, (255,0,200), b['rect'].inflate(40,20), 2, border_radius=12)
-                screen.blit(b['surf'], b['rect'])
+        layer.blit(title, trect)
+        if mode == 'menu':
             hint = self.font_small.render('ENTER / CLIQUE para selecionar | ESC para sair', True, (200,200,220))
-            screen.blit(hint, hint.get_rect(center=(settings.WIDTH//2, settings.HEIGHT - 40)))
+            layer.blit(hint, hint.get_rect(center=(settings.WIDTH//2, settings.HEIGHT - 40)))
         else:
             panel_rect = pygame.Rect(0,0, int(settings.WIDTH*0.6), int(settings.HEIGHT*0.6))
             panel_rect.center = (settings.WIDTH//2, settings.HEIGHT//2 + 10)
-            pygame.draw.rect(screen, (30,15,50), panel_rect, border_radius=16)
-            pygame.draw.rect(screen, (255,0,200), panel_rect, 2, border_radius=16)
+            pygame.draw.rect(layer, (30,15,50), panel_rect, border_radius=16)
+            pygame.draw.rect(layer, (255,0,200), panel_rect, 2, border_radius=16)
             y = panel_rect.top + 30
             for line in self.controls_text:
                 surf = self.font_small.render(line, True, (230,230,240))
-                screen.blit(surf, (panel_rect.left + 30, y))
+                layer.blit(surf, (panel_rect.left + 30, y))
                 y += 34
             back = self.font_small.render('ESC / ENTER para voltar', True, (180,180,200))
-            screen.blit(back, back.get_rect(center=(panel_rect.centerx, panel_rect.bottom - 30)))
+            layer.blit(back, back.get_rect(center=(panel_rect.centerx, panel_rect.bottom - 30)))
+        self._layers[mode] = layer
+        return layer
+
+    def update(self, dt):
+        self.timer += dt
+
+    def draw(self, screen):
+        # camada estatica inteira so quando o modo muda; depois so os botoes que trocaram de cor
+        layer = self._layer(self.mode)
+        colours = [self._button_colour(i) for i in range(len(self.buttons))] if self.mode == 'menu' else []
+        full = self.needs_full_redraw or self.mode != self._drawn_mode
+        if full:
+            screen.blit(layer, (0,0))
+            changed = range(len(colours))
+        else:
+            changed = [i for i, c in enumerate(colours) if c != self._drawn_colours[i]]
+        rects = []
+        for idx in changed:
+            b = self._button_layout()[idx]
+            box = b['rect'].inflate(40,20)
+            if not full:
+                screen.blit(layer, box, box)
+            screen.rect(colours[idx], box, border_radius=12)
+            screen.rect((255,0,200), box, 2, border_radius=12)
+            screen.blit(b['surf'], b['rect'])
+            rects.append(box)
+        self._drawn_mode = self.mode
+        self._drawn_colours = colours
+        self.needs_full_redraw = False
+        return None if full else rects
+
 
 class GameScene(Scene):
-    def __init__(self, manager):
+    BG_LAYERS = (
+        ('sky.png',        0.05, 0.02, True),
+        ('rocks.png',      0.15, 0.04, True),
+        ('clouds_2.png',   0.25, 0.06, True),
+        ('clouds_1.png',   0.35, 0.07, True),
+        ('ground.png',     0.55, 0.10, True),
+    )
+    DRAW_LAYERS = ('decorations', 'plants', 'enemies', 'collectibles')
+    # chaves do RenderQueue (ordem de desenho)
+    LAYER_DECORATIONS = 10
+    LAYER_PLANTS = 20
+    LAYER_ENEMIES = 30
+    LAYER_COLLECTIBLES = 40
+    LAYER_PLAYER = 50
+    STATIC_CHUNK = 512
+
+    @trace.traced('GameScene.__init__')
+    def __init__(self, manager, controls=None, seed=None):
         super().__init__(manager)
+        # cada partida e uma sessao: a semente vem antes de qualquer sorteio do nivel
+        self.seed = rng.seed(settings.SEED if seed is None else seed)
+        self.recorder = None
+        if controls is None and settings.RECORD_PATH:
+            controls = self.recorder = InputRecorder(KeyboardControls(), self.seed, settings.TICK_RATE)
         self.level = Level1()
-        self.player = Player((50, 300))
+        self.player = Player((50, 300), controls)
         self.hud = HUD(self.player)
+        self._build_static()
+        self._build_collision()
+        self.render_queue = RenderQueue()
         self.camera_offset = pygame.Vector2(0,0)
+        # estado do tick anterior, para interpolar o desenho entre dois ticks
+        self._prev_camera = pygame.Vector2(self.camera_offset)
+        self._prev_pos = {}
+        self._prev_crowd = None
         self.shake_timer = 0
+        self.cull_stats = {'drawn': 0, 'culled': 0, 'chunks': 0}
         self.elapsed = 0.0
         self.show_start_msg = 4.0 
         self.start_msg_active = True
         self.start_msg_elapsed = 0.0
         kaph_path = os.path.join(settings.FONT_DIR, 'Kaph_Font_1_20', 'TrueType (.ttf)', 'Kaph-Regular.ttf')
-        if os.path.exists(kaph_path):
-            self.start_msg_font = pygame.font.Font(kaph_path, 48)
-        else:
-            self.start_msg_font = settings.load_font('pixel.ttf', 48)
+        with trace.span('GameScene fonts'):
+            if os.path.exists(kaph_path):
+                self.start_msg_font = pygame.font.Font(kaph_path, 48)
+            else:
+                self.start_msg_font = settings.load_font('pixel.ttf', 48)
         self.start_msg_lines = [
             'MATE TODOS OS INIMIGOS',
             'PARA ABRIR O PORTAL'
         ]
+        self._start_block = None
         settings.audio.play_music('main_music.mp3', volume=0.4)
-        self.bg_layers = []
+        layers = registry.get(*self._background_clip())
+        self.bg_layers = [(img, dx, dy, tile) for img, (fname, dx, dy, tile) in zip(layers, self.BG_LAYERS) if img is not None]
+        with trace.span('GameScene parallax'):
+            self.background = ParallaxBackground(self.bg_layers, (settings.WIDTH, settings.HEIGHT))
+
+    @classmethod
+    def clips(cls):
+        return [Player.clip(), cls._background_clip()] + Level1.clips()
+
+    @classmethod
+    def _background_clip(cls):
         bg_root = os.path.join(settings.IMG_DIR, 'game_background_4', 'layers')
-        order = [
-            ('sky.png',        0.05, 0.02, True),
-            ('rocks.png',      0.15, 0.04, True),
-            ('clouds_2.png',   0.25, 0.06, True),
-            ('clouds_1.png',   0.35, 0.07, True),
-            ('ground.png',     0.55, 0.10, True),
-        ]
-        if os.path.isdir(bg_root):
-            for fname, dx, dy, tile in order:
-                path = os.path.join(bg_root, fname)
-                if not os.path.exists(path):
-                    continue
-                img = pygame.image.load(path).convert_alpha()
-                scale = settings.HEIGHT / img.get_height()
-                if 'ground' in fname:
-                    scale = min(scale, 0.9 * (settings.HEIGHT / img.get_height()))
-                new_w = int(img.get_width() * scale)
-                new_h = int(img.get_height() * scale)
-                img = pygame.transform.smoothscale(img, (new_w, new_h))
-                self.bg_layers.append((img, dx, dy, tile))
+        key = ('game_background_4', bg_root, tuple(name for name, *_ in cls.BG_LAYERS), settings.HEIGHT)
+        return key, lambda: cls._load_background(bg_root)
+
+    @classmethod
+    @trace.traced('GameScene._load_background')
+    def _load_background(cls, bg_root):
+        # uma entrada por camada de BG_LAYERS (None quando o arquivo falta)
+        layers = []
+        for fname, dx, dy, tile in cls.BG_LAYERS:
+            path = os.path.join(bg_root, fname)
+            if not os.path.exists(path):
+                layers.append(None)
+                continue
+            img = to_display(pygame.image.load(path))
+            scale = settings.HEIGHT / img.get_height()
+            if 'ground' in fname:
+                scale = min(scale, 0.9 * (settings.HEIGHT / img.get_height()))
+            new_w = int(img.get_width() * scale)
+            new_h = int(img.get_height() * scale)
+            with trace.span('smoothscale ' + fname):
+                layers.append(pygame.transform.smoothscale(img, (new_w, new_h)))
+        return layers
 
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN and event.key == pygame.K_r and self.player.health <= 0:
@@ -198,37 +308,24 @@ class GameScene(Scene):
                 self.start_msg_elapsed = 0.0
                 self.start_msg_active = True
 
+    def on_exit(self):
+        # BRAINROT_RECORD: a partida que termina (menu, reinicio ou fechar a janela) vai para o arquivo
+        if self.recorder is not None and self.recorder.recording.ticks:
+            self.recorder.recording.state = state_hash(self)
+            self.recorder.recording.save(settings.RECORD_PATH)
+
     def update(self, dt):
+        self._snapshot()
         self.elapsed += dt
         if self.start_msg_active:
             self.start_msg_elapsed += min(dt, 0.2)  # cap 200ms por frame
             if self.start_msg_elapsed >= self.show_start_msg:
                 self.start_msg_active = False
         if self.player.health > 0:
-            self.player.update(self.level.platforms, dt)
-            self.level.update()
-            if hasattr(self.level, 'plants'):
-                for p in self.level.plants:
-                    p.update(dt)
-            for e in self.level.enemies:
-                e.hit_player(self.player)
-            atk = self.player.get_attack_rect()
-            if atk:
-                for e in self.level.enemies:
-                    if not e.alive: 
-                        continue
-                    if atk.colliderect(e.rect) and e not in self.player.attack_hit_set:
-                        e.take_damage(1)
-                        kb = 6 if self.player.facing == 1 else -6
-                        e.rect.x += kb
-                        self.player.attack_hit_set.add(e)
-                        self.shake_timer = 8
-                        settings.audio.play_sfx('punch-sound-effect.mp3', 0.8)
-            for c in self.level.collectibles:
-                before = self.player.score
-                c.try_collect(self.player)
-                if self.player.score > before:
-                    settings.audio.play_sfx('mario_coin_sound.mp3', 0.6)
+            self.player.update(self.level.solids, dt)
+            self.level.update(self._view(self.camera_offset))
+            self.collision_stats = self.collision.step()
+            trace.counter('colisao', self.collision_stats)
             if self.player.invuln_timer == 59: 
                 self.shake_timer = 20
                 settings.audio.play_sfx('tung-tung.mp3', 0.8)
@@ -241,83 +338,166 @@ class GameScene(Scene):
         self.camera_offset.y = min(0, self.camera_offset.y)
         self.camera_offset.y = max(-200, self.camera_offset.y)
 
+    def _build_collision(self):
+        # contato com inimigos, golpe e coleta: so os pares sobrepostos chegam aos callbacks
+        world = self.collision = CollisionWorld()
+        player = self.player
+        world.add(player, 'hurtbox', lambda: player.rect)
+        world.add(player, 'attack', player.get_attack_rect)
+        for e in self.level.enemies:
+            if e.alive:
+                world.add(e, 'enemy', e.collision_bounds)
+        for c in self.level.collectibles:
+            if not c.collected:
+                world.add(c, 'pickup', c.rect)
+        world.on('hurtbox', 'enemy', self._on_enemy_contact)
+        world.on('attack', 'enemy', self._on_attack_hit)
+        world.on('hurtbox', 'pickup', self._on_pickup)
+        self.collision_stats = world.stats
+
+    def _on_enemy_contact(self, player, enemy):
+        enemy.hit_player(player)
+
+    def _on_attack_hit(self, player, enemy):
+        if not enemy.alive or enemy in player.attack_hit_set or not player.get_attack_rect().colliderect(enemy.rect):
+            return
+        enemy.take_damage(1)
+        kb = 6 if player.facing == 1 else -6
+        enemy.rect.x += kb
+        player.attack_hit_set.add(enemy)
+        self.shake_timer = 8
+        settings.audio.play_sfx('punch-sound-effect.mp3', 0.8)
+        if not enemy.alive:
+            self.collision.remove(enemy)
+
+    def _on_pickup(self, player, item):
+        before = player.score
+        item.try_collect(player)
+        if player.score > before:
+            settings.audio.play_sfx('mario_coin_sound.mp3', 0.6)
+        if item.collected:
+            self.collision.remove(item)
+
+    def _snapshot(self):
+        self._prev_camera.update(self.camera_offset)
+        prev = self._prev_pos
+        prev.clear()
+        prev[self.player] = self.player.rect.topleft
+        crowd = self.level.crowd
+        if crowd is not None:
+            self._prev_crowd = crowd.positions()
+            return
+        for e in self.level.enemies:
+            prev[e] = e.rect.topleft
+
+    def _lerp_rect(self, obj, rect, alpha):
+        # rect desenhado entre o tick anterior (alpha 0) e o atual (alpha 1)
+        prev = self._prev_pos.get(obj)
+        crowd = self.level.crowd
+        member = crowd is not None and getattr(obj, 'crowd', None) is crowd
+        if prev is None and member and self._prev_crowd is not None:
+            xs, ys = self._prev_crowd
+            prev = (int(xs[obj.index]), int(ys[obj.index]))
+        if prev is None or alpha >= 1.0:
+            return rect
+        # membro da multidao: le dos arrays sem pegar o Rect vivo (que volta para os arrays no _sync)
+        x, y = crowd.rect_of(obj.index).topleft if member else obj.rect.topleft
+        back = 1.0 - alpha
+        return rect.move(round((prev[0] - x) * back), round((prev[1] - y) * back))
+
+    def _view(self, offset):
+        # camera em coordenadas de mundo (1 px de folga pelo arredondamento do offset)
+        return pygame.Rect(int(-offset.x) - 1, int(-offset.y) - 1, settings.WIDTH + 2, settings.HEIGHT + 2)
+
+    def _visible(self, view):
+        # objetos da grade do nivel que cruzam a camera
+        grid = self.level.grid
+        visible = {}
+        drawn = total = 0
+        for layer in self.DRAW_LAYERS:
+            visible[layer] = grid.query(view, layer)
+            drawn += len(visible[layer])
+            total += grid.count(layer)
+        crowd = self.level.crowd
+        if crowd is not None:
+            visible['enemies'] = [crowd[int(i)] for i in crowd.visible(view)]
+            drawn += len(visible['enemies'])
+            total += len(crowd)
+        self.cull_stats = {'drawn': drawn, 'culled': total - drawn, 'chunks': self.static.drawn}
+        return visible
+
+    def _build_static(self):
+        # plataformas e portao nao se movem: vao para chunks pre-desenhados
+        self.static = ChunkedLayer(self.STATIC_CHUNK, settings.STATIC_CHUNK_MB)
+        for p in self.level.platforms:
+            self.static.add(p, p.rect)
+        self._gate_images = {}
+        self._gate_baked = self.level.gate_open
+        self.static.add('gate', self.level.gate_rect, lambda: self._gate_image(self.level.gate_open))
+
+    def _gate_image(self, opened):
+        img = self._gate_images.get(opened)
+        if img is not None:
+            return img
+        w, h = self.level.gate_rect.size
+        img = pygame.Surface((w, h), pygame.SRCALPHA)
+        if opened:
+            color = (180, 40, 255)
+            pygame.draw.rect(img, (*color,180), img.get_rect(), border_radius=8)
+            pygame.draw.rect(img, (255,255,255,200), img.get_rect(), 2, border_radius=8)
+        else:
+            pygame.draw.rect(img, (60,40,90), img.get_rect(), border_radius=4)
+            pygame.draw.rect(img, (20,10,30), img.get_rect(),2, border_radius=4)
+            bar_y = 0
+            while bar_y < h:
+                pygame.draw.line(img, (90,70,120), (0,bar_y), (w, bar_y),1)
+                bar_y += 10
+        self._gate_images[opened] = img
+        return img
+
     def draw(self, screen):
-        screen.fill((5, 5, 15))
         shake = pygame.Vector2(0,0)
         if self.shake_timer>0:
-            shake.x = random.randint(-4,4)
-            shake.y = random.randint(-4,4)
-        cam_x = -self.camera_offset.x
-        cam_y = -self.camera_offset.y
-        for img, dx, dy, tile in self.bg_layers:
-            off_x = int(-cam_x * dx)
-            off_y = int(-cam_y * dy)
-            dest_y = 0
-            if 'ground' in img.get_flags().__repr__():
-                dest_y = settings.HEIGHT - img.get_height()
-            if img.get_height() < settings.HEIGHT * 0.7:
-                dest_y = settings.HEIGHT - img.get_height()
-            if tile:
-                w = img.get_width()
-                start_x = off_x % w
-                for ix in (-1,0,1,2):
-                    draw_x = -start_x + ix * w
-                    if draw_x > settings.WIDTH or draw_x + w < -settings.WIDTH:
-                        continue
-                    screen.blit(img, (draw_x, dest_y + off_y))
-            else:
-                screen.blit(img, (off_x, dest_y + off_y))
-        for p in self.level.platforms:
-            r = p.rect.move(self.camera_offset + shake)
-            screen.blit(p.image, r)
-        if hasattr(self.level, 'gate_rect'):
-            gate_r = self.level.gate_rect.move(self.camera_offset + shake)
-            if self.level.gate_open:
-                glow = pygame.Surface((gate_r.width, gate_r.height), pygame.SRCALPHA)
-                color = (180, 40, 255)
-                pygame.draw.rect(glow, (*color,180), glow.get_rect(), border_radius=8)
-                pygame.draw.rect(glow, (255,255,255,200), glow.get_rect(), 2, border_radius=8)
-                screen.blit(glow, gate_r.topleft)
-            else:
-                door = pygame.Surface((gate_r.width, gate_r.height), pygame.SRCALPHA)
-                pygame.draw.rect(door, (60,40,90), door.get_rect(), border_radius=4)
-                pygame.draw.rect(door, (20,10,30), door.get_rect(),2, border_radius=4)
-                bar_y = 0
-                while bar_y < gate_r.height:
-                    pygame.draw.line(door, (90,70,120), (0,bar_y), (gate_r.width, bar_y),1)
-                    bar_y += 10
-                screen.blit(door, gate_r.topleft)
-        if hasattr(self.level, 'decorations'):
-            for d in self.level.decorations:
-                r = getattr(d, 'render_rect', d.rect).move(self.camera_offset + shake)
-                screen.blit(d.image, r)
-        if hasattr(self.level, 'plants'):
-            for p in self.level.plants:
-                r = p.rect.move(self.camera_offset + shake)
-                screen.blit(p.image, r)
-        for e in self.level.enemies:
-            draw_rect = getattr(e, 'render_rect', e.rect)
-            screen.blit(e.image, draw_rect.move(self.camera_offset + shake))
-        for c in self.level.collectibles:
-            r = c.rect.move(self.camera_offset + shake)
-            screen.blit(c.image, r)
-        if settings.DEBUG:
-            atk_rect_dbg = self.player.get_attack_rect()
-            if atk_rect_dbg:
-                pygame.draw.rect(screen, (255,255,0), atk_rect_dbg.move(self.camera_offset + shake), 1)
-            for e in self.level.enemies:
-                pygame.draw.rect(screen, (0,255,0), e.rect.move(self.camera_offset + shake), 1)
+            shake.x = rng.fx.randint(-4,4)
+            shake.y = rng.fx.randint(-4,4)
+        alpha = self.manager.alpha
+        camera = self.camera_offset if alpha >= 1.0 else self._prev_camera.lerp(self.camera_offset, alpha)
+        self.background.draw(screen, -camera.x, -camera.y)
+        offset = camera + shake
+        view = self._view(offset)
+        if self.level.gate_open != self._gate_baked:
+            self.static.invalidate(self.level.gate_rect)
+            self._gate_baked = self.level.gate_open
+        self.static.draw(screen, offset, view)
+        visible = self._visible(view)
+        queue = self.render_queue
+        for d in visible['decorations']:
+            queue.submit(self.LAYER_DECORATIONS, d.image, d.render_rect)
+        for p in visible['plants']:
+            queue.submit(self.LAYER_PLANTS, p.image, p.rect)
+        for e in visible['enemies']:
+            queue.submit(self.LAYER_ENEMIES, e.image, self._lerp_rect(e, e.render_rect, alpha))
+        for c in visible['collectibles']:
+            if not c.collected:
+                queue.submit(self.LAYER_COLLECTIBLES, c.image, c.render_rect)
         if self.player.health > 0:
-            draw_rect = getattr(self.player, 'render_rect', self.player.rect)
-            screen.blit(self.player.image, draw_rect.move(self.camera_offset + shake))
+            queue.submit(self.LAYER_PLAYER, self.player.image, self._lerp_rect(self.player, self.player.render_rect, alpha))
             if hasattr(self.level, 'gate_open') and self.level.gate_open and self.player.rect.colliderect(self.level.gate_rect):
                 total_collectibles = len(getattr(self.level, 'collectibles', []))
                 collected = sum(1 for c in getattr(self.level, 'collectibles', []) if getattr(c, 'collected', False))
                 self.manager.set(EndScene(self.manager, collected, total_collectibles))
         else:
             death_img = pygame.transform.rotate(self.player.image, 90)
-            draw_rect = getattr(self.player, 'render_rect', self.player.rect)
-            screen.blit(death_img, draw_rect.move(self.camera_offset + shake))
+            queue.submit(self.LAYER_PLAYER, death_img, self._lerp_rect(self.player, self.player.render_rect, alpha))
+        queue.flush(screen, offset)
+        if settings.DEBUG:
+            atk_rect_dbg = self.player.get_attack_rect()
+            if atk_rect_dbg:
+                screen.rect((255,255,0), atk_rect_dbg.move(offset), 1)
+            crowd = self.level.crowd
+            for e in self.level.enemies:
+                rect = crowd.rect_of(e.index) if crowd is not None else e.rect
+                screen.rect((0,255,0), rect.move(offset), 1)
         self.hud.draw(screen)
         if self.player.health<=0:
             self.hud.draw_game_over(screen)
@@ -326,32 +506,41 @@ class GameScene(Scene):
             remain = self.show_start_msg - self.start_msg_elapsed
             if remain < 0.75:
                 alpha = int(255 * (remain / 0.75))
-            line_surfs = []
-            stroke_color = (150, 95, 40)
-            for line in self.start_msg_lines:
-                base = self.start_msg_font.render(line, True, (255,255,255))
-                surf_line = pygame.Surface((base.get_width()+8, base.get_height()+8), pygame.SRCALPHA)
-                for ox in (-2,-1,0,1,2):
-                    for oy in (-2,-1,0,1,2):
-                        if ox == 0 and oy == 0:
-                            continue
-                        surf_line.blit(self.start_msg_font.render(line, True, stroke_color), (ox+4, oy+4))
-                surf_line.blit(base, (4,4))
-                line_surfs.append(surf_line)
-            total_h = sum(ls.get_height() for ls in line_surfs) + (len(line_surfs)-1)*10
-            max_w = max(ls.get_width() for ls in line_surfs)
-            block = pygame.Surface((max_w, total_h), pygame.SRCALPHA)
-            y = 0
-            for ls in line_surfs:
-                block.blit(ls, ((max_w - ls.get_width())//2, y))
-                y += ls.get_height() + 10
-            if alpha < 255:
-                block.set_alpha(alpha)
+            block = self._start_msg_block()
+            block.set_alpha(alpha)
             rect = block.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2))
             screen.blit(block, rect)
 
+    def _start_msg_block(self):
+        # texto com contorno montado uma vez; so o alpha muda durante o fade
+        if self._start_block is not None:
+            return self._start_block
+        line_surfs = []
+        stroke_color = (150, 95, 40)
+        for line in self.start_msg_lines:
+            base = self.start_msg_font.render(line, True, (255,255,255))
+            stroke = self.start_msg_font.render(line, True, stroke_color)
+            surf_line = pygame.Surface((base.get_width()+8, base.get_height()+8), pygame.SRCALPHA)
+            for ox in (-2,-1,0,1,2):
+                for oy in (-2,-1,0,1,2):
+                    if ox == 0 and oy == 0:
+                        continue
+                    surf_line.blit(stroke, (ox+4, oy+4))
+            surf_line.blit(base, (4,4))
+            line_surfs.append(surf_line)
+        total_h = sum(ls.get_height() for ls in line_surfs) + (len(line_surfs)-1)*10
+        max_w = max(ls.get_width() for ls in line_surfs)
+        block = pygame.Surface((max_w, total_h), pygame.SRCALPHA)
+        y = 0
+        for ls in line_surfs:
+            block.blit(ls, ((max_w - ls.get_width())//2, y))
+            y += ls.get_height() + 10
+        self._start_block = block
+        return block
+
 
 class LoadingScene(Scene):
+    @trace.traced('LoadingScene.__init__')
     def __init__(self, manager):
         super().__init__(manager)
         self.timer = 0.0
@@ -360,6 +549,11 @@ class LoadingScene(Scene):
         self.small = settings.load_font('pixel.ttf', 18)
         self.dot_timer = 0.0
         self.dot_stage = 0
+        self._compose()
+        self._drawn_fill = None
+        self._drawn_dots = None
+        # decode dos assets em thread; a cena continua animando enquanto isso
+        self.loader = BackgroundLoader(GameScene.clips()).start()
 
     def handle_event(self, event):
         pass
@@ -370,35 +564,62 @@ class LoadingScene(Scene):
         if self.dot_timer >= 0.4:
             self.dot_timer = 0
             self.dot_stage = (self.dot_stage + 1) % 4
-        if not self.done and self.timer > 0.15:
+        self.loader.pump()
+        if not self.done and self.loader.finished:
+            if settings.DEBUG:
+                settings.decoder.print_report()
             game = GameScene(self.manager)
             self.manager.set(game)
             self.done = True
 
-    def draw(self, screen):
-        screen.fill((15,10,25))
+    def _compose(self):
+        # fundo, trilho da barra, titulo e dica nao mudam durante o carregamento
         w = int(settings.WIDTH * 0.5)
         h = 28
-        bar_bg = pygame.Rect(0,0,w,h)
-        bar_bg.center = (settings.WIDTH//2, settings.HEIGHT//2 + 30)
-        pygame.draw.rect(screen, (40,25,70), bar_bg, border_radius=12)
-        prog = min(1.0, self.timer / 1.2)
-        fill_w = int((w-6) * prog)
-        fill_rect = pygame.Rect(bar_bg.left+3, bar_bg.top+3, fill_w, h-6)
-        pygame.draw.rect(screen, (255,0,200), fill_rect, border_radius=10)
+        self.bar_bg = pygame.Rect(0,0,w,h)
+        self.bar_bg.center = (settings.WIDTH//2, settings.HEIGHT//2 + 30)
+        self.layer = to_display(pygame.Surface((settings.WIDTH, settings.HEIGHT)), alpha=False)
+        self.layer.fill((15,10,25))
+        pygame.draw.rect(self.layer, (40,25,70), self.bar_bg, border_radius=12)
         title = self.font.render('CARREGANDO', True, (255,0,200))
-        dots = '.' * self.dot_stage
-        screen.blit(title, title.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 - 20)))
-        if dots:
-            dots_surf = self.font.render(dots, True, (255,0,200))
-            rect = dots_surf.get_rect()
-            rect.midleft = (title.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 - 20)).right + 8, settings.HEIGHT//2 - 20)
-            screen.blit(dots_surf, rect)
+        title_rect = title.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 - 20))
+        self.layer.blit(title, title_rect)
         hint = self.small.render('Aguarde...', True, (220,220,230))
-        screen.blit(hint, hint.get_rect(center=(settings.WIDTH//2, bar_bg.bottom + 30)))
+        self.layer.blit(hint, hint.get_rect(center=(settings.WIDTH//2, self.bar_bg.bottom + 30)))
+        self.dots = [None]
+        self.dots_area = pygame.Rect(title_rect.right + 8, title_rect.centery, 0, 0)
+        for n in range(1, 4):
+            surf = self.font.render('.' * n, True, (255,0,200))
+            rect = surf.get_rect(midleft=(title_rect.right + 8, settings.HEIGHT//2 - 20))
+            self.dots.append((surf, rect))
+            self.dots_area.union_ip(rect)
+
+    def draw(self, screen):
+        full = self.needs_full_redraw
+        if full:
+            screen.blit(self.layer, (0,0))
+        rects = []
+        fill_w = int((self.bar_bg.width-6) * self.loader.progress)
+        if full or fill_w != self._drawn_fill:
+            if not full:
+                screen.blit(self.layer, self.bar_bg, self.bar_bg)
+            fill_rect = pygame.Rect(self.bar_bg.left+3, self.bar_bg.top+3, fill_w, self.bar_bg.height-6)
+            screen.rect((255,0,200), fill_rect, border_radius=10)
+            rects.append(self.bar_bg)
+            self._drawn_fill = fill_w
+        if full or self.dot_stage != self._drawn_dots:
+            if not full:
+                screen.blit(self.layer, self.dots_area, self.dots_area)
+            if self.dots[self.dot_stage]:
+                screen.blit(*self.dots[self.dot_stage])
+            rects.append(self.dots_area)
+            self._drawn_dots = self.dot_stage
+        self.needs_full_redraw = False
+        return None if full else rects
 
 
 class EndScene(Scene):
+    @trace.traced('EndScene.__init__')
     def __init__(self, manager, collected, total):
         super().__init__(manager)
         self.collected = collected
@@ -415,6 +636,7 @@ class EndScene(Scene):
             self.font_small = settings.load_font('pixel.ttf', 18)
         self.timer = 0.0
         self.fade = 0.0
+        self.layer = None
 
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -425,49 +647,83 @@ class EndScene(Scene):
         self.timer += dt
         self.fade = min(1.0, self.fade + dt * 0.7)
 
-    def draw(self, screen):
-        screen.fill((10,5,15))
+    def _compose(self):
+        layer = to_display(pygame.Surface((settings.WIDTH, settings.HEIGHT)), alpha=False)
+        layer.fill((10,5,15))
         overlay = pygame.Surface((settings.WIDTH, settings.HEIGHT), pygame.SRCALPHA)
         overlay.fill((0,0,0, 160))
-        screen.blit(overlay, (0,0))
+        layer.blit(overlay, (0,0))
         title = self.font_big.render('PARABENS!', True, (255,0,200))
         trect = title.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 - 140))
-        screen.blit(title, trect)
+        layer.blit(title, trect)
         msg1 = self.font_mid.render(f'VOCE DERRETEU {self.percent}% DO SEU CEREBRO', True, (255,255,255))
-        screen.blit(msg1, msg1.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 - 40)))
+        layer.blit(msg1, msg1.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 - 40)))
         msg2 = self.font_small.render('Obrigado por jogar minha demo!', True, (230,230,240))
         msg3 = self.font_small.render('Feito por Cícero Gomes', True, (200,200,220))
         msg4 = self.font_small.render('Projeto UNINTER - Linguagem de Programação Aplicada', True, (180,180,200))
-        screen.blit(msg2, msg2.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 + 30)))
-        screen.blit(msg3, msg3.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 + 60)))
-        screen.blit(msg4, msg4.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 + 90)))
+        layer.blit(msg2, msg2.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 + 30)))
+        layer.blit(msg3, msg3.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 + 60)))
+        layer.blit(msg4, msg4.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 + 90)))
         hint = self.font_small.render('ENTER / ESPACO / ESC para voltar ao menu', True, (255,255,255))
-        screen.blit(hint, hint.get_rect(center=(settings.WIDTH//2, settings.HEIGHT - 40)))
+        layer.blit(hint, hint.get_rect(center=(settings.WIDTH//2, settings.HEIGHT - 40)))
+        return layer
+
+    def draw(self, screen):
+        # a tela final e estatica: compoe uma vez e so reapresenta quando invalidada
+        if not self.needs_full_redraw:
+            return []
+        if self.layer is None:
+            self.layer = self._compose()
+        screen.blit(self.layer, (0,0))
+        self.needs_full_redraw = False
+        return None
 
 
 def main():
-    pygame.init()
-    pygame.mixer.init()
-    screen = pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
-    pygame.display.set_caption(settings.TITLE)
+    with trace.span('pygame.init'):
+        pygame.init()
+        pygame.mixer.init()
+    with trace.span('display.set_mode'):
+        screen = create_backend(settings.RENDER_BACKEND, (settings.WIDTH, settings.HEIGHT), settings.TITLE,
+                                settings.RENDER_DRIVER, settings.RENDER_SCALE, settings.RENDER_PRESENT)
+    with trace.span('sprite_cache.load'):
+        sprite_cache.load()
+    with trace.span('atlas_cache.load'):
+        atlas_cache.load()
     clock = pygame.time.Clock()
-    manager = SceneManager()
+    manager = SceneManager(settings.TICK_RATE, settings.MAX_FRAME_TIME)
     manager.set(MenuScene(manager))
 
     running = True
+    traced_scene = None
     while running:
         dt = clock.tick(settings.FPS)/1000.0
         for event in pygame.event.get():
+            screen.map_event(event)
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                manager.invalidate()
             manager.handle_event(event)
-        manager.update(dt)
-        manager.draw(screen)
+        # simulacao em passo fixo; o desenho interpola com manager.alpha
+        manager.advance(dt)
+        if not screen.retains_frame:
+            manager.invalidate()
+        dirty = manager.draw(screen)
         if settings.DEBUG:
             fps_font = settings.load_font('pixel.ttf', 16)
             fps_surf = fps_font.render(f"FPS: {int(clock.get_fps())}", True, (255,255,255))
             screen.blit(fps_surf, (settings.WIDTH-90, 10))
-        pygame.display.flip()
+            # o contador escreve por cima da cena: no proximo frame ela repinta tudo
+            manager.invalidate()
+            dirty = None
+        screen.present(dirty)
+        if trace.enabled and type(manager.current) is not traced_scene:
+            traced_scene = type(manager.current)
+            trace.instant('primeiro frame ' + traced_scene.__name__)
+    if manager.current:
+        manager.current.on_exit()
+    screen.close()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,65 @@
+"""Reproduz uma gravacao sem janela e confere o estado final.
+
+A gravacao vem do jogo (`BRAINROT_RECORD=partida.json python -m src.main`)
+ou de um bot (`python -m src.sim --record partida.json`). A partida roda de
+novo com a mesma semente e a mesma entrada por tick, o mais rapido que a CPU
+deixa, e o hash do estado no fim tem que bater com o gravado. `--repeat`
+repete a reproducao para servir de carga estavel em medicoes de desempenho.
+
+    python -m src.replay partida.json [--repeat N]
+"""
+import argparse, os, sys, time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+try:
+    from . import settings
+    from .core.recording import Recording, ReplayControls
+    from .sim import Simulation
+except ImportError:
+    sys.path.append(os.path.dirname(__file__))
+    import settings  # type: ignore
+    from core.recording import Recording, ReplayControls  # type: ignore
+    from sim import Simulation  # type: ignore
+
+
+def replay(recording):
+    # devolve (simulacao no fim, segundos gastos nos ticks)
+    if recording.tick_rate != settings.TICK_RATE:
+        raise ValueError(f'gravacao a {recording.tick_rate} ticks/s, o jogo roda a {settings.TICK_RATE}')
+    controls = ReplayControls(recording)
+    sim = Simulation(controls, recording.seed)
+    start = time.perf_counter()
+    while not controls.exhausted and not sim.over:
+        sim.step()
+    return sim, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Reproduz uma gravacao de partida sem janela.')
+    parser.add_argument('recording')
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args(argv)
+    rec = Recording.load(args.recording)
+    ok = True
+    times = []
+    for _ in range(max(1, args.repeat)):
+        sim, elapsed = replay(rec)
+        times.append(elapsed)
+        got = sim.state_hash()
+        if rec.state is not None and got != rec.state:
+            ok = False
+            print(f'[replay] ESTADO DIFERENTE apos {sim.ticks} ticks: {got}, gravado {rec.state}')
+            break
+    best = min(times)
+    print(f'[replay] {rec.ticks} ticks, semente {rec.seed}: melhor {best:.3f}s '
+          f'({sim.ticks / max(best, 1e-9):.0f} ticks/s, {sim.ticks * settings.TICK / max(best, 1e-9):.0f}x tempo real), '
+          f'media {sum(times) / len(times):.3f}s em {len(times)} rodada(s)')
+    if ok:
+        print(f'[replay] estado {got} {"confere" if rec.state is not None else "(gravacao sem hash)"}')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,11 +9,20 @@ else:
 IMG_DIR = os.path.join(ASSETS_DIR, 'images')
 SND_DIR = os.path.join(ASSETS_DIR, 'sounds')
 FONT_DIR = os.path.join(ASSETS_DIR, 'fonts')
+CACHE_DIR = os.path.join(ASSETS_DIR, 'cache')
+SPRITE_CACHE = os.path.join(CACHE_DIR, 'sprites.bin')
+ATLAS_CACHE = os.path.join(CACHE_DIR, 'atlas')
 
 WIDTH = 960
 HEIGHT = 540
 TITLE = 'Brainrot: Tum Tum Sahur Despertar'
+# FPS limita so o desenho; a simulacao roda em ticks fixos de TICK_RATE por segundo
+# (velocidades e contadores das entidades sao por tick)
 FPS = 60
+TICK_RATE = 60
+TICK = 1.0 / TICK_RATE
+# depois de um engasgo, no maximo esse tempo vira ticks de recuperacao
+MAX_FRAME_TIME = 0.25
 GRAVITY = 0.7
 PLAYER_SPEED = 5
 JUMP_FORCE = -14
@@ -27,24 +36,76 @@ YELLOW = (255, 220, 0)
 PURPLE = (180, 60, 255)
 
 DEBUG = False
+SURFACE_CACHE_MB = 64
+STATIC_CHUNK_MB = 32
+# 'surface' (blits em software) ou 'renderer' (pygame._sdl2 Renderer/Texture)
+RENDER_BACKEND = os.environ.get('BRAINROT_BACKEND', 'surface')
+# driver do Renderer ('software', 'opengl', ...); None deixa o SDL escolher
+RENDER_DRIVER = os.environ.get('BRAINROT_RENDER_DRIVER') or None
+# resolucao interna (0.5, 0.75, 1.0) do backend de surfaces; a logica do jogo continua em WIDTH x HEIGHT
+RENDER_SCALE = float(os.environ.get('BRAINROT_RENDER_SCALE', '1.0'))
+# 'scaled' (janela pygame.SCALED) ou 'scale' (buffer interno ampliado com transform.scale)
+RENDER_PRESENT = os.environ.get('BRAINROT_PRESENT', 'scaled')
+# semente fixa da sessao (core.rng); vazio sorteia uma por partida
+SEED = int(os.environ['BRAINROT_SEED']) if os.environ.get('BRAINROT_SEED') else None
+# NightBorne do nivel como um NightBorneCrowd (arrays NumPy) em vez de um objeto por inimigo
+NIGHTBORNE_CROWD = os.environ.get('BRAINROT_CROWD', '') == '1'
+# grava a entrada de cada partida neste arquivo (src/replay.py reproduz)
+RECORD_PATH = os.environ.get('BRAINROT_RECORD') or None
 
 import pygame
-pygame.init()
-
-def load_image(name: str, size=None, colorkey=None):
+try:
+    from .core import trace
+    from .core.assets import can_convert, mip_size, scale_surface, set_mip, to_display
+    from .core.decode import decoder
+    from .core.surface_cache import SurfaceCache
+except ImportError:
+    from core import trace  # type: ignore
+    from core.assets import can_convert, mip_size, scale_surface, set_mip, to_display  # type: ignore
+    from core.decode import decoder  # type: ignore
+    from core.surface_cache import SurfaceCache  # type: ignore
+
+with trace.span('pygame.init (settings)'):
+    pygame.init()
+
+surface_cache = SurfaceCache(SURFACE_CACHE_MB)
+
+def load_image(name: str, size=None, colorkey=None, opaque=False, pin=None):
+    # a surface devolvida e compartilhada pelo cache: copie antes de alterar
     path = os.path.join(IMG_DIR, name)
     if not os.path.exists(path):
         surf = pygame.Surface((size or (48,48)), pygame.SRCALPHA)
         surf.fill((255,0,255))
         pygame.draw.rect(surf, (0,0,0), surf.get_rect(), 2)
         return surf
-    img = pygame.image.load(path).convert_alpha()
-    if size:
-        img = pygame.transform.smoothscale(img, size)
+    # fora da thread principal (BackgroundLoader) ou sem janela a surface sai sem convert:
+    # entra no cache com outra chave, para quem pede depois na thread principal nao receber a lenta
+    key = (
+        path,
+        tuple(size) if size else None,
+        tuple(colorkey) if colorkey is not None else None,
+        ('convert' if opaque else 'convert_alpha') if can_convert() else 'raw',
+    )
+    if pin is not None:
+        surface_cache.pin(key, pin)
+    return surface_cache.get(key, lambda: _load_image(path, size, colorkey, opaque))
+
+def _load_image(path, size, colorkey, opaque):
+    src = to_display(decoder.load(path).result(), alpha=not opaque)
+    img = src
+    if size and img.get_size() != tuple(size):
+        img = pygame.transform.smoothscale(src, size)
     if colorkey is not None:
         img.set_colorkey(colorkey)
+    if RENDER_SCALE != 1.0 and RENDER_BACKEND == 'surface':
+        # nivel de mip reduzido direto do original (uma reducao so, nao duas)
+        small = scale_surface(src, mip_size(img.get_size(), RENDER_SCALE))
+        if colorkey is not None:
+            small.set_colorkey(colorkey)
+        set_mip(img, RENDER_SCALE, small)
     return img
 
+@trace.traced('settings.load_font')
 def load_font(name: str, size: int):
     path = os.path.join(FONT_DIR, name)
     if not os.path.exists(path):
@@ -0,0 +1,125 @@
+"""Simulacao sem janela: a logica do GameScene o mais rapido que a CPU deixa.
+
+Usa os drivers SDL 'dummy' (video e audio), nunca chama `draw` e a entrada
+vem de um ScriptedControls em vez do teclado. Cada `step()` e um tick fixo
+(settings.TICK), igual ao do jogo com janela. Base para playtests
+automaticos, bots e benchmarks de CI em maquinas sem display.
+`--record` grava a entrada do bot para o src/replay.py.
+
+    python -m src.sim [--ticks N] [--bot idle|runner] [--seed S] [--record arquivo.json]
+"""
+import argparse, os, sys, time
+
+# antes de qualquer import do pygame/settings (settings chama pygame.init)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+try:
+    from . import settings
+    from .core.controls import IDLE, InputState, ScriptedControls
+    from .core.recording import InputRecorder, scene_state, state_hash
+    from .core.scene_manager import SceneManager
+    from .main import GameScene
+except ImportError:
+    sys.path.append(os.path.dirname(__file__))
+    import settings  # type: ignore
+    from core.controls import IDLE, InputState, ScriptedControls  # type: ignore
+    from core.recording import InputRecorder, scene_state, state_hash  # type: ignore
+    from core.scene_manager import SceneManager  # type: ignore
+    from main import GameScene  # type: ignore
+
+
+class Simulation:
+    """Um GameScene dirigido por ticks e por entrada injetada."""
+
+    def __init__(self, controls=None, seed=None, record=False):
+        # controls: o que o Player le (ReplayControls no replay); por padrao o
+        # ScriptedControls que step() alimenta. record grava o que o Player leu.
+        self.input = ScriptedControls()
+        self.controls = controls if controls is not None else self.input
+        self.recorder = None
+        if record:
+            self.controls = self.recorder = InputRecorder(self.controls, None, settings.TICK_RATE)
+        self.manager = SceneManager(settings.TICK_RATE, settings.MAX_FRAME_TIME)
+        self.scene = GameScene(self.manager, self.controls, seed)
+        self.seed = self.scene.seed
+        if self.recorder is not None:
+            self.recorder.recording.seed = self.seed
+        self.manager.set(self.scene)
+        self.ticks = 0
+
+    @property
+    def over(self):
+        return self.scene.player.health <= 0
+
+    def step(self, state=None):
+        # state: InputState deste tick (None mantem o anterior)
+        if state is not None:
+            self.input.set(state)
+        self.manager.update(settings.TICK)
+        self.ticks += 1
+
+    def run(self, ticks, bot=None):
+        # bot(sim) -> InputState, chamado antes de cada tick; para cedo se o jogador morrer
+        for _ in range(ticks):
+            if self.over:
+                break
+            self.step(bot(self) if bot is not None else None)
+        return self.ticks
+
+    def state(self):
+        return scene_state(self.scene)
+
+    def state_hash(self):
+        return state_hash(self.scene)
+
+    def recording(self):
+        # a gravacao ate aqui, com o hash do estado atual
+        rec = self.recorder.recording
+        rec.state = self.state_hash()
+        return rec
+
+
+class RunnerBot:
+    """Corre para a direita, pula quando trava numa parede e golpeia quem estiver perto."""
+
+    def __init__(self):
+        self.last_x = None
+
+    def __call__(self, sim):
+        player = sim.scene.player
+        stuck = player.rect.x == self.last_x
+        self.last_x = player.rect.x
+        near = any(e.alive and abs(e.rect.centerx - player.rect.centerx) < 120 for e in sim.scene.level.enemies)
+        return InputState(right=True, jump=stuck or sim.ticks % 90 == 0, attack=near)
+
+
+BOTS = {'idle': lambda: (lambda sim: IDLE), 'runner': RunnerBot}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Roda o GameScene sem janela.')
+    parser.add_argument('--ticks', type=int, default=3600)
+    parser.add_argument('--bot', choices=sorted(BOTS), default='runner')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--record', metavar='ARQUIVO', help='grava a entrada do bot (src/replay.py reproduz)')
+    args = parser.parse_args(argv)
+    sim = Simulation(seed=args.seed, record=bool(args.record))
+    start = time.perf_counter()
+    ticks = sim.run(args.ticks, BOTS[args.bot]())
+    elapsed = time.perf_counter() - start
+    p = sim.scene.player
+    print(f'[sim] {ticks} ticks em {elapsed:.2f}s ({ticks / max(elapsed, 1e-9):.0f} ticks/s, '
+          f'{ticks * settings.TICK / max(elapsed, 1e-9):.0f}x tempo real)')
+    print(f'[sim] vida {p.health}/{p.max_health}, pontos {p.score}, '
+          f'inimigos vivos {sum(e.alive for e in sim.scene.level.enemies)}, portal {"aberto" if sim.scene.level.gate_open else "fechado"}')
+    print(f'[sim] semente {sim.seed}, estado {sim.state_hash()}')
+    if args.record:
+        rec = sim.recording()
+        rec.save(args.record)
+        print(f'[sim] gravado {args.record} ({rec.ticks} ticks)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Gera o cache de sprites em disco (settings.SPRITE_CACHE).
+
+Roda os mesmos builders que o jogo usa (fatiar sheets, recortar, padronizar o
+canvas, smoothscale de plantas e moedas) em um pool de processos e grava tudo
+em um unico arquivo que o jogo mapeia com mmap ao iniciar.
+
+    python -m src.tools.bake_sprites [--workers N] [--output ARQ] [--check]
+"""
+import argparse, multiprocessing, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+# os workers nao abrem janela nem audio
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+try:
+    from .. import settings
+    from ..core.sprite_cache import SpriteCache, fingerprint, key_id, write_cache
+    from ..entities.player import Player
+    from ..entities.nightborne import NightBorneEnemy
+    from ..entities.enemy import Enemy
+    from ..entities.plant import Plant
+    from ..entities.collectible import COIN_FILES, coin_clip
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import settings  # type: ignore
+    from core.sprite_cache import SpriteCache, fingerprint, key_id, write_cache  # type: ignore
+    from entities.player import Player  # type: ignore
+    from entities.nightborne import NightBorneEnemy  # type: ignore
+    from entities.enemy import Enemy  # type: ignore
+    from entities.plant import Plant  # type: ignore
+    from entities.collectible import COIN_FILES, coin_clip  # type: ignore
+
+
+def jobs():
+    img = settings.IMG_DIR
+    out = [
+        ('Player', Player.clip, [os.path.join(img, 'TungTungTung Sahur', 'Sprites')]),
+        ('NightBorne', NightBorneEnemy.clip, [os.path.join(img, 'NightBorne')]),
+        ('Mushroom', Enemy.clip, [os.path.join(img, 'Mushroom')]),
+        ('coins', coin_clip, [os.path.join(img, f) for f in COIN_FILES]),
+    ]
+    plants_root = os.path.join(img, 'Plant Animations')
+    if os.path.isdir(plants_root):
+        for kind in sorted(os.listdir(plants_root)):
+            if os.path.isdir(os.path.join(plants_root, kind)):
+                out.append((f'Plant/{kind}', partial(Plant.clip, kind), [os.path.join(plants_root, kind)]))
+    return out
+
+
+def _init_worker():
+    # convert_alpha dos loaders precisa de uma surface de display, mesmo que dummy
+    pygame.display.set_mode((1, 1))
+
+
+def _bake(index):
+    name, clip, sources = jobs()[index]
+    start = time.perf_counter()
+    key, builder = clip()
+    data = builder()
+    shape = 'dict' if isinstance(data, dict) else 'list'
+    states = data if shape == 'dict' else {'': data}
+    packed = {}
+    for state, frames in states.items():
+        packed[state] = [(f.get_width(), f.get_height(), pygame.image.tobytes(f, 'RGBA')) for f in frames]
+    return name, (key_id(key), fingerprint(sources), shape, packed), time.perf_counter() - start
+
+
+def bake(output=None, workers=None):
+    output = output or settings.SPRITE_CACHE
+    todo = jobs()
+    ctx = multiprocessing.get_context('spawn')
+    clips = [None] * len(todo)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker) as pool:
+        futures = {pool.submit(_bake, i): i for i in range(len(todo))}
+        for fut, i in futures.items():
+            name, clips[i], elapsed = fut.result()
+            frames = sum(len(v) for v in clips[i][3].values())
+            print(f'[bake] {name}: {frames} frames em {elapsed*1000:.0f} ms')
+    size = write_cache(output, clips)
+    print(f'[bake] {len(clips)} clips, {size/1024/1024:.1f} MB -> {output}')
+    return output
+
+
+def check(path=None):
+    pygame.display.set_mode((1, 1))
+    cache = SpriteCache.open(path)
+    if cache is None:
+        print('[bake] cache ausente ou invalido')
+        return False
+    ok = True
+    for name, clip, _sources in jobs():
+        key, _builder = clip()
+        if key not in cache:
+            print(f'[bake] {name}: ausente')
+            ok = False
+        elif cache.lookup(key) is None:
+            print(f'[bake] {name}: obsoleto')
+            ok = False
+        else:
+            print(f'[bake] {name}: ok')
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera o cache de sprites pre-processados.')
+    parser.add_argument('--output', default=None, help='arquivo de saida (padrao: settings.SPRITE_CACHE)')
+    parser.add_argument('--workers', type=int, default=None, help='processos no pool (padrao: CPUs)')
+    parser.add_argument('--check', action='store_true', help='so verifica se o cache esta atualizado')
+    args = parser.parse_args(argv)
+    if args.check:
+        return 0 if check(args.output) else 1
+    bake(args.output, args.workers)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
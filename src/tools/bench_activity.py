@@ -0,0 +1,102 @@
+"""Mede Level1.update com e sem regioes de atividade em um nivel grande.
+
+Espalha N inimigos, moedas e plantas (semente fixa) por um nivel largo e
+anda a camera de ponta a ponta e de volta. Compara o tick com tudo ativo
+(`view=None`) e com a camera, e roda a versao com camera duas vezes para
+conferir que o estado final sai igual (acordar e deterministico). Com numpy
+roda tambem a camera com os inimigos numa NightBorneCrowd, que tem que
+chegar ao mesmo estado dos objetos.
+
+    python -m src.tools.bench_activity [--ticks N] [--counts 100,1000,5000]
+"""
+import argparse, hashlib, os, random, sys, time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+try:
+    from ..core import rng
+    from .. import settings
+    from ..entities.collectible import Collectible
+    from ..entities.nightborne_crowd import NightBorneCrowd
+    from ..entities.plant import Plant
+    from ..levels.level1 import Level1
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from core import rng  # type: ignore
+    import settings  # type: ignore
+    from entities.collectible import Collectible  # type: ignore
+    from entities.nightborne_crowd import NightBorneCrowd  # type: ignore
+    from entities.plant import Plant  # type: ignore
+    from levels.level1 import Level1  # type: ignore
+
+
+class _BigLevel(Level1):
+    count = 0
+
+    def _build(self):
+        super()._build()
+        rand = random.Random(1)
+        self.width = max(2000, self.count * 40)
+        self.platforms[0].rect.width = self.width
+        for _ in range(self.count):
+            x = rand.randrange(0, self.width - 100)
+            self.enemy_spawns.append(((x, 380), (-40, 40)))
+            self.collectibles.append(Collectible((rand.randrange(0, self.width), rand.randrange(100, 460))))
+            self.plants.append(Plant(rand.choice(self.PLANT_KINDS), (rand.randrange(0, self.width), 452)))
+
+
+def _state(level):
+    crowd = level.crowd
+    if crowd is not None:
+        enemies = list(zip(crowd.x.tolist(), crowd.y.tolist(), crowd.frame_index.tolist()))
+    else:
+        enemies = [(e.rect.x, e.rect.y, e.frame_index) for e in level.enemies]
+    return repr((enemies,
+                 [c.timer for c in level.collectibles],
+                 [(p.frame_index, round(p.timer, 9)) for p in level.plants])).encode()
+
+
+def run(count, ticks, use_view, crowd=False):
+    _BigLevel.count = count
+    rng.seed(7)
+    level = _BigLevel(crowd=crowd)
+    span = level.width - settings.WIDTH
+    elapsed = 0.0
+    for t in range(ticks):
+        # vai e volta: entidades dormem e acordam no caminho
+        x = abs((t * 24) % (2 * span) - span) if span > 0 else 0
+        view = pygame.Rect(span - x, 0, settings.WIDTH, settings.HEIGHT) if use_view else None
+        start = time.perf_counter()
+        level.update(view)
+        elapsed += time.perf_counter() - start
+    return elapsed / ticks * 1000, hashlib.md5(_state(level)).hexdigest(), level.activity.stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark das regioes de atividade.')
+    parser.add_argument('--ticks', type=int, default=300)
+    parser.add_argument('--counts', default='100,1000,5000')
+    args = parser.parse_args(argv)
+    pygame.display.set_mode((1, 1))
+    ok = True
+    for count in (int(v) for v in args.counts.split(',')):
+        all_ms, _all_hash, _ = run(count, args.ticks, False)
+        view_ms, view_hash, stats = run(count, args.ticks, True)
+        _ms, again_hash, _ = run(count, args.ticks, True)
+        same = view_hash == again_hash
+        ok = ok and same
+        print(f'[atividade] {count:5d} de cada: tudo {all_ms:.3f} ms/tick, regioes {view_ms:.3f} ms/tick '
+              f'({all_ms / view_ms:.1f}x) {stats}{"" if same else "  NAO DETERMINISTICO"}')
+        if NightBorneCrowd.available:
+            crowd_ms, crowd_hash, _ = run(count, args.ticks, True, crowd=True)
+            same = crowd_hash == view_hash
+            ok = ok and same
+            print(f'[atividade] {count:5d} multidao: regioes {crowd_ms:.3f} ms/tick'
+                  f'{"" if same else "  DIFERENTE DOS OBJETOS"}')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Compara os backends de desenho (surface x renderer) no GameScene.
+
+O backend de surfaces tambem roda em cada escala interna de `--scales`
+(settings.RENDER_SCALE); `--present` escolhe como o buffer interno chega a
+janela ('scale' e o padrao aqui: pygame.SCALED sem GPU cai no caminho lento
+do SDL). Com 'scale' o transform.scale da tela cheia entra na conta: x0.75
+sai mais caro que x1, so x0.5 compensa (o jogo usa 'scaled' por padrao).
+
+Cada backend roda num processo proprio (janela e contexto SDL separados),
+sem janela real (SDL_VIDEODRIVER=dummy) e, por padrao, com o driver de
+render 'software', entao funciona em CI sem GPU.
+
+    python -m src.tools.bench_backends [--frames N] [--driver software] [--scales 1,0.75,0.5] [--present scale]
+"""
+import argparse, multiprocessing, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+try:
+    from .. import settings
+    from ..core.backend import create_backend
+    from ..core.scene_manager import SceneManager
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import settings  # type: ignore
+    from core.backend import create_backend  # type: ignore
+    from core.scene_manager import SceneManager  # type: ignore
+
+
+def _run(name, frames, driver, scale=1.0, present='scale'):
+    try:
+        from ..main import GameScene, MenuScene
+    except ImportError:
+        from main import GameScene, MenuScene  # type: ignore
+    settings.RENDER_SCALE = scale
+    canvas = create_backend(name, (settings.WIDTH, settings.HEIGHT), settings.TITLE, driver, scale, present)
+    manager = SceneManager()
+    out = {}
+    for label, scene_cls in (('menu', MenuScene), ('jogo', GameScene)):
+        scene = scene_cls(manager)
+        manager.set(scene)
+        # aquecimento: decode, atlas, chunks e texturas ficam fora da medida
+        for _ in range(30):
+            manager.update(1 / 60)
+            manager.draw(canvas)
+            canvas.present(None)
+        start = time.perf_counter()
+        for i in range(frames):
+            if isinstance(scene, GameScene):
+                scene.player.rect.x += 4 if (i // 120) % 2 == 0 else -4
+            manager.update(1 / 60)
+            if not canvas.retains_frame:
+                manager.invalidate()
+            canvas.present(manager.draw(canvas))
+        out[label] = (time.perf_counter() - start) / frames * 1000
+    out['uploads'] = getattr(canvas, 'uploads', 0)
+    canvas.close()
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark dos backends de desenho.')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--driver', default='software', help="driver do Renderer (padrao: software)")
+    parser.add_argument('--scales', default='1,0.75,0.5', help='escalas internas do backend de surfaces')
+    parser.add_argument('--present', default='scale', choices=('scale', 'scaled'))
+    args = parser.parse_args(argv)
+    ctx = multiprocessing.get_context('spawn')
+    runs = [('surface', float(s)) for s in args.scales.split(',')] + [('renderer', 1.0)]
+    for name, scale in runs:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            res = pool.submit(_run, name, args.frames, args.driver, scale, args.present).result()
+        extra = f", {res['uploads']} texturas" if name == 'renderer' else ''
+        label = f'{name} x{scale:g}'
+        print(f"[backend] {label:13s}: menu {res['menu']:.2f} ms/frame, jogo {res['jogo']:.2f} ms/frame{extra}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Compara NightBorneEnemy.update (um objeto por inimigo) com o NightBorneCrowd.
+
+Os dois rodam o mesmo cenario (semente fixa): plataformas, patrulhas, dano
+periodico e um jogador parado levando golpes. O estado de todos os inimigos e
+conferido tick a tick; so o update/step entra na medida. `--grid` passa as
+plataformas numa UniformGrid, como o Level1.solids de niveis grandes.
+
+    python -m src.tools.bench_crowd [--ticks N] [--counts 10,100,1000] [--grid]
+"""
+import argparse, os, random, sys, time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+try:
+    from ..core.spatial import UniformGrid
+    from ..entities.nightborne import NightBorneEnemy
+    from ..entities.nightborne_crowd import NightBorneCrowd
+    from ..levels.level1 import Level1
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from core.spatial import UniformGrid  # type: ignore
+    from entities.nightborne import NightBorneEnemy  # type: ignore
+    from entities.nightborne_crowd import NightBorneCrowd  # type: ignore
+    from levels.level1 import Level1  # type: ignore
+
+
+class _Solid:
+    __slots__ = ('rect',)
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+
+
+class _Dummy:
+    # jogador parado: so conta os golpes recebidos
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.hits = 0
+
+    def take_damage(self, amount, knockback=None):
+        self.hits += 1
+
+
+def make_arena(count, seed=1):
+    rng = random.Random(seed)
+    width = max(1200, count * 24)
+    platforms = [_Solid((0, 900, width, 64))]
+    for _ in range(max(4, count // 20)):
+        platforms.append(_Solid((rng.randrange(0, width - 200), rng.randrange(300, 820), rng.randrange(120, 300), 40)))
+    spawns = [((rng.randrange(0, width - 100), rng.randrange(0, 700)), (-rng.randrange(30, 80), rng.randrange(30, 80)))
+              for _ in range(count)]
+    return platforms, spawns, _Dummy((width // 2, 860, 40, 40))
+
+
+def _objects_state(enemies):
+    return [(e.rect.x, e.rect.y, e.vel_y, e.alive, e.facing, e.attack_timer, e.hurt_timer,
+             NightBorneCrowd.STATES.index(e.state), e.frame_index) for e in enemies]
+
+
+def _crowd_state(c):
+    return list(zip(c.x.tolist(), c.y.tolist(), c.vel_y.tolist(), c.alive.tolist(), c.facing.tolist(),
+                    c.attack_timer.tolist(), c.hurt_timer.tolist(), c.state.tolist(), c.frame_index.tolist()))
+
+
+def run(count, ticks, use_grid=False):
+    platforms, spawns, _player = make_arena(count)
+    if use_grid:
+        grid = UniformGrid(Level1.SOLID_CELL)
+        for p in platforms:
+            grid.insert(p, p.rect)
+        platforms = grid
+    enemies = [NightBorneEnemy(pos, patrol) for pos, patrol in spawns]
+    crowd = NightBorneCrowd(spawns)
+    p1 = make_arena(count)[2]
+    p2 = make_arena(count)[2]
+    obj_time = crowd_time = 0.0
+    mismatch = None
+    for t in range(ticks):
+        start = time.perf_counter()
+        for e in enemies:
+            e.update(platforms)
+        obj_time += time.perf_counter() - start
+        start = time.perf_counter()
+        crowd.step(platforms)
+        crowd_time += time.perf_counter() - start
+        for e in enemies:
+            e.hit_player(p1)
+        for member in crowd:
+            member.hit_player(p2)
+        if t % 15 == 0:
+            victim = (t * 7) % count
+            enemies[victim].take_damage(1)
+            crowd[victim].take_damage(1)
+        if mismatch is None and (_objects_state(enemies) != _crowd_state(crowd) or p1.hits != p2.hits):
+            mismatch = t
+    return obj_time / ticks * 1000, crowd_time / ticks * 1000, mismatch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark do modo multidao dos NightBorne.')
+    parser.add_argument('--ticks', type=int, default=300)
+    parser.add_argument('--counts', default='10,100,1000')
+    parser.add_argument('--grid', action='store_true', help='plataformas numa UniformGrid')
+    args = parser.parse_args(argv)
+    if not NightBorneCrowd.available:
+        print('[multidao] numpy indisponivel')
+        return 1
+    pygame.display.set_mode((1, 1))
+    ok = True
+    for count in (int(v) for v in args.counts.split(',')):
+        obj_ms, crowd_ms, mismatch = run(count, args.ticks, args.grid)
+        ok = ok and mismatch is None
+        note = '' if mismatch is None else f'  ESTADO DIFERENTE no tick {mismatch}'
+        print(f'[multidao] {count:5d} inimigos: objetos {obj_ms:.3f} ms/tick, arrays {crowd_ms:.3f} ms/tick '
+              f'({obj_ms / crowd_ms:.1f}x){note}')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
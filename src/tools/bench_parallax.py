@@ -0,0 +1,90 @@
+"""Mede o custo do fundo em parallax do GameScene.
+
+Compara o desenho antigo (fill + ate 4 blits com alpha por camada) com o
+ParallaxBackground, com a camera parada e andando, e confere que os dois
+geram os mesmos pixels.
+
+    python -m src.tools.bench_parallax [--frames N]
+"""
+import argparse, os, sys, time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+try:
+    from .. import settings
+    from ..core.assets import registry
+    from ..core.parallax import ParallaxBackground
+    from ..main import GameScene
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    import settings  # type: ignore
+    from core.assets import registry  # type: ignore
+    from core.parallax import ParallaxBackground  # type: ignore
+    from main import GameScene  # type: ignore
+
+
+def naive_draw(screen, layers, cam_x, cam_y):
+    # o loop que o GameScene.draw usava antes do ParallaxBackground
+    screen.fill((5, 5, 15))
+    for img, dx, dy, tile in layers:
+        off_x = int(-cam_x * dx)
+        off_y = int(-cam_y * dy)
+        dest_y = 0
+        if img.get_height() < settings.HEIGHT * 0.7:
+            dest_y = settings.HEIGHT - img.get_height()
+        if tile:
+            w = img.get_width()
+            start_x = off_x % w
+            for ix in (-1, 0, 1, 2):
+                draw_x = -start_x + ix * w
+                if draw_x > settings.WIDTH or draw_x + w < -settings.WIDTH:
+                    continue
+                screen.blit(img, (draw_x, dest_y + off_y))
+        else:
+            screen.blit(img, (off_x, dest_y + off_y))
+
+
+def camera_path(frames, moving):
+    for i in range(frames):
+        if moving:
+            yield (i * 3) % 400, (i // 2) % 200
+        else:
+            yield 120, 40
+
+
+def _time(draw, screen, frames, moving):
+    start = time.perf_counter()
+    for cam_x, cam_y in camera_path(frames, moving):
+        draw(screen, cam_x, cam_y)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark do fundo em parallax.')
+    parser.add_argument('--frames', type=int, default=600)
+    args = parser.parse_args(argv)
+    screen = pygame.display.set_mode((settings.WIDTH, settings.HEIGHT))
+    layers = registry.get(*GameScene._background_clip())
+    layers = [(img, dx, dy, tile) for img, (_f, dx, dy, tile) in zip(layers, GameScene.BG_LAYERS) if img is not None]
+    background = ParallaxBackground(layers, (settings.WIDTH, settings.HEIGHT))
+
+    reference = pygame.Surface(screen.get_size())
+    for cam_x, cam_y in list(camera_path(120, True)) + list(camera_path(10, False)):
+        naive_draw(reference, layers, cam_x, cam_y)
+        background.draw(screen, cam_x, cam_y)
+        if pygame.image.tobytes(screen, 'RGB') != pygame.image.tobytes(reference, 'RGB'):
+            print(f'[parallax] pixels diferentes em camera=({cam_x}, {cam_y})')
+            return 1
+
+    for moving in (False, True):
+        label = 'andando' if moving else 'parada '
+        before = _time(lambda s, x, y: naive_draw(s, layers, x, y), screen, args.frames, moving)
+        after = _time(background.draw, screen, args.frames, moving)
+        print(f'[parallax] camera {label}: antes {before:.3f} ms/frame, depois {after:.3f} ms/frame')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
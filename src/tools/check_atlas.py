@@ -0,0 +1,80 @@
+"""Confere o cache de atlas (core.atlas_cache) ida e volta.
+
+Monta os clips de `bake_sprites.jobs()` com o registry do jogo, grava os
+atlas em uma pasta temporaria e carrega de novo em um registry limpo: cada
+frame lido do disco tem que ter os mesmos pixels do frame empacotado, e a
+segunda carga nao pode chamar nenhum builder.
+
+    python -m src.tools.check_atlas [--root PASTA]
+"""
+import argparse, os, shutil, sys, tempfile
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+try:
+    from ..core.assets import AnimationRegistry
+    from ..core.atlas import frame_keys
+    from ..core.atlas_cache import AtlasCache
+    from .bake_sprites import jobs
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from core.assets import AnimationRegistry  # type: ignore
+    from core.atlas import frame_keys  # type: ignore
+    from core.atlas_cache import AtlasCache  # type: ignore
+    from tools.bake_sprites import jobs  # type: ignore
+
+
+def _pixels(clip):
+    return {k: (f.get_size(), pygame.image.tobytes(f, 'RGBA')) for k, f in frame_keys(clip)}
+
+
+def _load_all(root):
+    reg = AnimationRegistry()
+    reg.atlas_cache = AtlasCache(root)
+    built = []
+    clips = {}
+    for name, clip, _sources in jobs():
+        key, builder = clip()
+
+        def counted(builder=builder, name=name):
+            built.append(name)
+            return builder()
+        clips[name] = reg.get(key, counted)
+    return reg.atlas_cache, clips, built
+
+
+def check(root):
+    first_cache, first, _built = _load_all(root)
+    second_cache, second, built = _load_all(root)
+    ok = True
+    for name, clip in first.items():
+        cached = name not in built
+        same = _pixels(clip) == _pixels(second[name])
+        ok = ok and same
+        print(f'[atlas] {name}: {"cache" if cached else "builder"}, '
+              f'{"pixels iguais" if same else "PIXELS DIFERENTES"}')
+    print(f'[atlas] gravados {first_cache.saved}, lidos {second_cache.loaded}, '
+          f'obsoletos {second_cache.stale}')
+    if second_cache.loaded != first_cache.saved:
+        print('[atlas] nem todo atlas gravado foi lido de volta')
+        ok = False
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Confere gravar/ler os atlas em disco.')
+    parser.add_argument('--root', default=None, help='pasta do cache (padrao: temporaria, apagada no fim)')
+    args = parser.parse_args(argv)
+    pygame.display.set_mode((1, 1))
+    root = args.root or tempfile.mkdtemp(prefix='atlas-')
+    try:
+        return 0 if check(root) else 1
+    finally:
+        if args.root is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
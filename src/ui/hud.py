@@ -1,21 +1,27 @@
 import pygame, os, sys
 try:
     from .. import settings
+    from ..core import trace
 except ImportError:
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
     import settings  # type: ignore
+    from core import trace  # type: ignore
 
 class HUD:
     def __init__(self, player):
         self.player = player
         kaph_ttf = os.path.join(settings.FONT_DIR, 'Kaph_Font_1_20', 'TrueType (.ttf)', 'Kaph-Regular.ttf')
-        if os.path.exists(kaph_ttf):
-            self.font_small = pygame.font.Font(kaph_ttf, 22)
-            self.font_big = pygame.font.Font(kaph_ttf, 60)
-        else:
-            self.font_small = settings.load_font('pixel.ttf', 20)
-            self.font_big = settings.load_font('pixel.ttf', 48)
+        with trace.span('HUD fonts'):
+            if os.path.exists(kaph_ttf):
+                self.font_small = pygame.font.Font(kaph_ttf, 22)
+                self.font_big = pygame.font.Font(kaph_ttf, 60)
+            else:
+                self.font_small = settings.load_font('pixel.ttf', 20)
+                self.font_big = settings.load_font('pixel.ttf', 48)
         self._build_hearts()
+        self._score = None
+        self._score_surf = None
+        self._game_over = None
 
     def _build_hearts(self):
         # Cria surfaces de coração cheio e vazio garantindo exibição mesmo sem fonte unicode
@@ -46,14 +52,17 @@ class HUD:
         for i in range(self.player.max_health):
             img = self.heart_full if i < self.player.health else self.heart_empty
             screen.blit(img, (x + i*spacing, y))
-        # Score
-        score_surf = self.font_small.render(f'Dopamina: {self.player.score}', True, settings.YELLOW)
-        screen.blit(score_surf, (16, 40))
+        # Score (o texto so e renderizado de novo quando o valor muda)
+        if self.player.score != self._score:
+            self._score = self.player.score
+            self._score_surf = self.font_small.render(f'Dopamina: {self._score}', True, settings.YELLOW)
+        screen.blit(self._score_surf, (16, 40))
 
     def draw_game_over(self, screen):
-        text = self.font_big.render('GAME OVER', True, settings.PURPLE)
-        info = self.font_small.render('Pressione R para reiniciar', True, settings.WHITE)
-        rect = text.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 - 40))
-        irect = info.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 + 20))
-        screen.blit(text, rect)
-        screen.blit(info, irect)
+        if self._game_over is None:
+            text = self.font_big.render('GAME OVER', True, settings.PURPLE)
+            info = self.font_small.render('Pressione R para reiniciar', True, settings.WHITE)
+            rect = text.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 - 40))
+            irect = info.get_rect(center=(settings.WIDTH//2, settings.HEIGHT//2 + 20))
+            self._game_over = ((text, rect), (info, irect))
+        screen.blits(self._game_over, False)
@@ -0,0 +1,19 @@
+import os, sys
+
+# sem janela nem audio: os testes rodam em CI
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pygame
+import pytest
+
+
+@pytest.fixture(scope='session', autouse=True)
+def display():
+    # convert/convert_alpha (to_display, atlas) precisam de uma surface de display
+    pygame.display.init()
+    screen = pygame.display.set_mode((1, 1))
+    yield screen
+    pygame.display.quit()
+
@@ -0,0 +1,171 @@
+import os
+
+import pygame
+import pytest
+
+from src import settings
+from src.core.assets import AnimationRegistry, VariantBank
+from src.core.atlas import Atlas, frame_keys
+from src.core.atlas_cache import AtlasCache
+
+
+def _frame(color, size):
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    surf.fill(color)
+    surf.set_at((0, 0), (255, 255, 255, 255))
+    return surf
+
+
+def _pixels(surf):
+    return surf.get_size(), pygame.image.tobytes(surf, 'RGBA')
+
+
+@pytest.fixture
+def frames():
+    return {f'f{i}': _frame((i * 20, 255 - i * 20, 90, 255 - i * 10), (8 + i, 5 + 2 * i)) for i in range(10)}
+
+
+def test_pack_keeps_pixels_and_shares_pages(frames):
+    atlas = Atlas((64, 64)).pack(frames)
+    assert len(atlas) == len(frames)
+    for key, surf in frames.items():
+        view = atlas.get(key)
+        assert _pixels(view) == _pixels(surf)
+        assert view.get_parent() in atlas.pages
+
+
+def test_pack_rects_do_not_overlap(frames):
+    atlas = Atlas((64, 64), padding=1).pack(frames)
+    placed = list(atlas.rects.values())
+    for i, (page_a, a) in enumerate(placed):
+        assert a.right <= 64 and a.bottom <= 64
+        for page_b, b in placed[i + 1:]:
+            assert page_a != page_b or not a.colliderect(b)
+
+
+def test_pack_opens_new_pages_when_full(frames):
+    atlas = Atlas((32, 32)).pack(frames)
+    assert len(atlas.pages) > 1
+    for key, surf in frames.items():
+        assert _pixels(atlas.get(key)) == _pixels(surf)
+
+
+def test_repeated_surface_uses_one_slot():
+    surf = _frame((1, 2, 3, 255), (6, 6))
+    atlas = Atlas((32, 32)).pack({'a': surf, 'b': surf})
+    assert atlas.rects['a'] == atlas.rects['b']
+
+
+def test_second_pack_appends(frames):
+    atlas = Atlas((64, 64)).pack(dict(list(frames.items())[:5]))
+    pages = len(atlas.pages)
+    atlas.pack(dict(list(frames.items())[5:]))
+    assert len(atlas.pages) >= pages
+    for key, surf in frames.items():
+        assert _pixels(atlas.get(key)) == _pixels(surf)
+
+
+def test_save_load_round_trip(tmp_path, frames):
+    atlas = Atlas((48, 48)).pack(frames)
+    atlas.meta = {'shape': 'list', 'counts': {'': 0}, 'note': 'x'}
+    path = str(tmp_path / 'sub' / 'clip')
+    atlas.save(path)
+    loaded = Atlas.load(path)
+    assert loaded.page_size == (48, 48)
+    assert loaded.meta == atlas.meta
+    assert loaded.rects == atlas.rects
+    for key, surf in frames.items():
+        assert _pixels(loaded.get(key)) == _pixels(surf)
+
+
+def test_load_rejected_by_accept_or_missing(tmp_path, frames):
+    path = str(tmp_path / 'clip')
+    Atlas((48, 48)).pack(frames).save(path)
+    assert Atlas.load(path, accept=lambda meta: False) is None
+    assert Atlas.load(str(tmp_path / 'absent')) is None
+    os.remove(path + '_0.png')
+    assert Atlas.load(path) is None
+
+
+def test_clip_rebuilds_builder_shape():
+    clip = {'idle': [_frame((9, 9, 9, 255), (4, 4)), _frame((8, 8, 8, 255), (5, 4))], 'run': [_frame((7, 7, 7, 255), (3, 6))]}
+    atlas = Atlas((32, 32)).pack(dict(frame_keys(clip)))
+    atlas.meta = {'shape': 'dict', 'counts': {state: len(v) for state, v in clip.items()}}
+    got = atlas.clip()
+    assert {s: [_pixels(f) for f in v] for s, v in got.items()} == {s: [_pixels(f) for f in v] for s, v in clip.items()}
+    frames = [_frame((1, 1, 1, 255), (4, 4)), _frame((2, 2, 2, 255), (4, 4))]
+    atlas = Atlas((32, 32)).pack(dict(frame_keys(frames)))
+    atlas.meta = {'shape': 'list', 'counts': {'': 2}}
+    assert [_pixels(f) for f in atlas.clip()] == [_pixels(f) for f in frames]
+
+
+@pytest.fixture
+def img_dir(tmp_path, monkeypatch):
+    root = tmp_path / 'images'
+    (root / 'hero').mkdir(parents=True)
+    (root / 'hero' / 'sheet.png').write_bytes(b'sheet')
+    monkeypatch.setattr(settings, 'IMG_DIR', str(root))
+    return root
+
+
+def test_atlas_cache_round_trip_through_registry(img_dir, tmp_path):
+    key = ('Hero', os.path.join(str(img_dir), 'hero'))
+    clip = {'idle': [_frame((i * 30, 0, 0, 255), (10, 12)) for i in range(4)]}
+    calls = []
+
+    def builder():
+        calls.append(1)
+        return {k: list(v) for k, v in clip.items()}
+
+    first = AnimationRegistry()
+    first.atlas_cache = AtlasCache(str(tmp_path / 'atlas'))
+    built = first.get(key, builder)
+    assert first.atlas_cache.saved == 1
+
+    second = AnimationRegistry()
+    second.atlas_cache = AtlasCache(str(tmp_path / 'atlas'))
+    loaded = second.get(key, builder)
+    assert len(calls) == 1
+    assert second.atlas_cache.loaded == 1
+    assert key in second.atlases
+    assert [_pixels(f) for f in loaded['idle']] == [_pixels(f) for f in built['idle']]
+
+
+def test_atlas_cache_stale_after_source_change(img_dir, tmp_path):
+    key = ('Hero', os.path.join(str(img_dir), 'hero'))
+    clip = [_frame((0, i * 30, 0, 255), (10, 12)) for i in range(3)]
+    reg = AnimationRegistry()
+    reg.atlas_cache = AtlasCache(str(tmp_path / 'atlas'))
+    reg.get(key, lambda: list(clip))
+    (img_dir / 'hero' / 'sheet.png').write_bytes(b'sheet v2')
+    cache = AtlasCache(str(tmp_path / 'atlas'))
+    assert cache.lookup(key) is None
+    assert cache.stale == 1
+
+
+def test_variants_packed_into_clip_atlas():
+    reg = AnimationRegistry()
+    key = ('variants-test',)
+    frame = _frame((200, 10, 10, 255), (6, 8))
+    clip = reg.get(key, lambda: {'idle': [frame, _frame((10, 200, 10, 255), (6, 8))]})
+    bank = reg.variants(key, ('hit', 'blink'))
+    plain = VariantBank(clip, ('hit', 'blink'))
+    atlas = reg.atlases[key]
+    for k, surf in plain._frames.items():
+        view = bank.get(*k)
+        if k[2] == -1 or k[3] is not None:
+            assert view.get_abs_parent() in atlas.pages
+        # blink leva o alpha na subsurface: compara o resultado do blit
+        a, b = pygame.Surface(surf.get_size()), pygame.Surface(surf.get_size())
+        a.blit(surf, (0, 0))
+        b.blit(view, (0, 0))
+        assert pygame.image.tobytes(a, 'RGB') == pygame.image.tobytes(b, 'RGB')
+
+
+def test_clear_drops_atlases():
+    reg = AnimationRegistry()
+    key = ('clear-test',)
+    reg.get(key, lambda: [_frame((1, 1, 1, 255), (4, 4)), _frame((2, 2, 2, 255), (4, 4))])
+    assert key in reg.atlases
+    reg.clear()
+    assert key not in reg.atlases and key not in reg
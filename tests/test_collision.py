@@ -0,0 +1,143 @@
+import random
+
+import pygame
+
+from src.core.collision import CollisionWorld
+
+
+class _Thing:
+    def __init__(self, name, rect):
+        self.name = name
+        self.rect = pygame.Rect(rect)
+        self.alive = True
+        self.collected = False
+
+    def __repr__(self):
+        return self.name
+
+
+def _brute(pairs_a, pairs_b):
+    return [(a, b) for b in pairs_b for a in pairs_a if a.rect.colliderect(b.rect)]
+
+
+def test_only_registered_overlapping_pairs_dispatch():
+    world = CollisionWorld()
+    player = _Thing('player', (0, 0, 20, 20))
+    near_enemy = _Thing('near', (10, 10, 20, 20))
+    far_enemy = _Thing('far', (500, 0, 20, 20))
+    coin = _Thing('coin', (5, 5, 4, 4))
+    world.add(player, 'hurtbox', lambda: player.rect)
+    world.add(near_enemy, 'enemy', near_enemy.rect)
+    world.add(far_enemy, 'enemy', far_enemy.rect)
+    world.add(coin, 'pickup', coin.rect)
+    got = []
+    world.on('hurtbox', 'enemy', lambda a, b: got.append(('hit', a, b)))
+    stats = world.step()
+    assert got == [('hit', player, near_enemy)]
+    assert stats['pairs'] == 1
+    assert stats['colliders'] == 3
+
+
+def test_dispatch_order_is_rule_then_insertion():
+    world = CollisionWorld()
+    player = _Thing('player', (0, 0, 100, 100))
+    enemies = [_Thing(f'e{i}', (90 - 10 * i, 0, 10, 10)) for i in range(5)]
+    coins = [_Thing(f'c{i}', (10 * i, 50, 5, 5)) for i in range(3)]
+    world.add(player, 'hurtbox', player.rect)
+    for e in enemies:
+        world.add(e, 'enemy', e.rect)
+    for c in coins:
+        world.add(c, 'pickup', c.rect)
+    got = []
+    world.on('hurtbox', 'enemy', lambda a, b: got.append(b))
+    world.on('hurtbox', 'pickup', lambda a, b: got.append(b))
+    world.step()
+    assert got == enemies + coins
+
+
+def test_rule_order_of_kinds_does_not_matter():
+    world = CollisionWorld()
+    a, b = _Thing('a', (0, 0, 10, 10)), _Thing('b', (5, 5, 10, 10))
+    world.add(b, 'enemy', b.rect)
+    world.add(a, 'hurtbox', a.rect)
+    got = []
+    world.on('hurtbox', 'enemy', lambda x, y: got.append((x, y)))
+    world.step()
+    assert got == [(a, b)]
+
+
+def test_callable_bounds_follow_the_owner_and_none_disables():
+    world = CollisionWorld()
+    player = _Thing('player', (0, 0, 10, 10))
+    enemy = _Thing('enemy', (100, 0, 10, 10))
+    attacking = {'on': False}
+    world.add(player, 'attack', lambda: player.rect if attacking['on'] else None)
+    world.add(enemy, 'enemy', lambda: enemy.rect)
+    got = []
+    world.on('attack', 'enemy', lambda a, b: got.append(b))
+    player.rect.x = 95
+    world.step()
+    assert got == []
+    attacking['on'] = True
+    world.step()
+    assert got == [enemy]
+
+
+def test_removed_on_death_and_collection():
+    # mesmo padrao do GameScene: o callback tira do mundo quem morreu ou foi coletado
+    world = CollisionWorld()
+    player = _Thing('player', (0, 0, 40, 40))
+    enemy = _Thing('enemy', (10, 0, 20, 20))
+    coin = _Thing('coin', (5, 5, 5, 5))
+    world.add(player, 'hurtbox', lambda: player.rect)
+    world.add(player, 'attack', lambda: player.rect)
+    world.add(enemy, 'enemy', lambda: enemy.rect)
+    world.add(coin, 'pickup', coin.rect)
+    hits, pickups, contacts = [], [], []
+
+    def on_attack(p, e):
+        hits.append(e)
+        e.alive = False
+        world.remove(e)
+
+    def on_pickup(p, c):
+        pickups.append(c)
+        c.collected = True
+        world.remove(c)
+
+    world.on('hurtbox', 'enemy', lambda p, e: contacts.append(e))
+    world.on('attack', 'enemy', on_attack)
+    world.on('hurtbox', 'pickup', on_pickup)
+    world.step()
+    assert (contacts, hits, pickups) == ([enemy], [enemy], [coin])
+    assert (enemy, 'enemy') not in world and (coin, 'pickup') not in world
+    stats = world.step()
+    assert (contacts, hits, pickups) == ([enemy], [enemy], [coin])
+    assert stats['colliders'] == 2 and stats['pairs'] == 0
+
+
+def test_remove_one_kind_keeps_the_others():
+    world = CollisionWorld()
+    player = _Thing('player', (0, 0, 10, 10))
+    world.add(player, 'hurtbox', player.rect)
+    world.add(player, 'attack', player.rect)
+    world.remove(player, 'attack')
+    assert (player, 'hurtbox') in world and (player, 'attack') not in world
+    assert len(world) == 1
+
+
+def test_matches_brute_force():
+    rand = random.Random(5)
+    world = CollisionWorld()
+    hurt = [_Thing(f'h{i}', (rand.randrange(0, 800), rand.randrange(0, 600), rand.randrange(1, 60), rand.randrange(1, 60)))
+            for i in range(20)]
+    enemies = [_Thing(f'e{i}', (rand.randrange(0, 800), rand.randrange(0, 600), rand.randrange(1, 60), rand.randrange(1, 60)))
+               for i in range(60)]
+    for h in hurt:
+        world.add(h, 'hurtbox', h.rect)
+    for e in enemies:
+        world.add(e, 'enemy', e.rect)
+    got = []
+    world.on('hurtbox', 'enemy', lambda a, b: got.append((a, b)))
+    world.step()
+    assert got == _brute(hurt, enemies)
@@ -0,0 +1,132 @@
+import random
+
+import pygame
+import pytest
+
+pytest.importorskip('numpy')
+
+from src.core import rng
+from src.core.spatial import UniformGrid
+from src.entities.nightborne import NightBorneEnemy
+from src.entities.nightborne_crowd import NightBorneCrowd
+from src.levels.level1 import Level1
+from src.tools.bench_crowd import make_arena
+
+
+def _objects(enemies):
+    return [(e.rect.x, e.rect.y, e.vel_y, e.alive, e.facing, e.attack_timer, e.hurt_timer,
+             NightBorneCrowd.STATES.index(e.state), e.frame_index) for e in enemies]
+
+
+def _crowd(c):
+    return list(zip(c.x.tolist(), c.y.tolist(), c.vel_y.tolist(), c.alive.tolist(), c.facing.tolist(),
+                    c.attack_timer.tolist(), c.hurt_timer.tolist(), c.state.tolist(), c.frame_index.tolist()))
+
+
+def _grid(platforms):
+    grid = UniformGrid(Level1.SOLID_CELL)
+    for p in platforms:
+        grid.insert(p, p.rect)
+    return grid
+
+
+@pytest.mark.parametrize('use_grid', (False, True))
+def test_step_matches_update_tick_for_tick(use_grid):
+    count = 40
+    platforms, spawns, _ = make_arena(count)
+    if use_grid:
+        platforms = _grid(platforms)
+    enemies = [NightBorneEnemy(pos, patrol) for pos, patrol in spawns]
+    crowd = NightBorneCrowd(spawns)
+    p1, p2 = make_arena(count)[2], make_arena(count)[2]
+    for t in range(240):
+        for e in enemies:
+            e.update(platforms)
+        crowd.step(platforms)
+        for e in enemies:
+            e.hit_player(p1)
+        for member in crowd:
+            member.hit_player(p2)
+        if t % 15 == 0:
+            # poucos alvos repetidos: alguns morrem e caem no meio do teste
+            victim = (t // 15) % 5 * 7
+            enemies[victim].take_damage(2)
+            crowd[victim].take_damage(2)
+        assert _crowd(crowd) == _objects(enemies), f'tick {t}'
+        assert p1.hits == p2.hits, f'tick {t}'
+    assert not crowd.alive.all()
+
+
+def test_member_rect_edits_go_back_to_the_arrays():
+    platforms, spawns, _ = make_arena(10)
+    enemies = [NightBorneEnemy(pos, patrol) for pos, patrol in spawns]
+    crowd = NightBorneCrowd(spawns)
+    for t in range(30):
+        if t == 10:
+            # recuo do golpe, como no GameScene._on_attack_hit
+            enemies[3].rect.x += 6
+            crowd[3].rect.x += 6
+        for e in enemies:
+            e.update(platforms)
+        crowd.step(platforms)
+    assert _crowd(crowd) == _objects(enemies)
+
+
+def test_read_only_access_does_not_touch():
+    _platforms, spawns, _ = make_arena(5)
+    crowd = NightBorneCrowd(spawns)
+    for member in crowd:
+        member.render_rect
+        member.collision_bounds()
+        crowd.rect_of(member.index)
+    assert not crowd._touched
+
+
+def test_only_active_rows_advance():
+    count = 30
+    platforms, spawns, _ = make_arena(count)
+    enemies = [NightBorneEnemy(pos, patrol) for pos, patrol in spawns]
+    crowd = NightBorneCrowd(spawns)
+    rand = random.Random(9)
+    for t in range(200):
+        active = sorted(rand.sample(range(count), rand.randrange(0, count)))
+        for i in active:
+            enemies[i].update(platforms)
+        crowd.step(platforms, active)
+        if t % 20 == 0:
+            enemies[t % count].take_damage(2)
+            crowd[t % count].take_damage(2)
+        assert _crowd(crowd) == _objects(enemies), f'tick {t}'
+
+
+class _BigLevel(Level1):
+    def _build(self):
+        super()._build()
+        rand = random.Random(1)
+        self.width = 6000
+        self.platforms[0].rect.width = self.width
+        for _ in range(120):
+            self.enemy_spawns.append(((rand.randrange(0, self.width - 100), 380), (-40, 40)))
+
+
+def _level_state(level):
+    if level.crowd is not None:
+        return list(zip(level.crowd.x.tolist(), level.crowd.y.tolist(), level.crowd.frame_index.tolist()))
+    return [(e.rect.x, e.rect.y, e.frame_index) for e in level.enemies]
+
+
+def test_level_crowd_follows_the_activity_regions():
+    # a camera anda pelo nivel: na multidao quem esta fora da regiao ativa congela como os objetos
+    states = []
+    for crowd in (False, True):
+        rng.seed(7)
+        level = _BigLevel(crowd=crowd)
+        assert (level.crowd is not None) == crowd
+        for t in range(300):
+            view = pygame.Rect(t * 8, 0, 960, 540)
+            level.update(view)
+        states.append(_level_state(level))
+    assert states[0] == states[1]
+    start = _BigLevel(crowd=True)
+    far = [i for i, x in enumerate(start.crowd.x.tolist()) if x > 300 * 8 + 960 + 2 * Level1.ACTIVE_MARGIN]
+    assert far and all(states[1][i][:2] == (start.crowd.x[i], start.crowd.y[i]) for i in far)
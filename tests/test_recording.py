@@ -0,0 +1,62 @@
+import itertools
+
+import pytest
+
+from src.core.controls import IDLE, InputState
+from src.core.recording import InputRecorder, Recording, ReplayControls, decode, encode
+
+
+ALL_STATES = [InputState(*bits) for bits in itertools.product((False, True), repeat=len(InputState._fields))]
+
+
+def test_encode_decode_every_state():
+    codes = [encode(s) for s in ALL_STATES]
+    assert len(set(codes)) == len(ALL_STATES)
+    assert [decode(c) for c in codes] == ALL_STATES
+    assert encode(IDLE) == 0
+
+
+def test_runs_compress_repeated_ticks():
+    rec = Recording(seed=7, tick_rate=60)
+    right = InputState(*[f == 'right' for f in InputState._fields])
+    for state in [IDLE] * 3 + [right] * 2 + [IDLE]:
+        rec.append(state)
+    assert rec.runs == [[0, 3], [encode(right), 2], [0, 1]]
+    assert rec.ticks == 6
+    assert list(rec.inputs()) == [IDLE] * 3 + [right] * 2 + [IDLE]
+
+
+def test_save_load_round_trip(tmp_path):
+    rec = Recording(seed=42, tick_rate=60)
+    for i in range(50):
+        rec.append(ALL_STATES[(i * 7) % len(ALL_STATES)])
+    rec.state = 'abc123'
+    path = tmp_path / 'partida.json'
+    rec.save(str(path))
+    got = Recording.load(str(path))
+    assert (got.seed, got.tick_rate, got.state, got.ticks) == (42, 60, 'abc123', 50)
+    assert list(got.inputs()) == list(rec.inputs())
+
+
+def test_load_rejects_other_versions(tmp_path):
+    path = tmp_path / 'old.json'
+    path.write_text('{"version": 0, "seed": 1, "tick_rate": 60, "inputs": []}')
+    with pytest.raises(ValueError):
+        Recording.load(str(path))
+
+
+def test_recorder_and_replay_give_back_the_same_inputs():
+    class _Source:
+        def __init__(self):
+            self.i = 0
+
+        def read(self):
+            self.i += 1
+            return ALL_STATES[(self.i * 5) % len(ALL_STATES)]
+
+    recorder = InputRecorder(_Source(), seed=3, tick_rate=60)
+    live = [recorder.read() for _ in range(40)]
+    replay = ReplayControls(recorder.recording)
+    assert [replay.read() for _ in range(40)] == live
+    assert replay.exhausted
+    assert replay.read() == IDLE
@@ -0,0 +1,98 @@
+import random
+
+import pygame
+
+from src.core.spatial import UniformGrid, near
+
+
+class _Box:
+    def __init__(self, name, rect):
+        self.name = name
+        self.rect = pygame.Rect(rect)
+
+    def __repr__(self):
+        return self.name
+
+
+def _brute(boxes, rect, layer=None, layers=None):
+    return [b for b in boxes if b.rect.colliderect(rect) and (layer is None or layers[b] == layer)]
+
+
+def test_query_matches_brute_force_in_insertion_order():
+    rand = random.Random(3)
+    grid = UniformGrid(64)
+    boxes, layers = [], {}
+    for i in range(300):
+        b = _Box(f'b{i}', (rand.randrange(-500, 1500), rand.randrange(-200, 600),
+                           rand.randrange(1, 200), rand.randrange(1, 120)))
+        layers[b] = rand.choice(('platforms', 'enemies'))
+        grid.insert(b, b.rect, layers[b])
+        boxes.append(b)
+    for _ in range(100):
+        view = pygame.Rect(rand.randrange(-600, 1500), rand.randrange(-300, 600), rand.randrange(1, 500), rand.randrange(1, 400))
+        assert grid.query(view) == _brute(boxes, view)
+        assert grid.query(view, 'enemies') == _brute(boxes, view, 'enemies', layers)
+
+
+def test_update_moves_between_cells():
+    grid = UniformGrid(32)
+    a = _Box('a', (0, 0, 10, 10))
+    grid.insert(a, a.rect, 'enemies')
+    a.rect.topleft = (300, 300)
+    grid.update(a, a.rect)
+    assert grid.query(pygame.Rect(0, 0, 20, 20)) == []
+    assert grid.query(pygame.Rect(295, 295, 20, 20)) == [a]
+    assert grid.rect_of(a) == a.rect
+
+
+def test_remove_and_counts():
+    grid = UniformGrid(32)
+    a, b = _Box('a', (0, 0, 100, 100)), _Box('b', (10, 10, 5, 5))
+    grid.insert(a, a.rect, 'platforms')
+    grid.insert(b, b.rect, 'enemies')
+    assert grid.count() == 2 and grid.count('enemies') == 1
+    grid.remove(a)
+    grid.remove(a)
+    assert a not in grid and len(grid) == 1
+    assert grid.count('platforms') == 0
+    assert grid.query(pygame.Rect(0, 0, 100, 100)) == [b]
+    assert grid.items() == [b]
+
+
+def test_reinsert_keeps_one_entry():
+    grid = UniformGrid(32)
+    a = _Box('a', (0, 0, 10, 10))
+    grid.insert(a, a.rect, 'enemies')
+    grid.insert(a, (200, 0, 10, 10), 'enemies')
+    assert grid.count('enemies') == 1
+    assert grid.query(pygame.Rect(0, 0, 10, 10)) == []
+
+
+def test_zero_size_rect_lands_in_one_cell():
+    grid = UniformGrid(32)
+    a = _Box('a', (40, 40, 0, 0))
+    grid.insert(a, a.rect)
+    assert grid.span(a.rect) == (1, 1, 1, 1)
+
+
+def test_sweep_follows_a_pushed_rect():
+    # empurrar `rect` para fora da regiao inicial refaz a consulta e segue a ordem de insercao
+    grid = UniformGrid(32)
+    wall = [_Box(f'w{i}', (i * 40, 0, 40, 40)) for i in range(10)]
+    for w in wall:
+        grid.insert(w, w.rect)
+    rect = pygame.Rect(0, 0, 20, 20)
+    seen = []
+    for w in grid.sweep(rect, margin=4):
+        seen.append(w)
+        rect.x += 40
+    assert seen == wall
+
+
+def test_near_passes_lists_through():
+    plats = [_Box('p', (0, 0, 10, 10))]
+    assert near(plats, pygame.Rect(500, 500, 1, 1)) is plats
+    grid = UniformGrid(32)
+    grid.insert(plats[0], plats[0].rect)
+    assert list(near(grid, pygame.Rect(500, 500, 1, 1))) == []
+    assert list(near(grid, pygame.Rect(5, 5, 1, 1))) == plats
@@ -0,0 +1,114 @@
+import os
+
+import pygame
+import pytest
+
+from src import settings
+from src.core import sprite_cache
+from src.core.sprite_cache import SpriteCache, fingerprint, key_id, write_cache
+
+
+@pytest.fixture
+def img_dir(tmp_path, monkeypatch):
+    root = tmp_path / 'images'
+    (root / 'hero').mkdir(parents=True)
+    (root / 'hero' / 'idle.png').write_bytes(b'png-idle')
+    (root / 'hero' / 'run.png').write_bytes(b'png-run')
+    monkeypatch.setattr(settings, 'IMG_DIR', str(root))
+    return root
+
+
+def _frame(color, size=(4, 3)):
+    surf = pygame.Surface(size, pygame.SRCALPHA)
+    surf.fill(color)
+    return surf
+
+
+def _bake(path, key, sources, clip):
+    shape = 'dict' if isinstance(clip, dict) else 'list'
+    states = clip if shape == 'dict' else {'': clip}
+    packed = {state: [(f.get_width(), f.get_height(), pygame.image.tobytes(f, 'RGBA')) for f in frames]
+              for state, frames in states.items()}
+    write_cache(str(path), [(key_id(key), fingerprint(sources), shape, packed)])
+
+
+def test_key_id_hides_img_dir(img_dir):
+    key = ('Hero', os.path.join(str(img_dir), 'hero'), 2)
+    assert str(img_dir) not in key_id(key)
+    assert '<img>' in key_id(key)
+
+
+def test_round_trip_dict_and_list(img_dir, tmp_path):
+    hero = os.path.join(str(img_dir), 'hero')
+    dict_key = ('Hero', hero)
+    clip = {'idle': [_frame((255, 0, 0, 255)), _frame((0, 255, 0, 128), (5, 2))], 'run': [_frame((0, 0, 255, 255))]}
+    path = tmp_path / 'sprites.bin'
+    _bake(path, dict_key, [hero], clip)
+    cache = SpriteCache.open(str(path))
+    assert dict_key in cache
+    got = cache.lookup(dict_key)
+    assert set(got) == {'idle', 'run'}
+    for state, frames in clip.items():
+        assert [pygame.image.tobytes(f, 'RGBA') for f in got[state]] == \
+            [pygame.image.tobytes(f, 'RGBA') for f in frames]
+        assert [f.get_size() for f in got[state]] == [f.get_size() for f in frames]
+    assert cache.loaded == 1
+
+    list_key = ('Coins', hero, 8)
+    frames = [_frame((10, 20, 30, 255)), _frame((40, 50, 60, 255))]
+    _bake(path, list_key, [hero], frames)
+    got = SpriteCache.open(str(path)).lookup(list_key)
+    assert isinstance(got, list)
+    assert [pygame.image.tobytes(f, 'RGBA') for f in got] == [pygame.image.tobytes(f, 'RGBA') for f in frames]
+
+
+def test_missing_key_and_bad_file(img_dir, tmp_path):
+    hero = os.path.join(str(img_dir), 'hero')
+    path = tmp_path / 'sprites.bin'
+    _bake(path, ('Hero', hero), [hero], [_frame((1, 2, 3, 255))])
+    assert SpriteCache.open(str(path)).lookup(('Other', hero)) is None
+    assert SpriteCache.open(str(tmp_path / 'absent.bin')) is None
+    bad = tmp_path / 'bad.bin'
+    bad.write_bytes(b'NOTMAGIC' + b'\0' * 32)
+    assert SpriteCache.open(str(bad)) is None
+
+
+def test_changed_source_invalidates(img_dir, tmp_path):
+    hero = os.path.join(str(img_dir), 'hero')
+    key = ('Hero', hero)
+    path = tmp_path / 'sprites.bin'
+    _bake(path, key, [hero], [_frame((1, 2, 3, 255))])
+    (img_dir / 'hero' / 'idle.png').write_bytes(b'png-idle-edited')
+    cache = SpriteCache.open(str(path))
+    assert cache.lookup(key) is None
+    assert cache.stale == 1
+
+
+def test_new_file_in_source_dir_invalidates(img_dir, tmp_path):
+    hero = os.path.join(str(img_dir), 'hero')
+    key = ('Hero', hero)
+    path = tmp_path / 'sprites.bin'
+    _bake(path, key, [hero], [_frame((1, 2, 3, 255))])
+    (img_dir / 'hero' / 'attack.png').write_bytes(b'png-attack')
+    assert SpriteCache.open(str(path)).lookup(key) is None
+
+
+def test_touched_but_unchanged_source_stays_fresh(img_dir, tmp_path):
+    hero = os.path.join(str(img_dir), 'hero')
+    key = ('Hero', hero)
+    path = tmp_path / 'sprites.bin'
+    _bake(path, key, [hero], [_frame((1, 2, 3, 255))])
+    idle = str(img_dir / 'hero' / 'idle.png')
+    st = os.stat(idle)
+    os.utime(idle, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert SpriteCache.open(str(path)).lookup(key) is not None
+
+
+def test_load_attaches_to_registry(img_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(sprite_cache.registry, 'baked', None)
+    hero = os.path.join(str(img_dir), 'hero')
+    path = tmp_path / 'sprites.bin'
+    _bake(path, ('Hero', hero), [hero], [_frame((1, 2, 3, 255))])
+    cache = sprite_cache.load(str(path))
+    assert sprite_cache.registry.baked is cache
+    assert sprite_cache.load(str(tmp_path / 'absent.bin')) is None
@@ -0,0 +1,81 @@
+import pygame
+
+from src.core.surface_cache import SurfaceCache, surface_bytes
+
+MB = 1024 * 1024
+
+
+def _surf(kb):
+    # 32 bits por pixel: `kb` KiB de pixels
+    return pygame.Surface((16, kb * 16), pygame.SRCALPHA, 32)
+
+
+def _cache(kb):
+    return SurfaceCache(kb * 1024 / MB)
+
+
+def test_surface_bytes_counts_lists_and_none():
+    assert surface_bytes(None) == 0
+    assert surface_bytes(_surf(2)) == 2048
+    assert surface_bytes([_surf(1), (_surf(1), _surf(2))]) == 4096
+
+
+def test_evicts_least_recently_used():
+    cache = _cache(3)
+    for key in 'abc':
+        cache.put(key, _surf(1))
+    assert cache.get('a') is not None
+    cache.put('d', _surf(1))
+    assert 'b' not in cache
+    assert all(k in cache for k in 'acd')
+    assert cache.evictions == 1
+    assert cache.bytes == 3 * 1024
+
+
+def test_get_with_loader_counts_hits_and_misses():
+    cache = _cache(4)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return _surf(1)
+    first = cache.get('a', loader)
+    assert cache.get('a', loader) is first
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.get('missing') is None
+
+
+def test_replacing_a_key_updates_bytes():
+    cache = _cache(8)
+    cache.put('a', _surf(1))
+    cache.put('a', _surf(3))
+    assert cache.bytes == 3 * 1024
+    assert len(cache) == 1
+
+
+def test_pinned_entries_survive_until_released():
+    cache = _cache(2)
+    owner = object()
+    cache.put('a', _surf(1))
+    cache.pin('a', owner)
+    cache.put('b', _surf(1))
+    cache.put('c', _surf(1))
+    assert 'a' in cache and 'b' not in cache
+    cache.set_budget(0)
+    assert 'a' in cache and len(cache) == 1
+    cache.release(owner)
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_pin_needs_every_owner_released():
+    cache = _cache(1)
+    one, two = object(), object()
+    cache.put('a', _surf(1))
+    cache.pin('a', one)
+    cache.pin('a', two)
+    cache.set_budget(0)
+    cache.unpin('a', one)
+    assert 'a' in cache
+    cache.unpin('a', two)
+    assert 'a' not in cache